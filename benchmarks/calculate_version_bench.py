@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Benchmark the generated scripts/calculate_version.sh on synthetic repositories.
+
+Builds a local repository with a large history and many release tags
+(via `git fast-import`, so setup takes seconds), then runs the generated
+script for every tag lookup mode in both `release` and `rc` mode, against
+both a loose-refs and a packed-refs copy of the repository.
+
+For every scenario it records the wall time (min and median over several
+runs) and the number of git processes started, counted from GIT_TRACE2
+events so that git's own child processes (e.g. upload-pack) are included.
+
+Requires the package to be importable (e.g. `pip install -e .`).
+
+Usage:
+    python benchmarks/calculate_version_bench.py
+    python benchmarks/calculate_version_bench.py --commits 2000 --tags 500
+    python benchmarks/calculate_version_bench.py --json results.json
+
+Compare the JSON output of two runs to evaluate a template change.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from hitoshura25_pypi_workflow_generator.generator import (
+    VERSION_LOOKUP_MODES,
+    generate_workflows,
+)
+
+# Arguments for each script mode
+SCRIPT_MODES = {
+    "release": ["--type", "release", "--bump", "patch"],
+    "rc": [
+        "--type",
+        "rc",
+        "--bump",
+        "patch",
+        "--pr-number",
+        "123",
+        "--run-number",
+        "45",
+    ],
+}
+
+# Fixed timestamp so repositories are identical between runs
+_EPOCH = 1700000000
+
+
+def _git(*args: str, cwd: Path, **kwargs: Any) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, **kwargs
+    )
+
+
+def _tag_name(index: int) -> str:
+    """Return a unique, increasing vX.Y.Z tag name for a tag index."""
+    return f"v{index // 1000}.{(index // 100) % 10}.{index % 100}"
+
+
+def _fast_import_stream(commits: int, tags: int, tail: int) -> bytes:
+    """
+    Build a `git fast-import` stream.
+
+    Tags are spread evenly over the first `commits - tail` commits, leaving
+    `tail` untagged commits on top so `git describe` has history to walk.
+    """
+    tagged_span = max(commits - tail, 1)
+    tag_every = max(tagged_span // max(tags, 1), 1)
+
+    chunks = []
+    for n in range(1, commits + 1):
+        content = f"{n}\n".encode()
+        message = f"commit {n}\n".encode()
+        chunks.append(
+            b"commit refs/heads/main\n"
+            + f"mark :{n}\n".encode()
+            + f"committer Bench <bench@example.com> {_EPOCH + n} +0000\n".encode()
+            + f"data {len(message)}\n".encode()
+            + message
+            + (f"from :{n - 1}\n".encode() if n > 1 else b"")
+            + f"M 644 inline counter.txt\ndata {len(content)}\n".encode()
+            + content
+            + b"\n"
+        )
+
+    for index in range(tags):
+        mark = min((index + 1) * tag_every, tagged_span)
+        message = b"Release\n"
+        chunks.append(
+            f"tag {_tag_name(index)}\n".encode()
+            + f"from :{mark}\n".encode()
+            + f"tagger Bench <bench@example.com> {_EPOCH + mark} +0000\n".encode()
+            + f"data {len(message)}\n".encode()
+            + message
+            + b"\n"
+        )
+
+    return b"".join(chunks)
+
+
+def build_repository(path: Path, commits: int, tags: int, tail: int) -> None:
+    """Create a synthetic repository with loose tag refs at `path`."""
+    _git("init", "-q", str(path), cwd=path.parent)
+    _git(
+        "fast-import",
+        "--quiet",
+        cwd=path,
+        input=_fast_import_stream(commits, tags, tail),
+    )
+    _git("symbolic-ref", "HEAD", "refs/heads/main", cwd=path)
+    _git("reset", "-q", "--hard", cwd=path)
+    # The repository is its own origin, so ls-remote needs no network
+    _git("remote", "add", "origin", str(path), cwd=path)
+
+
+def render_script(workdir: Path, version_lookup: str) -> Path:
+    """Render calculate_version.sh for a lookup mode into `workdir`."""
+    workdir.mkdir(parents=True)
+    (workdir / "pyproject.toml").write_text("[build-system]")
+    (workdir / "setup.py").write_text("# setup")
+
+    original_cwd = Path.cwd()
+    try:
+        os.chdir(workdir)
+        generate_workflows(version_lookup=version_lookup)
+    finally:
+        os.chdir(original_cwd)
+
+    return workdir / "scripts" / "calculate_version.sh"
+
+
+def run_scenario(
+    script: Path, repo: Path, script_args: List[str], repeat: int, trace_dir: Path
+) -> Dict[str, Any]:
+    """Run the script `repeat` times and collect timing and process counts."""
+    command = [str(script), *script_args]
+    env = {**os.environ, "GITHUB_OUTPUT": os.devnull}
+
+    # Tracing has overhead, so process counting uses a separate untimed run
+    trace_file = trace_dir / "trace2.json"
+    subprocess.run(
+        command,
+        cwd=repo,
+        env={**env, "GIT_TRACE2_EVENT": str(trace_file)},
+        check=True,
+        capture_output=True,
+    )
+    events = trace_file.read_text().splitlines()
+    processes = sum('"event":"start"' in line for line in events)
+    trace_file.unlink()
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=repo, env=env, check=True, capture_output=True)
+        durations.append(time.perf_counter() - start)
+
+    return {
+        "min_seconds": round(min(durations), 4),
+        "median_seconds": round(statistics.median(durations), 4),
+        "git_processes": processes,
+    }
+
+
+def run_benchmarks(  # noqa: PLR0913
+    *,
+    commits: int,
+    tags: int,
+    tail: int,
+    repeat: int,
+    lookups: List[str],
+    workdir: Path,
+) -> List[Dict[str, Any]]:
+    """Build the repositories and run every scenario."""
+    loose = workdir / "loose"
+    loose.mkdir()
+    print(f"Building repository: {commits} commits, {tags} tags...", file=sys.stderr)
+    build_repository(loose, commits, tags, tail)
+
+    packed = workdir / "packed"
+    shutil.copytree(loose, packed)
+    _git("remote", "set-url", "origin", str(packed), cwd=packed)
+    _git("pack-refs", "--all", cwd=packed)
+
+    results = []
+    for version_lookup in lookups:
+        script = render_script(workdir / f"script-{version_lookup}", version_lookup)
+        for refs, repo in (("loose", loose), ("packed", packed)):
+            for mode, script_args in SCRIPT_MODES.items():
+                print(f"  {version_lookup:<12} {refs:<6} {mode}", file=sys.stderr)
+                results.append(
+                    {
+                        "version_lookup": version_lookup,
+                        "refs": refs,
+                        "mode": mode,
+                        **run_scenario(script, repo, script_args, repeat, workdir),
+                    }
+                )
+    return results
+
+
+def format_table(results: List[Dict[str, Any]]) -> str:
+    """Format results as a plain-text table."""
+    header = f"{'lookup':<12} {'refs':<6} {'mode':<7} {'min s':>8} {'median s':>9} "
+    header += f"{'git procs':>9}"
+    lines = [header, "-" * len(header)]
+    lines.extend(
+        f"{r['version_lookup']:<12} {r['refs']:<6} {r['mode']:<7} "
+        f"{r['min_seconds']:>8.4f} {r['median_seconds']:>9.4f} "
+        f"{r['git_processes']:>9}"
+        for r in results
+    )
+    return "\n".join(lines)
+
+
+def main():
+    """Main entry point for the benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark calculate_version.sh on synthetic repositories."
+    )
+    parser.add_argument(
+        "--commits", type=int, default=10000, help="Commits (default: 10000)"
+    )
+    parser.add_argument("--tags", type=int, default=5000, help="Tags (default: 5000)")
+    parser.add_argument(
+        "--tail",
+        type=int,
+        default=1000,
+        help="Untagged commits on top of the last tag (default: 1000)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Timed runs per scenario (default: 5)"
+    )
+    parser.add_argument(
+        "--lookup",
+        action="append",
+        choices=VERSION_LOOKUP_MODES,
+        help="Lookup mode to benchmark (repeatable, default: all)",
+    )
+    parser.add_argument("--json", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="calc-version-bench-") as tmp:
+        results = run_benchmarks(
+            commits=args.commits,
+            tags=args.tags,
+            tail=args.tail,
+            repeat=args.repeat,
+            lookups=args.lookup or list(VERSION_LOOKUP_MODES),
+            workdir=Path(tmp),
+        )
+
+    print(format_table(results))
+
+    if args.json:
+        payload = {
+            "commits": args.commits,
+            "tags": args.tags,
+            "tail": args.tail,
+            "repeat": args.repeat,
+            "results": results,
+        }
+        Path(args.json).write_text(json.dumps(payload, indent=2) + "\n")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,17 +12,37 @@ __author__ = "Vinayak Menon"
 __license__ = "Apache-2.0"
 
 # Export main functions for programmatic use
+from .estimator import estimate_workflow_cost
 from .generator import (
     create_git_release,
+    create_git_release_async,
+    create_git_releases,
+    create_git_releases_async,
     generate_workflows,
     initialize_project,
 )
+from .render_cache import clear_render_cache, render_cache_info, set_render_cache_size
+from .timings import aggregate_step_timings
+from .validator import validate_workflows
+from .workflow_model import Job, Step, Workflow
 
 __all__ = [
+    "Job",
+    "Step",
+    "Workflow",
     "__author__",
     "__license__",
     "__version__",
+    "aggregate_step_timings",
+    "clear_render_cache",
     "create_git_release",
+    "create_git_release_async",
+    "create_git_releases",
+    "create_git_releases_async",
+    "estimate_workflow_cost",
     "generate_workflows",
     "initialize_project",
+    "render_cache_info",
+    "set_render_cache_size",
+    "validate_workflows",
 ]
@@ -8,7 +8,8 @@ import contextlib
 import subprocess
 import sys
 
-from .generator import create_git_release
+from .generator import create_git_release, create_git_releases
+from .git_runner import NETWORK_TIMEOUT, run_git
 
 
 def create_release_tag_with_overwrite(version, overwrite=False):
@@ -25,21 +26,28 @@ def create_release_tag_with_overwrite(version, overwrite=False):
     tag_exists = False
     try:
         # Check if the tag already exists
-        subprocess.run(["git", "rev-parse", version], check=True, capture_output=True)
+        run_git(["rev-parse", version], check=True)
         tag_exists = True
     except subprocess.CalledProcessError:
         # The tag does not exist, so we can proceed
         pass
+    except subprocess.TimeoutExpired as e:
+        print(f"Error checking tag: {e}", file=sys.stderr)
+        return 1
 
     if tag_exists:
         if overwrite:
             print(f"Tag {version} already exists. Overwriting.")
             try:
-                subprocess.run(["git", "tag", "-d", version], check=True)
+                run_git(["tag", "-d", version], check=True)
                 # Try to delete remote tag, but it's fine if it doesn't exist
                 with contextlib.suppress(subprocess.CalledProcessError):
-                    subprocess.run(["git", "push", "origin", ":" + version], check=True)
-            except subprocess.CalledProcessError as e:
+                    run_git(
+                        ["push", "origin", ":" + version],
+                        timeout=NETWORK_TIMEOUT,
+                        check=True,
+                    )
+            except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
                 print(f"Error deleting tag: {e}", file=sys.stderr)
                 return 1
         else:
@@ -60,24 +68,44 @@ def main():
     parser = argparse.ArgumentParser(description="Create and push a git version tag.")
     parser.add_argument(
         "release_type",
+        nargs="?",
         choices=["major", "minor", "patch"],
         help="The type of release (major, minor, or patch).",
     )
     parser.add_argument(
         "--overwrite", action="store_true", help="Overwrite an existing tag."
     )
+    parser.add_argument(
+        "--tags",
+        nargs="+",
+        metavar="TAG",
+        help=(
+            "Create these explicit tags and push them in one atomic push "
+            "(e.g. for monorepo releases) instead of bumping the latest tag."
+        ),
+    )
     args = parser.parse_args()
 
+    if args.tags:
+        if args.release_type or args.overwrite:
+            parser.error("--tags cannot be combined with release_type or --overwrite")
+        result = create_git_releases(args.tags)
+        print(result["message"])
+        return 0 if result["success"] else 1
+
+    if not args.release_type:
+        parser.error("release_type is required unless --tags is given")
+
     try:
-        latest_tag = subprocess.run(
-            ["git", "describe", "--tags", "--abbrev=0"],
-            check=True,
-            capture_output=True,
-            text=True,
+        latest_tag = run_git(
+            ["describe", "--tags", "--abbrev=0"], check=True
         ).stdout.strip()
         major, minor, patch = map(int, latest_tag.lstrip("v").split("."))
     except (subprocess.CalledProcessError, ValueError):
         major, minor, patch = 0, 0, 0
+    except subprocess.TimeoutExpired as e:
+        print(f"Error reading latest tag: {e}", file=sys.stderr)
+        return 1
 
     if args.release_type == "major":
         major += 1
@@ -0,0 +1,471 @@
+"""
+Runner-minute cost estimation for generated workflows.
+
+Parses workflow files with PyYAML and, for each trigger of each
+top-level workflow, builds the graph of jobs that run:
+
+- Reusable workflow calls (`uses: ./.github/workflows/...`) are expanded
+  into the jobs of the called workflow
+- Matrices are expanded into one instance per combination, resolving
+  `fromJSON(inputs.*)` from the caller's `with:` or the input defaults
+- Jobs excluded by `github.event_name != '<trigger>'` are dropped, along
+  with the jobs that need them (unless those run on `always()` or
+  `!cancelled()`, in which case they still wait for the jobs the dropped
+  job needed)
+
+A job's duration is the runner start-up plus the estimated cost of each
+step, classified by what the step does (checkout depth, installs, tests,
+builds, ...). All other conditions are assumed to be true, so estimates
+describe a cold run that executes everything. The default costs can be
+replaced with calibration numbers measured locally.
+"""
+
+import itertools
+import json
+import math
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from hitoshura25_pypi_workflow_generator.workflow_model import load_yaml
+
+# Estimated seconds per step category; `job_startup` is charged once per
+# job instance and `xdist_speedup` divides the test time of `pytest -n auto`
+DEFAULT_CALIBRATION = {
+    "job_startup": 15.0,
+    "checkout_shallow": 3.0,
+    "checkout_blobless": 6.0,
+    "checkout_full": 12.0,
+    "setup_python": 8.0,
+    "setup_uv": 4.0,
+    "cache": 4.0,
+    "install": 45.0,
+    "install_uv": 12.0,
+    "install_tools": 10.0,
+    "lint": 8.0,
+    "tests": 60.0,
+    "build": 20.0,
+    "cibuildwheel": 600.0,
+    "upload_artifact": 5.0,
+    "download_artifact": 4.0,
+    "publish": 15.0,
+    "other": 2.0,
+    "xdist_speedup": 2.0,
+}
+
+# Per-minute billing multipliers of GitHub-hosted runners
+OS_MULTIPLIERS = {"linux": 1, "windows": 2, "macos": 10}
+
+# Conditions under which a job runs even if a job it needs was skipped
+_RUNS_AFTER_SKIPS = ("always()", "!cancelled()")
+
+# Step categories of actions, and of `run:` scripts by the first matching
+# keywords (checkouts and caches are classified separately)
+_ACTION_CATEGORIES = {
+    "actions/setup-python": "setup_python",
+    "astral-sh/setup-uv": "setup_uv",
+    "actions/upload-artifact": "upload_artifact",
+    "actions/upload-artifact/merge": "upload_artifact",
+    "actions/download-artifact": "download_artifact",
+    "pypa/gh-action-pypi-publish": "publish",
+    "pypa/cibuildwheel": "cibuildwheel",
+}
+_RUN_CATEGORIES = (
+    (("ruff check",), "lint"),
+    (("pytest",), "tests"),
+    (("python -m build", "uv build"), "build"),
+    (("pip install", "pip wheel"), "install"),
+)
+
+_FROM_JSON_INPUT = re.compile(r"^\$\{\{\s*fromJSON\(inputs\.(\w+)\)\s*\}\}$")
+_MATRIX_REF = re.compile(r"\$\{\{\s*matrix\.([\w-]+)\s*\}\}")
+
+
+def load_calibration(paths: List[str]) -> Dict[str, float]:
+    """
+    Read calibration files and merge them, later files taking precedence.
+
+    Each file is a JSON object mapping DEFAULT_CALIBRATION keys to numbers,
+    e.g. {"tests": 240, "install": 30}.
+
+    Raises:
+        FileNotFoundError: If a file does not exist
+        ValueError: If a file is not a JSON object of known keys to numbers
+    """
+    calibration = {}
+    for path in paths:
+        try:
+            data = json.loads(Path(path).read_text())
+        except json.JSONDecodeError as e:
+            msg = f"Calibration file {path} is not valid JSON: {e}"
+            raise ValueError(msg) from e
+        if not isinstance(data, dict):
+            msg = f"Calibration file {path} must contain a JSON object"
+            raise ValueError(msg)
+        calibration.update(data)
+    return _validate_calibration(calibration)
+
+
+def _validate_calibration(calibration: Dict[str, Any]) -> Dict[str, float]:
+    unknown = sorted(set(calibration) - set(DEFAULT_CALIBRATION))
+    if unknown:
+        msg = (
+            f"Unknown calibration keys: {', '.join(unknown)}. "
+            f"Expected any of: {', '.join(DEFAULT_CALIBRATION)}"
+        )
+        raise ValueError(msg)
+    for key, value in calibration.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            msg = f"Calibration value for {key} must be a non-negative number"
+            raise ValueError(msg)
+    return {k: float(v) for k, v in calibration.items()}
+
+
+def _triggers(workflow: Dict[str, Any]) -> List[str]:
+    """Return the events of a workflow's `on:` (PyYAML reads `on` as True)."""
+    on = workflow.get("on", workflow.get(True))
+    if isinstance(on, str):
+        return [on]
+    return list(on or [])
+
+
+def _as_list(value: Any) -> List[str]:
+    if value is None:
+        return []
+    return [value] if isinstance(value, str) else list(value)
+
+
+def _call_inputs(workflow: Dict[str, Any], values: Dict[str, Any]) -> Dict[str, str]:
+    """Return a reusable workflow's inputs: given values over defaults."""
+    declared = (_trigger_config(workflow, "workflow_call") or {}).get("inputs") or {}
+    inputs = {name: str(spec.get("default", "")) for name, spec in declared.items()}
+    inputs.update({name: str(value) for name, value in (values or {}).items()})
+    return inputs
+
+
+def _trigger_config(workflow: Dict[str, Any], event: str) -> Any:
+    on = workflow.get("on", workflow.get(True))
+    return on.get(event) if isinstance(on, dict) else None
+
+
+def _matrix_instances(
+    job: Dict[str, Any], inputs: Dict[str, str]
+) -> List[Dict[str, Any]]:
+    """Expand a job's strategy matrix into one dict per instance."""
+    matrix = (job.get("strategy") or {}).get("matrix") or {}
+    axes = {}
+    for key, values in matrix.items():
+        if key in ("include", "exclude"):
+            continue
+        axes[key] = values
+        if isinstance(values, str):
+            match = _FROM_JSON_INPUT.match(values)
+            axes[key] = (
+                json.loads(inputs.get(match.group(1)) or "[]") if match else [values]
+            )
+
+    instances = [dict(zip(axes, combo)) for combo in itertools.product(*axes.values())]
+    for excluded in matrix.get("exclude") or []:
+        instances = [
+            i for i in instances if any(i.get(k) != v for k, v in excluded.items())
+        ]
+    instances.extend(matrix.get("include") or [])
+    return instances or [{}]
+
+
+def _runner_os(runs_on: Any, instance: Dict[str, Any]) -> str:
+    """Return the billing OS family of a job instance's runner."""
+    label = _MATRIX_REF.sub(lambda m: str(instance.get(m.group(1), "")), str(runs_on))
+    label = label.lower()
+    if "windows" in label:
+        return "windows"
+    if "macos" in label:
+        return "macos"
+    return "linux"
+
+
+def _checkout_category(options: Dict[str, Any]) -> str:
+    depth = str(options.get("fetch-depth", 1)).strip()
+    if depth == "1" or "sparse-checkout" in options:
+        return "checkout_shallow"
+    # Full history, or an expression that may resolve to it
+    if options.get("filter") == "blob:none":
+        return "checkout_blobless"
+    return "checkout_full"
+
+
+def _step_category(step: Dict[str, Any]) -> str:
+    """Classify a step into a DEFAULT_CALIBRATION category."""
+    uses = step.get("uses", "")
+    if uses:
+        action = uses.split("@")[0]
+        if action == "actions/checkout":
+            return _checkout_category(step.get("with") or {})
+        if action.startswith("actions/cache"):
+            return "cache"
+        return _ACTION_CATEGORIES.get(action, "other")
+
+    run = step.get("run", "")
+    category = next(
+        (c for keywords, c in _RUN_CATEGORIES if any(k in run for k in keywords)),
+        "other",
+    )
+    if category == "install" and ".[test]" not in run and "install ." not in run:
+        return "install_tools"
+    if category == "install" and "uv pip" in run:
+        return "install_uv"
+    return category
+
+
+def _job_seconds(job: Dict[str, Any], calibration: Dict[str, float]) -> float:
+    """Estimate the duration of one instance of a job, in seconds."""
+    seconds = calibration["job_startup"]
+    shards = len((job.get("strategy") or {}).get("matrix", {}).get("shard") or [0])
+    for step in job.get("steps") or []:
+        category = _step_category(step)
+        cost = calibration[category]
+        if category == "tests":
+            cost /= shards
+            if "-n auto" in step.get("run", ""):
+                cost /= calibration["xdist_speedup"] or 1.0
+        seconds += cost
+    return seconds
+
+
+def _is_excluded(condition: str, trigger: str) -> bool:
+    """Whether a job condition rules the job out for an event."""
+    if f"github.event_name != '{trigger}'" in condition:
+        return True
+    required = re.findall(r"github\.event_name == '([\w-]+)'", condition)
+    return bool(required) and trigger not in required and "||" not in condition
+
+
+def _ordered_jobs(jobs: Dict[str, Any]) -> List[str]:
+    """Return job ids so that every job comes after the jobs it needs."""
+    ordered, seen = [], set()
+
+    def visit(job_id):
+        if job_id in seen or job_id not in jobs:
+            return
+        seen.add(job_id)
+        for need in _as_list(jobs[job_id].get("needs")):
+            visit(need)
+        ordered.append(job_id)
+
+    for job_id in jobs:
+        visit(job_id)
+    return ordered
+
+
+def _add_jobs(  # noqa: PLR0913
+    nodes: Dict[str, Dict[str, Any]],
+    workflow: Dict[str, Any],
+    trigger: str,
+    *,
+    inputs: Dict[str, str],
+    prefix: str,
+    outer_needs: List[str],
+    contents: Dict[str, str],
+    directory: Path,
+    calibration: Dict[str, float],
+) -> Dict[str, List[str]]:
+    """
+    Add the jobs of a workflow that run for a trigger to the graph.
+
+    Returns:
+        For each job that runs, the graph nodes that must finish for it to
+        be complete (several for a reusable workflow call)
+    """
+    jobs = workflow.get("jobs") or {}
+    done = {}
+    # Jobs that do not run, with the graph nodes they would have waited
+    # for: their dependants still wait for those (e.g. `changes`)
+    skipped = {}
+    for job_id in _ordered_jobs(jobs):
+        job = jobs[job_id]
+        needs = _as_list(job.get("needs"))
+        condition = str(job.get("if", ""))
+        after = (
+            list(
+                dict.fromkeys(
+                    node for n in needs for node in done.get(n, skipped.get(n, []))
+                )
+            )
+            or outer_needs
+        )
+        if _is_excluded(condition, trigger) or (
+            any(n not in done for n in needs)
+            and not any(c in condition for c in _RUNS_AFTER_SKIPS)
+        ):
+            skipped[job_id] = after
+            continue
+
+        uses = job.get("uses", "")
+        if uses.startswith("./"):
+            called_name = Path(uses).name
+            called = (
+                load_yaml(contents[called_name]) or {}
+                if called_name in contents
+                else _load_workflow(directory / called_name)
+            )
+            before = set(nodes)
+            _add_jobs(
+                nodes,
+                called,
+                trigger,
+                inputs=_call_inputs(called, job.get("with")),
+                prefix=f"{prefix}{job_id}/",
+                outer_needs=after,
+                contents=contents,
+                directory=directory,
+                calibration=calibration,
+            )
+            done[job_id] = [n for n in nodes if n not in before] or after
+            continue
+
+        instances = _matrix_instances(job, inputs)
+        seconds = _job_seconds(job, calibration)
+        billable = sum(
+            math.ceil(seconds / 60) * OS_MULTIPLIERS[_runner_os(job.get("runs-on"), i)]
+            for i in instances
+        )
+        name = f"{prefix}{job_id}"
+        nodes[name] = {
+            "name": name,
+            "needs": after,
+            "instances": len(instances),
+            "minutes": round(seconds / 60, 2),
+            "runner_minutes": round(seconds * len(instances) / 60, 2),
+            "billable_minutes": billable,
+        }
+        done[job_id] = [name]
+    return done
+
+
+def _critical_path(nodes: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Return the chain of jobs with the longest total duration."""
+    finish, previous = {}, {}
+    for name, node in nodes.items():  # Insertion order is topological
+        before = max(node["needs"], key=lambda n: finish[n], default=None)
+        previous[name] = before
+        finish[name] = node["minutes"] + (finish[before] if before else 0.0)
+
+    path = []
+    current = max(finish, key=finish.get, default=None)
+    while current:
+        path.append(current)
+        current = previous[current]
+    return path[::-1]
+
+
+def _load_workflow(path: Path) -> Dict[str, Any]:
+    return load_yaml(path.read_text()) or {}
+
+
+def _format_estimate(estimate: Dict[str, Any]) -> str:
+    lines = [
+        (
+            f"{estimate['workflow']} ({estimate['trigger']}): "
+            f"critical path {estimate['critical_path_minutes']:.1f} min, "
+            f"{estimate['runner_minutes']:.1f} runner-minutes "
+            f"({estimate['billable_minutes']} billable)"
+        )
+    ]
+    width = max((len(job["name"]) for job in estimate["jobs"]), default=0)
+    lines.extend(
+        f"  {job['name']:<{width}}  {job['instances']:>3} x {job['minutes']:.1f} min"
+        for job in estimate["jobs"]
+    )
+    lines.append("  critical path: " + " -> ".join(estimate["critical_path"]))
+    return "\n".join(lines)
+
+
+def estimate_workflow_cost(
+    workflows_dir: Optional[str] = None,
+    calibration: Optional[Dict[str, float]] = None,
+    calibration_files: Optional[List[str]] = None,
+    workflows: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """
+    Estimate the critical path and runner-minutes of each workflow trigger.
+
+    Args:
+        workflows_dir: Directory with the workflow files (default:
+            .github/workflows in the current directory)
+        calibration: Seconds per step category, overriding
+            DEFAULT_CALIBRATION (applied after calibration_files)
+        calibration_files: JSON files of calibration numbers, e.g. measured
+            with local timing runs (see load_calibration)
+        workflows: Workflow file contents by file name, e.g. as rendered
+            by a dry run of generate_workflows (default: every workflow
+            file in workflows_dir, which is also used to find reusable
+            workflows called by, but not in, workflows)
+
+    Returns:
+        Dict with:
+            - success (bool): Whether the estimate succeeded
+            - estimates (list): One dict per workflow and trigger, with the
+              jobs that run (instances, minutes, runner_minutes,
+              billable_minutes), critical_path, critical_path_minutes,
+              runner_minutes and billable_minutes
+            - message (str): Human-readable report
+
+    Raises:
+        FileNotFoundError: If workflows is not given and the directory does
+            not exist, or a calibration file is missing
+        ValueError: If the calibration is invalid
+    """
+    directory = Path(workflows_dir) if workflows_dir else Path(".github/workflows")
+    if workflows is None:
+        if not directory.is_dir():
+            msg = f"Workflow directory not found: {directory}"
+            raise FileNotFoundError(msg)
+        workflows = {p.name: p.read_text() for p in sorted(directory.glob("*.y*ml"))}
+
+    costs = dict(DEFAULT_CALIBRATION)
+    costs.update(load_calibration(calibration_files or []))
+    costs.update(_validate_calibration(calibration or {}))
+
+    estimates = []
+    for name in sorted(workflows):
+        workflow = load_yaml(workflows[name]) or {}
+        for trigger in _triggers(workflow):
+            if trigger == "workflow_call":
+                continue
+            nodes = {}
+            _add_jobs(
+                nodes,
+                workflow,
+                trigger,
+                inputs={},
+                prefix="",
+                outer_needs=[],
+                contents=workflows,
+                directory=directory,
+                calibration=costs,
+            )
+            path_names = _critical_path(nodes)
+            estimates.append(
+                {
+                    "workflow": name,
+                    "trigger": trigger,
+                    "jobs": list(nodes.values()),
+                    "critical_path": path_names,
+                    "critical_path_minutes": round(
+                        sum(nodes[n]["minutes"] for n in path_names), 2
+                    ),
+                    "runner_minutes": round(
+                        sum(n["runner_minutes"] for n in nodes.values()), 2
+                    ),
+                    "billable_minutes": sum(
+                        n["billable_minutes"] for n in nodes.values()
+                    ),
+                }
+            )
+
+    return {
+        "success": True,
+        "estimates": estimates,
+        "message": "\n\n".join(_format_estimate(e) for e in estimates)
+        or f"No workflows found in {directory}",
+    }
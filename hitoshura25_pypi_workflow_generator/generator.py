@@ -6,21 +6,395 @@ This module contains the shared business logic used by both:
 - CLI mode (cli.py / main.py)
 """
 
+import os
+import re
 import subprocess
 import sys
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from jinja2 import Environment, FileSystemLoader
 
+from hitoshura25_pypi_workflow_generator.git_runner import (
+    NETWORK_TIMEOUT,
+    run_git_async,
+    run_sync,
+)
 from hitoshura25_pypi_workflow_generator.git_utils import get_default_prefix
+from hitoshura25_pypi_workflow_generator.render_cache import render_template
+from hitoshura25_pypi_workflow_generator.validator import validate_workflows
+from hitoshura25_pypi_workflow_generator.workflow_model import Workflow
 
+# How calculate_version.sh finds the latest release tag:
+#   describe    - `git describe` (walks history, needs a full-history checkout)
+#   sorted-tags - highest vX.Y.Z among local tag refs (no history walk)
+#   ls-remote   - highest vX.Y.Z tag on origin (no local history or tags needed)
+VERSION_LOOKUP_MODES = ("describe", "sorted-tags", "ls-remote")
 
-def generate_workflows(
+# How generated jobs check out the repository:
+#   full    - full history and all tags in every job
+#   shallow - only as much history as each job needs (single-commit or
+#             blobless partial clones; full history only for git describe)
+CHECKOUT_STRATEGIES = ("full", "shallow")
+
+# How the reusable workflow caches dependencies between runs:
+#   none       - install everything from the index on every run
+#   pip        - setup-python pip cache keyed on pyproject.toml/setup.py
+#   wheelhouse - persistent cache of prebuilt wheels for all dependencies
+CACHE_STRATEGIES = ("none", "pip", "wheelhouse")
+
+# Tool used to install dependencies and build the package:
+#   pip - pip and `python -m build`
+#   uv  - `uv pip install` and `uv build`, with uv's cache persisted by setup-uv
+INSTALLERS = ("pip", "uv")
+
+# Where the reusable workflow runs Ruff:
+#   parallel - a separate lint job alongside the tests (gates publishing,
+#              but tests do not wait for it)
+#   inline   - a step before the tests in the test/build job
+#   none     - no linting
+LINT_MODES = ("parallel", "inline", "none")
+
+# How the PR workflow skips runs that do not touch the package:
+#   none         - run for every pull request
+#   paths        - only trigger when package_paths change
+#   paths-ignore - do not trigger when only ignored_paths change
+#   changes      - always trigger, but a `changes` job skips the rest of the
+#                  pipeline (keeps required status checks reporting)
+PATH_FILTERS = ("none", "paths", "paths-ignore", "changes")
+
+# How the reusable workflow builds distributions:
+#   build        - one `python -m build` (or `uv build`) on ubuntu-latest,
+#                  for pure-Python packages
+#   cibuildwheel - a parallel per-runner wheel matrix with cibuildwheel plus
+#                  an sdist job, merged by a fan-in job (compiled extensions)
+BUILD_BACKENDS = ("build", "cibuildwheel")
+
+# How workflow files are written:
+#   template - the rendered templates as they are, with their comments
+#   model    - the rendered templates loaded into the workflow object model,
+#              transformed, and written by PyYAML's C dumper
+RENDERERS = ("template", "model")
+
+# Runners for the cibuildwheel matrix: Linux x86_64 and aarch64, Windows,
+# macOS x86_64 and arm64
+DEFAULT_WHEEL_RUNNERS = (
+    "ubuntu-latest",
+    "ubuntu-24.04-arm",
+    "windows-latest",
+    "macos-13",
+    "macos-latest",
+)
+
+# Files that never affect the built package, used by the paths-ignore filter
+DEFAULT_IGNORED_PATHS = ("**.md", "docs/**", "LICENSE*", ".gitignore")
+
+# Directories never searched for monorepo packages (besides hidden ones)
+_DISCOVERY_SKIP_DIRS = ("__pycache__", "build", "dist", "node_modules", "venv")
+
+# Package directory names usable in workflow file names and tag prefixes
+_PACKAGE_NAME_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+# Limits of actions/upload-artifact's compression-level and retention-days
+MAX_COMPRESSION_LEVEL = 9
+MAX_RETENTION_DAYS = 90
+
+# Number of tab-separated fields in a `git push --porcelain` ref line
+_PORCELAIN_REF_FIELDS = 3
+
+
+def _validate_choice(name: str, value: str, choices: Tuple[str, ...]) -> None:
+    """
+    Check that an option value is one of the allowed choices.
+
+    Raises:
+        ValueError: If value is not in choices
+    """
+    if value not in choices:
+        msg = f"Invalid {name} '{value}'. Expected one of: {', '.join(choices)}"
+        raise ValueError(msg)
+
+
+def _validate_list(name: str, values: List[str]) -> List[str]:
+    """
+    Check that a list option holds at least one non-empty string.
+
+    Returns:
+        The values with duplicates removed, in their original order
+
+    Raises:
+        ValueError: If the list is empty or contains an empty value
+    """
+    if isinstance(values, str) or not values:
+        msg = f"{name} must be a non-empty list of strings"
+        raise ValueError(msg)
+    if not all(isinstance(v, str) and v.strip() for v in values):
+        msg = f"{name} must only contain non-empty strings, got {values!r}"
+        raise ValueError(msg)
+    return list(dict.fromkeys(values))
+
+
+def _validate_int(
+    name: str, value: int, minimum: int, maximum: Optional[int] = None
+) -> None:
+    """
+    Check that an option is an integer within [minimum, maximum].
+
+    Raises:
+        ValueError: If value is not an integer or is out of range
+    """
+    if isinstance(value, bool) or not isinstance(value, int):
+        msg = f"{name} must be an integer, got {value!r}"
+        raise ValueError(msg)
+    if value < minimum:
+        msg = f"{name} must be at least {minimum}, got {value}"
+        raise ValueError(msg)
+    if maximum is not None and value > maximum:
+        msg = f"{name} must be at most {maximum}, got {value}"
+        raise ValueError(msg)
+
+
+def _default_package_paths(test_path: str) -> List[str]:
+    """
+    Return path filters covering the package in the current project.
+
+    Follows the layout created by initialize_project(): top-level package
+    directories, the test directory, packaging metadata, generated scripts
+    and workflows.
+    """
+    paths = [
+        f"{p.name}/**"
+        for p in sorted(Path.cwd().iterdir())
+        if p.is_dir() and (p / "__init__.py").exists()
+    ]
+    if Path("src").is_dir():
+        paths.append("src/**")
+
+    tests = test_path.strip().rstrip("/")
+    if tests not in ("", ".") and f"{tests}/**" not in paths:
+        paths.append(f"{tests}/**")
+
+    paths.extend(
+        [
+            "pyproject.toml",
+            "setup.py",
+            "MANIFEST.in",
+            "scripts/**",
+            ".github/workflows/**",
+        ]
+    )
+    return paths
+
+
+def discover_packages(root: str = ".") -> List[str]:
+    """
+    Find the Python packages of a monorepo.
+
+    A package is a directory below root with a pyproject.toml or setup.py;
+    its subdirectories are not searched further. Hidden directories,
+    virtual environments and build output are skipped.
+
+    Returns:
+        Package directories relative to root, in POSIX form, sorted
+    """
+    base = Path(root)
+    packages = []
+    for directory, subdirs, files in os.walk(base):
+        current = Path(directory)
+        if "pyvenv.cfg" in files:
+            subdirs.clear()
+            continue
+        if current != base and ("pyproject.toml" in files or "setup.py" in files):
+            packages.append(current.relative_to(base).as_posix())
+            subdirs.clear()
+            continue
+        subdirs[:] = [
+            d
+            for d in subdirs
+            if not d.startswith(".") and d not in _DISCOVERY_SKIP_DIRS
+        ]
+    return sorted(packages)
+
+
+def _monorepo_packages(package_dirs: Optional[List[str]]) -> List[Dict[str, Any]]:
+    """
+    Describe each monorepo package for its PR and release workflows.
+
+    Packages are named after their directory, which names their workflow
+    files and prefixes their release tags (e.g. `foo-v1.2.3`). Without
+    package_dirs, packages are discovered from the current directory.
+
+    Raises:
+        FileNotFoundError: If no packages are found, or a package has no
+            pyproject.toml or setup.py
+        ValueError: If a package directory is outside the repository or
+            package names are unusable or not unique
+    """
+    if package_dirs is None:
+        package_dirs = discover_packages()
+        if not package_dirs:
+            msg = "No packages found: no subdirectory has a pyproject.toml or setup.py"
+            raise FileNotFoundError(msg)
+
+    packages = []
+    for package_dir in _validate_list("packages", package_dirs):
+        path = Path(package_dir)
+        directory = path.as_posix()
+        if path.is_absolute() or ".." in path.parts or directory == ".":
+            msg = f"Package directory must be below the repository root: {package_dir}"
+            raise ValueError(msg)
+        if not _PACKAGE_NAME_PATTERN.match(path.name):
+            msg = f"Package directory name '{path.name}' cannot be used in tags"
+            raise ValueError(msg)
+        if not (path / "pyproject.toml").exists() and not (path / "setup.py").exists():
+            msg = f"No pyproject.toml or setup.py in package directory {directory}"
+            raise FileNotFoundError(msg)
+        packages.append(
+            {
+                "name": path.name,
+                "dir": directory,
+                "tag_prefix": f"{path.name}-",
+                # The package, plus everything its workflows run
+                "paths": [
+                    f"{directory}/**",
+                    "scripts/**",
+                    ".github/workflows/_reusable-test-build.yml",
+                    f".github/workflows/*-{path.name}.yml",
+                ],
+            }
+        )
+
+    names = [p["name"] for p in packages]
+    duplicates = sorted({n for n in names if names.count(n) > 1})
+    if duplicates:
+        msg = f"Package directory names must be unique: {', '.join(duplicates)}"
+        raise ValueError(msg)
+    return packages
+
+
+def _project_packages(
+    monorepo: bool, packages: Optional[List[str]]
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Check the project layout and describe its packages.
+
+    Returns:
+        The monorepo packages, or None for a single package at the root
+
+    Raises:
+        FileNotFoundError: If pyproject.toml or setup.py missing
+        ValueError: If packages are given outside monorepo mode, or invalid
+    """
+    if monorepo:
+        return _monorepo_packages(packages)
+    if packages is not None:
+        msg = "packages only applies to monorepo mode"
+        raise ValueError(msg)
+    if not Path("pyproject.toml").exists() or not Path("setup.py").exists():
+        msg = "Project not initialized. Run 'pypi-workflow-generator-init' first."
+        raise FileNotFoundError(msg)
+    return None
+
+
+def _workflow_files(
+    packages: Optional[List[Dict[str, Any]]],
+) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """
+    List the workflows to render.
+
+    Returns:
+        (template, output filename, context overrides) per workflow; a
+        monorepo gets a release and a PR workflow per package
+    """
+    if packages is None:
+        return [
+            ("_reusable_test_build.yml.j2", "_reusable-test-build.yml", {}),
+            ("release.yml.j2", "release.yml", {}),
+            ("test_pr.yml.j2", "test-pr.yml", {}),
+        ]
+    files = [("_reusable_test_build.yml.j2", "_reusable-test-build.yml", {})]
+    for package in packages:
+        overrides = {"package": package, "package_paths": package["paths"]}
+        files.append(("release.yml.j2", f"release-{package['name']}.yml", overrides))
+        files.append(("test_pr.yml.j2", f"test-pr-{package['name']}.yml", overrides))
+    return files
+
+
+def _workflow_emitter(
+    renderer: str, transforms: Optional[List[Callable[[str, Workflow], None]]]
+) -> Callable[[str, str], str]:
+    """
+    Return a function turning a workflow's rendered template into its file.
+
+    Raises:
+        ValueError: If transforms are given for the template renderer
+    """
+    if renderer == "template":
+        if transforms:
+            msg = "workflow_transforms require renderer 'model'"
+            raise ValueError(msg)
+        return lambda _filename, content: content
+
+    def emit(filename: str, content: str) -> str:
+        workflow = Workflow.from_yaml(content)
+        for transform in transforms or []:
+            transform(filename, workflow)
+        return workflow.to_yaml()
+
+    return emit
+
+
+def _validate_monorepo_options(**in_use: bool) -> None:
+    """
+    Check that no option assuming a single root package is in use.
+
+    Raises:
+        ValueError: If any of the given options is in use
+    """
+    conflicts = [name for name, used in in_use.items() if used]
+    if conflicts:
+        msg = (
+            f"monorepo mode does not support {', '.join(conflicts)}; these "
+            "options assume a single package at the repository root"
+        )
+        raise ValueError(msg)
+
+
+def generate_workflows(  # noqa: PLR0912, PLR0913, PLR0915
     python_version: str = "3.11",
     test_path: str = ".",
     base_output_dir: Optional[str] = None,
     verbose_publish: bool = False,
+    *,
+    version_lookup: str = "describe",
+    checkout_strategy: str = "full",
+    cache_strategy: str = "none",
+    installer: str = "pip",
+    python_versions: Optional[List[str]] = None,
+    os_runners: Optional[List[str]] = None,
+    test_shards: int = 1,
+    pytest_xdist: bool = False,
+    lint: str = "parallel",
+    concurrency: bool = True,
+    path_filter: str = "none",
+    package_paths: Optional[List[str]] = None,
+    ignored_paths: Optional[List[str]] = None,
+    test_result_cache: bool = False,
+    reuse_artifacts: bool = False,
+    compact_pipeline: bool = False,
+    artifact_compression_level: Optional[int] = None,
+    artifact_retention_days: Optional[int] = None,
+    testpypi_skip_unchanged: bool = False,
+    build_backend: str = "build",
+    wheel_runners: Optional[List[str]] = None,
+    merge_queue: bool = False,
+    step_timing: bool = False,
+    monorepo: bool = False,
+    packages: Optional[List[str]] = None,
+    renderer: str = "template",
+    workflow_transforms: Optional[List[Callable[[str, Workflow], None]]] = None,
+    validate: bool = False,
+    dry_run: bool = False,
 ) -> Dict[str, Any]:
     """
     Generate GitHub Actions workflows for PyPI publishing.
@@ -35,27 +409,196 @@ def generate_workflows(
         test_path: Path to tests directory (default: '.')
         base_output_dir: Custom output directory (default: .github/workflows)
         verbose_publish: Enable verbose mode for publish actions (default: False)
+        version_lookup: How calculate_version.sh finds the latest tag, one of
+            VERSION_LOOKUP_MODES (default: 'describe')
+        checkout_strategy: How generated jobs check out the repository, one
+            of CHECKOUT_STRATEGIES (default: 'full')
+        cache_strategy: How the reusable workflow caches dependencies, one
+            of CACHE_STRATEGIES (default: 'none'). Only applies to the pip
+            installer; uv always persists its own cache.
+        installer: Tool used to install dependencies and build, one of
+            INSTALLERS (default: 'pip')
+        python_versions: Python versions to test on in a parallel matrix
+            (default: None, test only on python_version). The package is
+            still built once, with python_version, after the matrix passes.
+        os_runners: Runners to test on in the matrix (default: None, which
+            means ['ubuntu-latest'] when python_versions is given)
+        test_shards: Number of parallel jobs to split the test files across
+            (default: 1, no sharding). Files are balanced using durations
+            recorded by previous runs; results are merged into one report.
+        pytest_xdist: Also run tests in parallel within each job with
+            pytest-xdist's `-n auto` (default: False)
+        lint: Where Ruff runs, one of LINT_MODES (default: 'parallel')
+        concurrency: Add concurrency groups (default: True). PR runs are
+            grouped per pull request and superseded runs are cancelled;
+            release runs are serialized and never cancelled while running
+            (GitHub keeps one pending run per group and cancels older ones).
+        path_filter: How the PR workflow skips runs that do not change the
+            package, one of PATH_FILTERS (default: 'none')
+        package_paths: Path patterns that affect the package, used by the
+            'paths' and 'changes' filters (default: derived from the
+            project layout)
+        ignored_paths: Path patterns that never affect the package, used by
+            the 'paths-ignore' filter (default: DEFAULT_IGNORED_PATHS)
+        test_result_cache: Skip the tests (but still build) when the files
+            matching package_paths already passed in an earlier run, using
+            a marker in the Actions cache (default: False). The reusable
+            workflow gains a force_tests input to always run them.
+        reuse_artifacts: Build reproducibly, share the distributions under
+            their source tree hash, and let releases promote a previous
+            build of the same tree, from a merge queue run or a release
+            from the default branch, to the release version instead of
+            rebuilding (default: False). Falls back to a rebuild when no
+            such build exists.
+        compact_pipeline: Calculate the version inside the reusable
+            workflow's build job, which exposes it as a workflow output,
+            instead of in a separate job of the PR and release workflows
+            (default: False). Saves one runner and one full clone per run.
+        artifact_compression_level: Zlib compression level (0-9) for the
+            distribution artifact (default: None, the upload action's
+            default of 6). Wheels and sdists are already compressed, so 0
+            usually uploads fastest.
+        artifact_retention_days: Days to keep the distribution artifact
+            (default: None, the repository's retention setting)
+        testpypi_skip_unchanged: Skip the TestPyPI publish when a PR's
+            distributions have the same contents (ignoring the dev version)
+            as the PR's last publish, tracked in the Actions cache, and
+            publish with skip-existing (default: False)
+        build_backend: How distributions are built, one of BUILD_BACKENDS
+            (default: 'build'). 'cibuildwheel' builds wheels for compiled
+            extensions in a parallel matrix over wheel_runners.
+        wheel_runners: Runners for the cibuildwheel matrix (default:
+            DEFAULT_WHEEL_RUNNERS). Only valid with build_backend
+            'cibuildwheel'.
+        merge_queue: Also run the PR workflow on merge_group events, so a
+            merge queue tests batches of PRs together (default: False).
+            Queue runs calculate no RC version and do not publish to
+            TestPyPI.
+        step_timing: Record the start and end of every step of every job
+            in a `step-timings-*` artifact and a step summary table
+            (default: False). Aggregate downloaded artifacts with
+            hitoshura25-pypi-workflow-generator-timings.
+        monorepo: Generate workflows for several packages in subdirectories
+            (default: False): one shared reusable workflow plus a PR and a
+            release workflow per package (test-pr-NAME.yml,
+            release-NAME.yml), each only triggered by changes to its
+            package. Releases are tagged NAME-vX.Y.Z. Not supported with
+            test_shards, test_result_cache, reuse_artifacts,
+            compact_pipeline, the cibuildwheel backend, package_paths or
+            path_filter 'paths-ignore'; path_filter 'none' becomes 'paths'.
+        packages: Package directories for monorepo mode, relative to the
+            repository root (default: discover_packages())
+        renderer: How workflow files are written (default: 'template').
+            'template' writes the rendered templates as they are;
+            'model' loads each into a `Workflow` (see workflow_model),
+            applies workflow_transforms and writes it with PyYAML's C
+            dumper, without the templates' comments.
+        workflow_transforms: Functions called as transform(filename,
+            workflow) on each workflow, in order, to change it in place
+            (renderer 'model' only)
+        validate: Check the rendered workflows before writing them
+            (default: False): valid YAML, existing `needs`, and inputs
+            matching the reusable workflows they call. See
+            validator.validate_workflows().
+        dry_run: Render (and validate) the workflows but write no files
+            (default: False), e.g. to estimate their cost before a rollout
 
     Returns:
         Dict with:
             - success (bool): Whether generation succeeded
-            - files_created (list): Paths to generated files
+            - files_created (list): Paths to generated files (empty for
+              a dry run)
+            - workflows (dict): Rendered workflow contents by file name
             - message (str): Status message
 
     Raises:
         FileNotFoundError: If pyproject.toml or setup.py missing
+        ValueError: If an option has an unsupported value, or validate
+            finds problems in the rendered workflows
     """
     # Validation
-    if not Path("pyproject.toml").exists() or not Path("setup.py").exists():
-        msg = "Project not initialized. Run 'pypi-workflow-generator-init' first."
-        raise FileNotFoundError(msg)
+    monorepo_packages = _project_packages(monorepo, packages)
+    if monorepo:
+        _validate_monorepo_options(
+            test_shards=test_shards > 1,
+            test_result_cache=test_result_cache,
+            reuse_artifacts=reuse_artifacts,
+            compact_pipeline=compact_pipeline,
+            build_backend=build_backend == "cibuildwheel",
+            package_paths=package_paths is not None,
+            path_filter=path_filter == "paths-ignore",
+        )
+        # Each package's PR workflow only runs for its own changes
+        path_filter = "paths" if path_filter == "none" else path_filter
+
+    _validate_choice("version_lookup", version_lookup, VERSION_LOOKUP_MODES)
+    _validate_choice("checkout_strategy", checkout_strategy, CHECKOUT_STRATEGIES)
+    _validate_choice("cache_strategy", cache_strategy, CACHE_STRATEGIES)
+    _validate_choice("installer", installer, INSTALLERS)
+    _validate_choice("lint", lint, LINT_MODES)
+    _validate_choice("path_filter", path_filter, PATH_FILTERS)
+    _validate_choice("build_backend", build_backend, BUILD_BACKENDS)
+    _validate_choice("renderer", renderer, RENDERERS)
+    emit = _workflow_emitter(renderer, workflow_transforms)
+    if installer == "uv" and cache_strategy != "none":
+        msg = (
+            f"cache_strategy '{cache_strategy}' only applies to the pip installer; "
+            "the uv installer always caches via setup-uv"
+        )
+        raise ValueError(msg)
+    if compact_pipeline and reuse_artifacts:
+        msg = (
+            "compact_pipeline cannot be combined with reuse_artifacts; a reused "
+            "build skips the job that would calculate the version"
+        )
+        raise ValueError(msg)
+    if compact_pipeline and build_backend == "cibuildwheel":
+        msg = (
+            "compact_pipeline cannot be combined with the cibuildwheel backend; "
+            "every wheel job needs the version before the matrix starts"
+        )
+        raise ValueError(msg)
+    if wheel_runners is not None and build_backend != "cibuildwheel":
+        msg = "wheel_runners only applies to the cibuildwheel build backend"
+        raise ValueError(msg)
+    wheel_runners = _validate_list(
+        "wheel_runners", wheel_runners or list(DEFAULT_WHEEL_RUNNERS)
+    )
+
+    test_matrix = python_versions is not None or os_runners is not None
+    if test_matrix:
+        python_versions = _validate_list(
+            "python_versions", python_versions or [python_version]
+        )
+        os_runners = _validate_list("os_runners", os_runners or ["ubuntu-latest"])
+
+    # Only in the context when a template reads them, so that projects
+    # differing in nothing else share render cache entries
+    uses_package_paths = path_filter in ("paths", "changes") or test_result_cache
+    if package_paths is not None or uses_package_paths:
+        package_paths = _validate_list(
+            "package_paths", package_paths or _default_package_paths(test_path)
+        )
+    ignored_paths = _validate_list(
+        "ignored_paths", ignored_paths or list(DEFAULT_IGNORED_PATHS)
+    )
+
+    _validate_int("test_shards", test_shards, 1)
+    if artifact_compression_level is not None:
+        _validate_int(
+            "artifact_compression_level",
+            artifact_compression_level,
+            0,
+            MAX_COMPRESSION_LEVEL,
+        )
+    if artifact_retention_days is not None:
+        _validate_int(
+            "artifact_retention_days", artifact_retention_days, 1, MAX_RETENTION_DAYS
+        )
 
     # Get template directory
     script_dir = Path(__file__).resolve().parent
 
-    # Set up Jinja2 environment
-    env = Environment(loader=FileSystemLoader(str(script_dir)))
-
     # Construct output directories
     output_dir = (
         Path(base_output_dir)
@@ -64,9 +607,6 @@ def generate_workflows(
     )
     scripts_dir = Path.cwd() / "scripts"
 
-    output_dir.mkdir(parents=True, exist_ok=True)
-    scripts_dir.mkdir(parents=True, exist_ok=True)
-
     files_created = []
 
     # Template context
@@ -74,19 +614,58 @@ def generate_workflows(
         "python_version": python_version,
         "test_path": test_path,
         "verbose_publish": verbose_publish,
+        "version_lookup": version_lookup,
+        "checkout_strategy": checkout_strategy,
+        "cache_strategy": cache_strategy,
+        "installer": installer,
+        "test_matrix": test_matrix,
+        "python_versions": python_versions,
+        "os_runners": os_runners,
+        "test_shards": test_shards,
+        "pytest_xdist": pytest_xdist,
+        "lint": lint,
+        "concurrency": concurrency,
+        "path_filter": path_filter,
+        "package_paths": package_paths if uses_package_paths else None,
+        "ignored_paths": ignored_paths,
+        "test_result_cache": test_result_cache,
+        "reuse_artifacts": reuse_artifacts,
+        "compact_pipeline": compact_pipeline,
+        "artifact_compression_level": artifact_compression_level,
+        "artifact_retention_days": artifact_retention_days,
+        "testpypi_skip_unchanged": testpypi_skip_unchanged,
+        "build_backend": build_backend,
+        "wheel_runners": wheel_runners,
+        "merge_queue": merge_queue,
+        "step_timing": step_timing,
+        "monorepo": monorepo,
+        "package": None,
     }
 
-    # Generate each workflow file
-    workflow_templates = [
-        ("_reusable_test_build.yml.j2", "_reusable-test-build.yml"),
-        ("release.yml.j2", "release.yml"),
-        ("test_pr.yml.j2", "test-pr.yml"),
-    ]
+    # Render each workflow, with per-package overrides of the context
+    workflows = {}
+    for template_name, output_filename, overrides in _workflow_files(monorepo_packages):
+        content = render_template(script_dir, template_name, {**context, **overrides})
+        workflows[output_filename] = emit(output_filename, content)
 
-    for template_name, output_filename in workflow_templates:
-        template = env.get_template(template_name)
-        content = template.render(**context)
+    # Nothing is written if a rendered workflow is broken
+    if validate:
+        validation = validate_workflows(workflows, str(output_dir))
+        if not validation["success"]:
+            raise ValueError(validation["message"])
 
+    if dry_run:
+        return {
+            "success": True,
+            "files_created": files_created,
+            "workflows": workflows,
+            "message": f"Rendered {len(workflows)} workflows (dry run, none written)",
+        }
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    scripts_dir.mkdir(parents=True, exist_ok=True)
+
+    for output_filename, content in workflows.items():
         full_output_path = output_dir / output_filename
         full_output_path.write_text(content)
 
@@ -94,10 +673,13 @@ def generate_workflows(
 
     # Generate script files
     script_templates = [("scripts/calculate_version.sh.j2", "calculate_version.sh")]
+    if test_shards > 1:
+        script_templates.append(("scripts/test_shards.py.j2", "test_shards.py"))
+    if reuse_artifacts:
+        script_templates.append(("scripts/promote_dist.py.j2", "promote_dist.py"))
 
     for template_name, output_filename in script_templates:
-        template = env.get_template(template_name)
-        content = template.render(**context)
+        content = render_template(script_dir, template_name, context)
 
         full_output_path = scripts_dir / output_filename
         full_output_path.write_text(content)
@@ -110,6 +692,7 @@ def generate_workflows(
     return {
         "success": True,
         "files_created": files_created,
+        "workflows": workflows,
         "message": f"Successfully generated {len(files_created)} files:\n"
         + "\n".join(f"  - {f}" for f in files_created),
     }
@@ -252,36 +835,32 @@ def initialize_project(  # noqa: PLR0913
     }
 
 
-def create_git_release(version: str) -> Dict[str, Any]:
+async def create_git_release_async(version: str) -> Dict[str, Any]:
     """
-    Create and push a git release tag.
+    Create and push a git release tag without blocking the event loop.
 
     Args:
         version: Version string (e.g., 'v1.0.0')
 
     Returns:
-        Dict with success status
-
-    Raises:
-        subprocess.CalledProcessError: If git commands fail
+        Dict with success status and per-command timings
     """
+    timings = []
     try:
         # Create tag
-        subprocess.run(
-            ["git", "tag", version], check=True, capture_output=True, text=True
-        )
+        result = await run_git_async(["tag", version], check=True)
+        timings.append(result.timing())
 
         # Push tag
-        subprocess.run(
-            ["git", "push", "origin", version],
-            check=True,
-            capture_output=True,
-            text=True,
+        result = await run_git_async(
+            ["push", "origin", version], timeout=NETWORK_TIMEOUT, check=True
         )
+        timings.append(result.timing())
 
         return {
             "success": True,
             "version": version,
+            "timings": timings,
             "message": f"Successfully created and pushed tag {version}",
         }
     except subprocess.CalledProcessError as e:
@@ -289,11 +868,172 @@ def create_git_release(version: str) -> Dict[str, Any]:
         return {
             "success": False,
             "error": str(e),
+            "timings": timings,
             "message": f"Error creating or pushing tag: {error_detail}",
         }
+    except subprocess.TimeoutExpired as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "timings": timings,
+            "message": f"Timed out creating or pushing tag: {e}",
+        }
     except FileNotFoundError:
         return {
             "success": False,
             "error": "git not found",
+            "timings": timings,
             "message": "Git is not installed or not in PATH",
         }
+
+
+def create_git_release(version: str) -> Dict[str, Any]:
+    """
+    Create and push a git release tag.
+
+    Blocking wrapper around create_git_release_async().
+
+    Args:
+        version: Version string (e.g., 'v1.0.0')
+
+    Returns:
+        Dict with success status
+    """
+    return run_sync(create_git_release_async(version))
+
+
+def _parse_push_porcelain(output: str) -> Dict[str, Dict[str, str]]:
+    """
+    Parse ``git push --porcelain`` output into per-ref status.
+
+    Each ref line has the form ``<flag>\\t<from>:<to>\\t<summary>``.
+
+    Returns:
+        Dict mapping destination ref (e.g. 'refs/tags/v1.0.0') to a dict
+        with 'flag' and 'summary' keys
+    """
+    statuses = {}
+    for line in output.splitlines():
+        parts = line.split("\t")
+        if len(parts) < _PORCELAIN_REF_FIELDS or ":" not in parts[1]:
+            continue
+        destination = parts[1].split(":", 1)[1]
+        statuses[destination] = {"flag": parts[0].strip(), "summary": parts[2]}
+    return statuses
+
+
+async def create_git_releases_async(tags: List[str]) -> Dict[str, Any]:
+    """
+    Create several git release tags and push them in one atomic push.
+
+    All tags are created locally first. If any tag cannot be created, the
+    tags created so far are deleted again and nothing is pushed. Otherwise
+    all tags are sent with a single ``git push --atomic``, so the remote
+    either receives every tag or none of them. A failed push also removes
+    the local tags so the call can be retried as-is.
+
+    Args:
+        tags: Tag names (e.g., ['pkg-a-v1.0.0', 'pkg-b-v2.1.0'])
+
+    Returns:
+        Dict with:
+            - success (bool): Whether every tag was created and pushed
+            - tags (list): Per-tag dicts with 'tag', 'success' and 'message'
+            - timings (list): Command and duration of every git call
+            - message (str): Status message
+    """
+    # Drop duplicates while keeping the caller's order
+    tags = list(dict.fromkeys(tags))
+    if not tags:
+        return {
+            "success": False,
+            "tags": [],
+            "timings": [],
+            "error": "no tags given",
+            "message": "No tags given to create",
+        }
+
+    results = {tag: {"tag": tag, "success": False, "message": ""} for tag in tags}
+    timings = []
+
+    def _report(success: bool, message: str) -> Dict[str, Any]:
+        lines = [
+            f"  - {r['tag']}: {'ok' if r['success'] else 'failed'} ({r['message']})"
+            for r in results.values()
+        ]
+        return {
+            "success": success,
+            "tags": list(results.values()),
+            "timings": timings,
+            "message": message + "\n" + "\n".join(lines),
+        }
+
+    async def _rollback(created: List[str]) -> None:
+        for tag in created:
+            result = await run_git_async(["tag", "-d", tag])
+            timings.append(result.timing())
+
+    created = []
+    try:
+        for tag in tags:
+            tag_result = await run_git_async(["tag", tag])
+            timings.append(tag_result.timing())
+            if tag_result.returncode != 0:
+                results[tag]["message"] = tag_result.stderr.strip() or "git tag failed"
+                await _rollback(created)
+                for other in created:
+                    results[other]["message"] = "created, then rolled back"
+                return _report(False, f"Error creating tag {tag}; nothing was pushed")
+            created.append(tag)
+
+        try:
+            push_result = await run_git_async(
+                ["push", "--atomic", "--porcelain", "origin"]
+                + [f"refs/tags/{tag}" for tag in tags],
+                timeout=NETWORK_TIMEOUT,
+            )
+        except subprocess.TimeoutExpired as e:
+            await _rollback(created)
+            for tag in tags:
+                results[tag]["message"] = f"push timed out after {e.timeout}s"
+            return _report(False, f"Timed out pushing {len(tags)} tags")
+    except FileNotFoundError:
+        return {
+            "success": False,
+            "tags": list(results.values()),
+            "timings": timings,
+            "error": "git not found",
+            "message": "Git is not installed or not in PATH",
+        }
+    timings.append(push_result.timing())
+
+    statuses = _parse_push_porcelain(push_result.stdout)
+    pushed = push_result.returncode == 0
+    for tag in tags:
+        status = statuses.get(f"refs/tags/{tag}")
+        if status:
+            results[tag]["message"] = status["summary"]
+        elif not pushed:
+            results[tag]["message"] = push_result.stderr.strip() or "push failed"
+        results[tag]["success"] = pushed
+
+    if not pushed:
+        await _rollback(created)
+        return _report(False, f"Error pushing {len(tags)} tags; no tag was pushed")
+
+    return _report(True, f"Successfully created and pushed {len(tags)} tags")
+
+
+def create_git_releases(tags: List[str]) -> Dict[str, Any]:
+    """
+    Create several git release tags and push them in one atomic push.
+
+    Blocking wrapper around create_git_releases_async().
+
+    Args:
+        tags: Tag names (e.g., ['pkg-a-v1.0.0', 'pkg-b-v2.1.0'])
+
+    Returns:
+        Dict with overall success, per-tag results and timings
+    """
+    return run_sync(create_git_releases_async(tags))
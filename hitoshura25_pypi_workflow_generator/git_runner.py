@@ -0,0 +1,187 @@
+"""
+Asynchronous git command runner.
+
+All git invocations made by this package go through this module so that
+they share the same behaviour:
+
+- Commands run via asyncio.create_subprocess_exec, so the MCP server and
+  batch operations can run many of them without blocking the event loop
+- Every call has a timeout (the process is killed when it expires)
+- A process-wide cap limits how many git processes run at once, across
+  all threads and event loops (run_git() starts a new loop per call),
+  avoiding fork storms when processing many repositories
+- The wall-clock duration of every command is recorded on its result
+
+Results and errors mirror subprocess.run: a CompletedProcess subclass is
+returned, and CalledProcessError / TimeoutExpired are raised.
+"""
+
+import asyncio
+import concurrent.futures
+import contextlib
+import subprocess
+import threading
+import time
+from typing import Any, Coroutine, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Default timeout (seconds) for local git commands
+DEFAULT_TIMEOUT = 60.0
+
+# Default timeout (seconds) for commands that talk to a remote (push, ls-remote)
+NETWORK_TIMEOUT = 300.0
+
+# Seconds to wait for a killed process to be reaped. Helpers spawned by
+# git (ssh, credential helpers) can keep the pipes open after git dies.
+_KILL_GRACE_PERIOD = 1.0
+
+# Default maximum number of git processes running at once in the process
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Seconds between attempts to take a slot while the cap is reached
+_SLOT_POLL_INTERVAL = 0.005
+
+# Shared by every thread and event loop; asyncio primitives are bound to
+# a single loop, so they cannot enforce a process-wide cap
+_slots = threading.BoundedSemaphore(DEFAULT_MAX_CONCURRENCY)
+
+
+class GitResult(subprocess.CompletedProcess):
+    """Result of a git command, with its wall-clock duration in seconds."""
+
+    def __init__(
+        self,
+        args: List[str],
+        returncode: int,
+        stdout: str,
+        stderr: str,
+        duration: float,
+    ):
+        super().__init__(args, returncode, stdout, stderr)
+        self.duration = duration
+
+    def timing(self) -> dict:
+        """Return the command and its duration as a JSON-friendly dict."""
+        return {"command": " ".join(self.args), "duration": round(self.duration, 4)}
+
+
+def set_max_concurrency(limit: int) -> None:
+    """
+    Set the maximum number of git processes running at once.
+
+    Applies to commands started after the call; running commands finish
+    under the previous limit.
+
+    Args:
+        limit: Maximum concurrent git processes (must be >= 1)
+
+    Raises:
+        ValueError: If limit is less than 1
+    """
+    global _slots  # noqa: PLW0603
+    if limit < 1:
+        msg = f"Concurrency limit must be at least 1, got {limit}"
+        raise ValueError(msg)
+    _slots = threading.BoundedSemaphore(limit)
+
+
+@contextlib.asynccontextmanager
+async def _process_slot():
+    """Hold one of the process-wide git slots without blocking the loop."""
+    slots = _slots
+    while not slots.acquire(blocking=False):
+        await asyncio.sleep(_SLOT_POLL_INTERVAL)
+    try:
+        yield
+    finally:
+        slots.release()
+
+
+async def run_git_async(
+    args: List[str],
+    *,
+    cwd: Optional[str] = None,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+    check: bool = False,
+) -> GitResult:
+    """
+    Run a git command without blocking the event loop.
+
+    Args:
+        args: Arguments passed to git (e.g., ['tag', 'v1.0.0'])
+        cwd: Working directory (default: current directory)
+        timeout: Seconds before the process is killed (None for no timeout)
+        check: Raise CalledProcessError on a non-zero exit code
+
+    Returns:
+        GitResult with returncode, decoded stdout/stderr and duration
+
+    Raises:
+        FileNotFoundError: If git is not installed
+        subprocess.TimeoutExpired: If the command exceeds the timeout
+        subprocess.CalledProcessError: If check is True and git fails
+    """
+    cmd = ["git", *args]
+
+    async with _process_slot():
+        start = time.perf_counter()
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=cwd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(proc.wait(), _KILL_GRACE_PERIOD)
+            raise subprocess.TimeoutExpired(cmd, timeout) from None
+        duration = time.perf_counter() - start
+
+    result = GitResult(
+        cmd,
+        proc.returncode,
+        stdout.decode(errors="replace"),
+        stderr.decode(errors="replace"),
+        duration,
+    )
+    if check:
+        result.check_returncode()
+    return result
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Works both with and without a running event loop; when called from
+    inside one (e.g. a sync helper used by the MCP server), the coroutine
+    runs on a fresh loop in a worker thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def run_git(
+    args: List[str],
+    *,
+    cwd: Optional[str] = None,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+    check: bool = False,
+) -> GitResult:
+    """
+    Run a git command synchronously.
+
+    Blocking wrapper around run_git_async() for CLI code paths; accepts
+    the same arguments and raises the same exceptions.
+    """
+    return run_sync(run_git_async(args, cwd=cwd, timeout=timeout, check=check))
@@ -4,6 +4,8 @@ import re
 import subprocess
 from typing import Optional
 
+from hitoshura25_pypi_workflow_generator.git_runner import run_git
+
 
 def get_git_username() -> Optional[str]:
     """
@@ -19,22 +21,12 @@ def get_git_username() -> Optional[str]:
     """
     try:
         # Try github.user first (most specific)
-        result = subprocess.run(
-            ["git", "config", "--get", "github.user"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
+        result = run_git(["config", "--get", "github.user"])
         if result.returncode == 0 and result.stdout.strip():
             return result.stdout.strip()
 
         # Try extracting from GitHub remote URL
-        result = subprocess.run(
-            ["git", "remote", "get-url", "origin"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
+        result = run_git(["remote", "get-url", "origin"])
         if result.returncode == 0 and result.stdout.strip():
             url = result.stdout.strip()
             # Parse https://github.com/username/repo.git
@@ -44,17 +36,12 @@ def get_git_username() -> Optional[str]:
                 return match.group(1)
 
         # Fallback to user.name
-        result = subprocess.run(
-            ["git", "config", "--get", "user.name"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
+        result = run_git(["config", "--get", "user.name"])
         if result.returncode == 0 and result.stdout.strip():
             return result.stdout.strip()
 
-    except FileNotFoundError:
-        # Git not installed
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        # Git not installed or not responding
         pass
 
     return None
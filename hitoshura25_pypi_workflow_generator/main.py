@@ -9,10 +9,21 @@ GitHub Actions workflows.
 import argparse
 import sys
 
-from .generator import generate_workflows
+from .estimator import estimate_workflow_cost, load_calibration
+from .generator import (
+    BUILD_BACKENDS,
+    CACHE_STRATEGIES,
+    CHECKOUT_STRATEGIES,
+    INSTALLERS,
+    LINT_MODES,
+    PATH_FILTERS,
+    RENDERERS,
+    VERSION_LOOKUP_MODES,
+    generate_workflows,
+)
 
 
-def main():
+def main():  # noqa: PLR0915
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
         description="""
@@ -45,6 +56,36 @@ This creates:
         default="3.11",
         help="Python version to use in workflows (default: 3.11)",
     )
+    parser.add_argument(
+        "--python-versions",
+        nargs="+",
+        metavar="VERSION",
+        help=(
+            "Test on these Python versions in a parallel matrix; the package "
+            "is still built once with --python-version"
+        ),
+    )
+    parser.add_argument(
+        "--os-runners",
+        nargs="+",
+        metavar="RUNNER",
+        help="Runners for the test matrix (default: ubuntu-latest)",
+    )
+    parser.add_argument(
+        "--test-shards",
+        type=int,
+        default=1,
+        metavar="N",
+        help=(
+            "Split test files across N parallel jobs, balanced by durations "
+            "recorded in previous runs (default: 1)"
+        ),
+    )
+    parser.add_argument(
+        "--pytest-xdist",
+        action="store_true",
+        help="Also run tests in parallel within each job with 'pytest -n auto'",
+    )
     parser.add_argument(
         "--test-path", default=".", help="Path to tests directory (default: .)"
     )
@@ -53,16 +94,282 @@ This creates:
         action="store_true",
         help="Enable verbose mode for PyPI publishing actions",
     )
+    parser.add_argument(
+        "--version-lookup",
+        choices=VERSION_LOOKUP_MODES,
+        default="describe",
+        help=(
+            "How scripts/calculate_version.sh finds the latest tag: 'describe' "
+            "walks history (needs full clone), 'sorted-tags' picks the highest "
+            "local vX.Y.Z tag, 'ls-remote' asks origin directly "
+            "(default: describe)"
+        ),
+    )
+    parser.add_argument(
+        "--checkout-strategy",
+        choices=CHECKOUT_STRATEGIES,
+        default="full",
+        help=(
+            "How generated jobs check out the repository: 'full' clones all "
+            "history and tags in every job, 'shallow' uses single-commit or "
+            "blobless clones where full history isn't needed (default: full)"
+        ),
+    )
+    parser.add_argument(
+        "--cache-strategy",
+        choices=CACHE_STRATEGIES,
+        default="none",
+        help=(
+            "Dependency caching in the reusable test/build workflow: 'pip' "
+            "caches downloads keyed on pyproject.toml/setup.py, 'wheelhouse' "
+            "caches prebuilt wheels for all dependencies (default: none)"
+        ),
+    )
+    parser.add_argument(
+        "--installer",
+        choices=INSTALLERS,
+        default="pip",
+        help=(
+            "Tool used to install dependencies and build the package; 'uv' "
+            "uses 'uv pip install' and 'uv build' with a persisted uv cache "
+            "(default: pip)"
+        ),
+    )
+    parser.add_argument(
+        "--lint",
+        choices=LINT_MODES,
+        default="parallel",
+        help=(
+            "Where Ruff runs: 'parallel' in its own cached job alongside the "
+            "tests, 'inline' as a step before the tests, 'none' to disable "
+            "(default: parallel)"
+        ),
+    )
+    parser.add_argument(
+        "--no-concurrency",
+        dest="concurrency",
+        action="store_false",
+        help=(
+            "Do not add concurrency groups (by default superseded PR runs are "
+            "cancelled and releases run one at a time)"
+        ),
+    )
+    parser.add_argument(
+        "--path-filter",
+        choices=PATH_FILTERS,
+        default="none",
+        help=(
+            "Skip PR runs that do not touch the package: 'paths' / "
+            "'paths-ignore' filter the trigger, 'changes' adds a job that "
+            "skips the rest of the pipeline (default: none)"
+        ),
+    )
+    parser.add_argument(
+        "--package-paths",
+        nargs="+",
+        metavar="PATTERN",
+        help=(
+            "Path patterns that affect the package (default: derived from "
+            "the project layout)"
+        ),
+    )
+    parser.add_argument(
+        "--ignored-paths",
+        nargs="+",
+        metavar="PATTERN",
+        help="Path patterns for --path-filter paths-ignore (default: docs, *.md)",
+    )
+    parser.add_argument(
+        "--test-result-cache",
+        action="store_true",
+        help=(
+            "Skip tests (but still build) when the files matching the package "
+            "paths already passed in an earlier run"
+        ),
+    )
+    parser.add_argument(
+        "--reuse-artifacts",
+        action="store_true",
+        help=(
+            "Publish releases from the distributions a merge queue run or "
+            "earlier release already built for the same source tree instead "
+            "of rebuilding"
+        ),
+    )
+    parser.add_argument(
+        "--compact-pipeline",
+        action="store_true",
+        help=(
+            "Calculate the version in the build job instead of a separate "
+            "job (one runner and one full clone fewer per run)"
+        ),
+    )
+    parser.add_argument(
+        "--artifact-compression-level",
+        type=int,
+        metavar="LEVEL",
+        help=(
+            "Compression level 0-9 for the distribution artifact "
+            "(default: the upload action's default, 6)"
+        ),
+    )
+    parser.add_argument(
+        "--artifact-retention-days",
+        type=int,
+        metavar="DAYS",
+        help="Days to keep the distribution artifact (default: repository setting)",
+    )
+    parser.add_argument(
+        "--testpypi-skip-unchanged",
+        action="store_true",
+        help=(
+            "Skip the TestPyPI publish when the PR already published "
+            "distributions with the same contents"
+        ),
+    )
+    parser.add_argument(
+        "--build-backend",
+        choices=BUILD_BACKENDS,
+        default="build",
+        help=(
+            "How distributions are built: 'build' for pure-Python packages, "
+            "'cibuildwheel' for a parallel wheel matrix (compiled extensions)"
+        ),
+    )
+    parser.add_argument(
+        "--wheel-runners",
+        nargs="+",
+        metavar="RUNNER",
+        help=(
+            "Runners for the cibuildwheel matrix (default: Linux x86_64 and "
+            "aarch64, Windows, macOS x86_64 and arm64)"
+        ),
+    )
+    parser.add_argument(
+        "--merge-queue",
+        action="store_true",
+        help=(
+            "Also run the PR workflow for merge queue batches (no RC version "
+            "and no TestPyPI publish for queue runs)"
+        ),
+    )
+    parser.add_argument(
+        "--step-timing",
+        action="store_true",
+        help=(
+            "Record per-step timings of every job as an artifact and a step "
+            "summary table"
+        ),
+    )
+    parser.add_argument(
+        "--monorepo",
+        action="store_true",
+        help=(
+            "Generate a PR and a release workflow per package in "
+            "subdirectories, each triggered only by its own changes"
+        ),
+    )
+    parser.add_argument(
+        "--packages",
+        nargs="+",
+        metavar="DIR",
+        help=(
+            "Package directories for --monorepo (default: every subdirectory "
+            "with a pyproject.toml or setup.py)"
+        ),
+    )
+    parser.add_argument(
+        "--renderer",
+        choices=RENDERERS,
+        default="template",
+        help=(
+            "How workflow files are written: 'template' keeps the templates' "
+            "output and comments, 'model' re-emits it from the workflow "
+            "object model (default: template)"
+        ),
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help=(
+            "Check the rendered workflows (YAML, needs, reusable workflow "
+            "inputs) and write nothing if they are broken"
+        ),
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Render the workflows without writing any files",
+    )
+    parser.add_argument(
+        "--estimate",
+        action="store_true",
+        help=(
+            "Print the estimated critical path and runner-minutes of each "
+            "rendered workflow trigger; implies --dry-run"
+        ),
+    )
+    parser.add_argument(
+        "--calibration",
+        nargs="+",
+        metavar="FILE",
+        help=(
+            "JSON files of measured seconds per step category for --estimate "
+            '(e.g. {"tests": 240}); later files take precedence'
+        ),
+    )
 
     args = parser.parse_args()
 
+    calibration = None
+    if args.calibration:
+        try:
+            calibration = load_calibration(args.calibration)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+
     try:
         result = generate_workflows(
             python_version=args.python_version,
             test_path=args.test_path,
             verbose_publish=args.verbose_publish,
+            version_lookup=args.version_lookup,
+            checkout_strategy=args.checkout_strategy,
+            cache_strategy=args.cache_strategy,
+            installer=args.installer,
+            python_versions=args.python_versions,
+            os_runners=args.os_runners,
+            test_shards=args.test_shards,
+            pytest_xdist=args.pytest_xdist,
+            lint=args.lint,
+            concurrency=args.concurrency,
+            path_filter=args.path_filter,
+            package_paths=args.package_paths,
+            ignored_paths=args.ignored_paths,
+            test_result_cache=args.test_result_cache,
+            reuse_artifacts=args.reuse_artifacts,
+            compact_pipeline=args.compact_pipeline,
+            artifact_compression_level=args.artifact_compression_level,
+            artifact_retention_days=args.artifact_retention_days,
+            testpypi_skip_unchanged=args.testpypi_skip_unchanged,
+            build_backend=args.build_backend,
+            wheel_runners=args.wheel_runners,
+            merge_queue=args.merge_queue,
+            step_timing=args.step_timing,
+            monorepo=args.monorepo,
+            packages=args.packages,
+            renderer=args.renderer,
+            validate=args.validate,
+            dry_run=args.dry_run or args.estimate,
         )
         print(result["message"])
+        if args.estimate:
+            estimate = estimate_workflow_cost(
+                calibration=calibration, workflows=result["workflows"]
+            )
+            print()
+            print(estimate["message"])
         return 0
     except FileNotFoundError as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -0,0 +1,157 @@
+"""
+LRU cache of rendered templates.
+
+The MCP server and batch generation render the same templates with the
+same options over and over, for project after project. Rendered output
+is cached under:
+
+- A fingerprint of the template set: the SHA-256 of the source of every
+  template in the template directory. It is only recomputed when a
+  template's size or modification time changes, so an edited template
+  (or one it imports) never serves stale output
+- The template's name
+- The normalized context: its JSON encoding with sorted keys, so equal
+  contexts share an entry however they were built. Contexts that are
+  not JSON-serializable are rendered without caching
+
+The least recently used entries are evicted beyond the size limit, and
+hit, miss and eviction counters are kept for callers to inspect. Misses
+are cheap too: each template directory has one Jinja environment, which
+keeps its compiled templates.
+"""
+
+import functools
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from jinja2 import Environment, FileSystemLoader
+
+# Default maximum number of rendered outputs kept
+DEFAULT_MAX_ENTRIES = 256
+
+_max_entries = DEFAULT_MAX_ENTRIES
+_entries: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+_lock = threading.Lock()
+
+
+def render_template(
+    template_dir: Path, template_name: str, context: Dict[str, Any]
+) -> str:
+    """
+    Render a template, reusing the output of an earlier identical render.
+
+    Args:
+        template_dir: Directory of the template set
+        template_name: Template path relative to template_dir
+        context: Template variables
+
+    Returns:
+        The rendered template
+    """
+    key = _cache_key(Path(template_dir), template_name, context)
+    if key is not None:
+        with _lock:
+            if key in _entries:
+                _entries.move_to_end(key)
+                _stats["hits"] += 1
+                return _entries[key]
+            _stats["misses"] += 1
+
+    content = (
+        _environment(str(template_dir)).get_template(template_name).render(**context)
+    )
+
+    if key is not None:
+        with _lock:
+            _entries[key] = content
+            _evict()
+    return content
+
+
+def render_cache_info() -> Dict[str, int]:
+    """
+    Return the render cache's counters.
+
+    Returns:
+        Dict with hits, misses and evictions since the last clear, and
+        the current number of entries and maximum number of entries
+    """
+    with _lock:
+        return {**_stats, "entries": len(_entries), "max_entries": _max_entries}
+
+
+def clear_render_cache() -> None:
+    """Drop all rendered outputs and reset the counters."""
+    with _lock:
+        _entries.clear()
+        _stats.update(hits=0, misses=0, evictions=0)
+
+
+def set_render_cache_size(max_entries: int) -> None:
+    """
+    Set the maximum number of rendered outputs kept (0 disables caching).
+
+    Raises:
+        ValueError: If max_entries is negative
+    """
+    global _max_entries  # noqa: PLW0603
+    if isinstance(max_entries, bool) or not isinstance(max_entries, int):
+        msg = f"max_entries must be an integer, got {max_entries!r}"
+        raise ValueError(msg)
+    if max_entries < 0:
+        msg = f"max_entries must be at least 0, got {max_entries}"
+        raise ValueError(msg)
+    with _lock:
+        _max_entries = max_entries
+        _evict()
+
+
+def _evict() -> None:
+    """Drop the least recently used entries beyond the limit (lock held)."""
+    while len(_entries) > _max_entries:
+        _entries.popitem(last=False)
+        _stats["evictions"] += 1
+
+
+def _cache_key(
+    template_dir: Path, template_name: str, context: Dict[str, Any]
+) -> Optional[Tuple[str, str, str]]:
+    if _max_entries == 0:
+        return None
+    try:
+        normalized = json.dumps(context, sort_keys=True)
+    except TypeError:
+        return None
+    return (_template_fingerprint(template_dir), template_name, normalized)
+
+
+def _template_fingerprint(template_dir: Path) -> str:
+    """Fingerprint the template set, rehashing only changed sources."""
+    signature = tuple(
+        (path.relative_to(template_dir).as_posix(), stat.st_mtime_ns, stat.st_size)
+        for path in sorted(template_dir.rglob("*.j2"))
+        for stat in [path.stat()]
+    )
+    return _hash_templates(str(template_dir), signature)
+
+
+@functools.lru_cache(maxsize=8)
+def _hash_templates(
+    template_dir: str, signature: Tuple[Tuple[str, int, int], ...]
+) -> str:
+    digest = hashlib.sha256()
+    for name, _, _ in signature:
+        digest.update(name.encode() + b"\0")
+        digest.update(hashlib.sha256((Path(template_dir) / name).read_bytes()).digest())
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=8)
+def _environment(template_dir: str) -> Environment:
+    # Jinja reloads a compiled template when its source file changes
+    return Environment(loader=FileSystemLoader(template_dir))
@@ -11,7 +11,20 @@ import json
 import sys
 from typing import Any, Dict
 
-from .generator import create_git_release, generate_workflows, initialize_project
+from .generator import (
+    BUILD_BACKENDS,
+    CACHE_STRATEGIES,
+    CHECKOUT_STRATEGIES,
+    INSTALLERS,
+    LINT_MODES,
+    PATH_FILTERS,
+    RENDERERS,
+    VERSION_LOOKUP_MODES,
+    create_git_release_async,
+    create_git_releases_async,
+    generate_workflows,
+    initialize_project,
+)
 
 
 class MCPServer:
@@ -46,6 +59,40 @@ class MCPServer:
                                 "description": "Python version to use in workflows",
                                 "default": "3.11",
                             },
+                            "python_versions": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": (
+                                    "Python versions to test on in a parallel "
+                                    "matrix; the package is built once with "
+                                    "python_version after the matrix passes"
+                                ),
+                            },
+                            "os_runners": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": (
+                                    "Runners for the test matrix "
+                                    "(default: ubuntu-latest)"
+                                ),
+                            },
+                            "test_shards": {
+                                "type": "integer",
+                                "minimum": 1,
+                                "description": (
+                                    "Split test files across this many parallel "
+                                    "jobs, balanced by recorded durations"
+                                ),
+                                "default": 1,
+                            },
+                            "pytest_xdist": {
+                                "type": "boolean",
+                                "description": (
+                                    "Also run tests in parallel within each job "
+                                    "with 'pytest -n auto'"
+                                ),
+                                "default": False,
+                            },
                             "test_path": {
                                 "type": "string",
                                 "description": "Path to tests directory",
@@ -58,6 +105,232 @@ class MCPServer:
                                 ),
                                 "default": False,
                             },
+                            "version_lookup": {
+                                "type": "string",
+                                "enum": list(VERSION_LOOKUP_MODES),
+                                "description": (
+                                    "How calculate_version.sh finds the latest "
+                                    "tag: 'describe' walks history, 'sorted-tags' "
+                                    "uses the highest local vX.Y.Z tag, "
+                                    "'ls-remote' queries origin without history"
+                                ),
+                                "default": "describe",
+                            },
+                            "checkout_strategy": {
+                                "type": "string",
+                                "enum": list(CHECKOUT_STRATEGIES),
+                                "description": (
+                                    "How generated jobs check out the repo: "
+                                    "'full' clones all history in every job, "
+                                    "'shallow' uses single-commit or blobless "
+                                    "clones where history isn't needed"
+                                ),
+                                "default": "full",
+                            },
+                            "cache_strategy": {
+                                "type": "string",
+                                "enum": list(CACHE_STRATEGIES),
+                                "description": (
+                                    "Dependency caching for test/build: 'pip' "
+                                    "caches downloads keyed on pyproject.toml/"
+                                    "setup.py, 'wheelhouse' caches prebuilt "
+                                    "wheels for all dependencies"
+                                ),
+                                "default": "none",
+                            },
+                            "installer": {
+                                "type": "string",
+                                "enum": list(INSTALLERS),
+                                "description": (
+                                    "Tool used to install dependencies and "
+                                    "build: 'pip' or 'uv' (uv pip install + "
+                                    "uv build with a persisted uv cache)"
+                                ),
+                                "default": "pip",
+                            },
+                            "lint": {
+                                "type": "string",
+                                "enum": list(LINT_MODES),
+                                "description": (
+                                    "Where Ruff runs: 'parallel' in its own "
+                                    "cached job alongside the tests, 'inline' "
+                                    "before the tests, 'none' to disable"
+                                ),
+                                "default": "parallel",
+                            },
+                            "concurrency": {
+                                "type": "boolean",
+                                "description": (
+                                    "Add concurrency groups: cancel superseded "
+                                    "PR runs and run releases one at a time"
+                                ),
+                                "default": True,
+                            },
+                            "path_filter": {
+                                "type": "string",
+                                "enum": list(PATH_FILTERS),
+                                "description": (
+                                    "Skip PR runs that do not touch the "
+                                    "package: 'paths'/'paths-ignore' filter the "
+                                    "trigger, 'changes' adds a job that skips "
+                                    "the rest of the pipeline"
+                                ),
+                                "default": "none",
+                            },
+                            "package_paths": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": (
+                                    "Path patterns that affect the package "
+                                    "(default: derived from the project layout)"
+                                ),
+                            },
+                            "ignored_paths": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": (
+                                    "Path patterns for the paths-ignore filter "
+                                    "(default: docs and Markdown files)"
+                                ),
+                            },
+                            "test_result_cache": {
+                                "type": "boolean",
+                                "description": (
+                                    "Skip tests (but still build) when the "
+                                    "package sources, tests and dependency "
+                                    "specs already passed in an earlier run"
+                                ),
+                                "default": False,
+                            },
+                            "reuse_artifacts": {
+                                "type": "boolean",
+                                "description": (
+                                    "Publish releases from the distributions "
+                                    "a merge queue run or earlier release "
+                                    "already built for the same source tree "
+                                    "instead of rebuilding"
+                                ),
+                                "default": False,
+                            },
+                            "compact_pipeline": {
+                                "type": "boolean",
+                                "description": (
+                                    "Calculate the version in the build job "
+                                    "instead of a separate job, saving one "
+                                    "runner and one full clone per run"
+                                ),
+                                "default": False,
+                            },
+                            "artifact_compression_level": {
+                                "type": "integer",
+                                "minimum": 0,
+                                "maximum": 9,
+                                "description": (
+                                    "Compression level for the distribution "
+                                    "artifact (default: the upload action's "
+                                    "default, 6)"
+                                ),
+                            },
+                            "artifact_retention_days": {
+                                "type": "integer",
+                                "minimum": 1,
+                                "maximum": 90,
+                                "description": (
+                                    "Days to keep the distribution artifact "
+                                    "(default: the repository setting)"
+                                ),
+                            },
+                            "testpypi_skip_unchanged": {
+                                "type": "boolean",
+                                "description": (
+                                    "Skip the TestPyPI publish when the PR "
+                                    "already published distributions with "
+                                    "the same contents"
+                                ),
+                                "default": False,
+                            },
+                            "build_backend": {
+                                "type": "string",
+                                "enum": list(BUILD_BACKENDS),
+                                "description": (
+                                    "How distributions are built: 'build' for "
+                                    "pure-Python packages, 'cibuildwheel' for a "
+                                    "parallel wheel matrix"
+                                ),
+                                "default": "build",
+                            },
+                            "wheel_runners": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": (
+                                    "Runners for the cibuildwheel matrix "
+                                    "(default: Linux x86_64/aarch64, Windows, "
+                                    "macOS x86_64/arm64)"
+                                ),
+                            },
+                            "merge_queue": {
+                                "type": "boolean",
+                                "description": (
+                                    "Also run the PR workflow for merge queue "
+                                    "batches, without an RC version or a "
+                                    "TestPyPI publish"
+                                ),
+                                "default": False,
+                            },
+                            "step_timing": {
+                                "type": "boolean",
+                                "description": (
+                                    "Record per-step timings of every job as "
+                                    "an artifact and a step summary table"
+                                ),
+                                "default": False,
+                            },
+                            "monorepo": {
+                                "type": "boolean",
+                                "description": (
+                                    "Generate a PR and a release workflow per "
+                                    "package in subdirectories, each triggered "
+                                    "only by its own changes"
+                                ),
+                                "default": False,
+                            },
+                            "packages": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": (
+                                    "Package directories for monorepo mode "
+                                    "(default: every subdirectory with a "
+                                    "pyproject.toml or setup.py)"
+                                ),
+                            },
+                            "renderer": {
+                                "type": "string",
+                                "enum": list(RENDERERS),
+                                "description": (
+                                    "How workflow files are written: "
+                                    "'template' keeps the templates' output "
+                                    "and comments, 'model' re-emits it from "
+                                    "the workflow object model"
+                                ),
+                                "default": "template",
+                            },
+                            "validate": {
+                                "type": "boolean",
+                                "description": (
+                                    "Check the rendered workflows (YAML, "
+                                    "needs, reusable workflow inputs) and "
+                                    "write nothing if they are broken"
+                                ),
+                                "default": False,
+                            },
+                            "dry_run": {
+                                "type": "boolean",
+                                "description": (
+                                    "Render (and validate) the workflows "
+                                    "without writing any files"
+                                ),
+                                "default": False,
+                            },
                         },
                         "required": [],
                     },
@@ -131,6 +404,27 @@ class MCPServer:
                         "required": ["version"],
                     },
                 },
+                {
+                    "name": "create_releases",
+                    "description": (
+                        "Create several git release tags (e.g. one per package "
+                        "in a monorepo) and push them in a single atomic push. "
+                        "Either all tags reach the remote or none do."
+                    ),
+                    "inputSchema": {
+                        "type": "object",
+                        "properties": {
+                            "tags": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": (
+                                    "Tag names (e.g., ['pkg-a-v1.0.0', 'pkg-b-v2.1.0'])"
+                                ),
+                            }
+                        },
+                        "required": ["tags"],
+                    },
+                },
             ]
         }
 
@@ -172,7 +466,14 @@ class MCPServer:
                 }
 
             if tool_name == "create_release":
-                result = create_git_release(arguments["version"])
+                result = await create_git_release_async(arguments["version"])
+                return {
+                    "content": [{"type": "text", "text": result["message"]}],
+                    "isError": not result["success"],
+                }
+
+            if tool_name == "create_releases":
+                result = await create_git_releases_async(arguments["tags"])
                 return {
                     "content": [{"type": "text", "text": result["message"]}],
                     "isError": not result["success"],
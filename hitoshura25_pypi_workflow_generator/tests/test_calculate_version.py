@@ -1,8 +1,11 @@
 """Tests for the calculate_version.sh script."""
 
 import os
+import subprocess
 from pathlib import Path
 
+import pytest
+
 from hitoshura25_pypi_workflow_generator.generator import generate_workflows
 
 # Expected number of generated files: 3 workflows + 1 script
@@ -169,3 +172,135 @@ def test_script_help_shows_dev_format(tmp_path):
 
     finally:
         os.chdir(original_cwd)
+
+
+def _git(*args, cwd):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def _run_script(script_path, cwd, *args):
+    result = subprocess.run(
+        [str(script_path), *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "GITHUB_OUTPUT": "/dev/stdout"},
+    )
+    return dict(
+        line.split("=", 1) for line in result.stdout.splitlines() if "=" in line
+    )
+
+
+def _make_tagged_repo(tmp_path):
+    """Create a repo with an 'origin' remote and out-of-order version tags."""
+    remote = tmp_path / "remote.git"
+    repo = tmp_path / "repo"
+    _git("init", "--bare", str(remote), cwd=tmp_path)
+    _git("init", str(repo), cwd=tmp_path)
+    _git("config", "user.name", "Test", cwd=repo)
+    _git("config", "user.email", "test@example.com", cwd=repo)
+    _git("remote", "add", "origin", str(remote), cwd=repo)
+    (repo / "pyproject.toml").write_text("[build-system]")
+    (repo / "setup.py").write_text("# setup")
+    _git("add", ".", cwd=repo)
+    _git("commit", "-m", "initial", cwd=repo)
+    # v1.10.0 is the highest version; v1.9.0 is the most recent tag
+    for tag in ("v1.2.3", "v1.10.0", "v1.9.0", "not-a-version"):
+        _git("commit", "--allow-empty", "-m", tag, cwd=repo)
+        _git("tag", tag, cwd=repo)
+    _git("push", "origin", "--tags", cwd=repo)
+    return repo
+
+
+@pytest.mark.parametrize("version_lookup", ["sorted-tags", "ls-remote"])
+def test_script_version_lookup_modes(tmp_path, version_lookup):
+    """Test that ref-based lookups pick the highest vX.Y.Z tag."""
+    repo = _make_tagged_repo(tmp_path)
+
+    original_cwd = Path.cwd()
+    try:
+        os.chdir(repo)
+        generate_workflows(version_lookup=version_lookup)
+    finally:
+        os.chdir(original_cwd)
+
+    script_path = repo / "scripts" / "calculate_version.sh"
+    outputs = _run_script(script_path, repo, "--type", "release", "--bump", "minor")
+    assert outputs["latest_tag"] == "v1.10.0"
+    assert outputs["new_version"] == "v1.11.0"
+
+
+def test_script_ls_remote_without_local_tags(tmp_path):
+    """Test that ls-remote mode works with no local tags at all."""
+    repo = _make_tagged_repo(tmp_path)
+    _git("tag", "-d", "v1.2.3", "v1.10.0", "v1.9.0", "not-a-version", cwd=repo)
+
+    original_cwd = Path.cwd()
+    try:
+        os.chdir(repo)
+        generate_workflows(version_lookup="ls-remote")
+    finally:
+        os.chdir(original_cwd)
+
+    outputs = _run_script(
+        repo / "scripts" / "calculate_version.sh",
+        repo,
+        "--type",
+        "rc",
+        "--bump",
+        "patch",
+        "--pr-number",
+        "7",
+        "--run-number",
+        "3",
+    )
+    assert outputs["latest_tag"] == "v1.10.0"
+    assert outputs["new_version"] == "1.10.1.dev7003"
+
+
+def test_invalid_version_lookup_rejected(tmp_path):
+    """Test that an unknown lookup mode raises ValueError."""
+    original_cwd = Path.cwd()
+    try:
+        os.chdir(tmp_path)
+        (tmp_path / "pyproject.toml").write_text("[build-system]")
+        (tmp_path / "setup.py").write_text("# setup")
+
+        with pytest.raises(ValueError, match="version_lookup"):
+            generate_workflows(version_lookup="newest")
+    finally:
+        os.chdir(original_cwd)
+
+
+@pytest.mark.parametrize("version_lookup", ["describe", "sorted-tags", "ls-remote"])
+def test_script_tag_prefix(tmp_path, version_lookup):
+    """Test that monorepo scripts only consider the package's own tags."""
+    repo = _make_tagged_repo(tmp_path)
+    (repo / "packages" / "alpha").mkdir(parents=True)
+    (repo / "packages" / "alpha" / "pyproject.toml").write_text("[build-system]")
+    for tag in ("alpha-v2.0.0", "beta-v9.0.0"):
+        _git("commit", "--allow-empty", "-m", tag, cwd=repo)
+        _git("tag", tag, cwd=repo)
+    _git("push", "origin", "--tags", cwd=repo)
+
+    original_cwd = Path.cwd()
+    try:
+        os.chdir(repo)
+        generate_workflows(version_lookup=version_lookup, monorepo=True)
+    finally:
+        os.chdir(original_cwd)
+
+    outputs = _run_script(
+        repo / "scripts" / "calculate_version.sh",
+        repo,
+        "--type",
+        "release",
+        "--bump",
+        "patch",
+        "--tag-prefix",
+        "alpha-",
+    )
+    assert outputs["latest_tag"] == "alpha-v2.0.0"
+    assert outputs["new_version"] == "v2.0.1"
+    assert outputs["new_tag"] == "alpha-v2.0.1"
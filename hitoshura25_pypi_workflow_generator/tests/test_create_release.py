@@ -0,0 +1,121 @@
+"""
+Tests for git release tag creation.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from hitoshura25_pypi_workflow_generator import create_release
+from hitoshura25_pypi_workflow_generator.generator import create_git_releases
+
+
+def _git(*args, cwd):
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """Create a git repository with one commit and a bare 'origin' remote."""
+    remote = tmp_path / "remote.git"
+    repo = tmp_path / "repo"
+    _git("init", "--bare", str(remote), cwd=tmp_path)
+    _git("init", str(repo), cwd=tmp_path)
+    _git("config", "user.name", "Test", cwd=repo)
+    _git("config", "user.email", "test@example.com", cwd=repo)
+    (repo / "README.md").write_text("test\n")
+    _git("add", "README.md", cwd=repo)
+    _git("commit", "-m", "initial", cwd=repo)
+    _git("remote", "add", "origin", str(remote), cwd=repo)
+
+    original_cwd = Path.cwd()
+    os.chdir(repo)
+    try:
+        yield repo, remote
+    finally:
+        os.chdir(original_cwd)
+
+
+def test_create_git_releases_pushes_all_tags(git_repo):
+    """Test that all tags are created and pushed in one call."""
+    _repo, remote = git_repo
+
+    result = create_git_releases(["pkg-a-v1.0.0", "pkg-b-v2.0.0"])
+
+    assert result["success"]
+    assert [r["tag"] for r in result["tags"]] == ["pkg-a-v1.0.0", "pkg-b-v2.0.0"]
+    assert all(r["success"] for r in result["tags"])
+    assert "new tag" in result["tags"][0]["message"]
+
+    remote_tags = _git("tag", cwd=remote).split()
+    assert remote_tags == ["pkg-a-v1.0.0", "pkg-b-v2.0.0"]
+
+
+def test_create_git_releases_rolls_back_on_existing_tag(git_repo):
+    """Test that nothing is pushed when one tag cannot be created."""
+    repo, remote = git_repo
+    _git("tag", "pkg-b-v2.0.0", cwd=repo)
+
+    result = create_git_releases(["pkg-a-v1.0.0", "pkg-b-v2.0.0", "pkg-c-v3.0.0"])
+
+    assert not result["success"]
+    statuses = {r["tag"]: r for r in result["tags"]}
+    assert "rolled back" in statuses["pkg-a-v1.0.0"]["message"]
+    assert "already exists" in statuses["pkg-b-v2.0.0"]["message"]
+    assert not any(r["success"] for r in result["tags"])
+
+    # Locally created tag was removed, the pre-existing one is untouched
+    assert _git("tag", cwd=repo).split() == ["pkg-b-v2.0.0"]
+    assert _git("tag", cwd=remote).split() == []
+
+
+def test_create_git_releases_atomic_push_failure(git_repo):
+    """Test that a rejected ref fails the whole push and removes local tags."""
+    repo, remote = git_repo
+    # Same tag name already on the remote, pointing at a different commit
+    _git("commit", "--allow-empty", "-m", "other", cwd=repo)
+    _git("tag", "pkg-b-v2.0.0", cwd=repo)
+    _git("push", "origin", "pkg-b-v2.0.0", cwd=repo)
+    _git("tag", "-d", "pkg-b-v2.0.0", cwd=repo)
+    _git("reset", "--hard", "HEAD~1", cwd=repo)
+
+    result = create_git_releases(["pkg-a-v1.0.0", "pkg-b-v2.0.0"])
+
+    assert not result["success"]
+    assert not any(r["success"] for r in result["tags"])
+    assert _git("tag", cwd=repo).split() == []
+    assert _git("tag", cwd=remote).split() == ["pkg-b-v2.0.0"]
+
+
+def test_create_git_releases_no_tags():
+    """Test that an empty tag list is rejected."""
+    result = create_git_releases([])
+
+    assert not result["success"]
+    assert result["tags"] == []
+
+
+def test_main_reports_git_timeout(capsys):
+    """Test that a git timeout is reported as an error instead of a traceback."""
+    timeout = subprocess.TimeoutExpired(["git", "describe"], 60)
+    with patch.object(sys, "argv", ["create-release", "patch"]), patch.object(
+        create_release, "run_git", side_effect=timeout
+    ):
+        assert create_release.main() == 1
+
+    assert "Error reading latest tag" in capsys.readouterr().err
+
+
+def test_overwrite_reports_git_timeout(capsys):
+    """Test that a timeout while checking the tag returns an error code."""
+    timeout = subprocess.TimeoutExpired(["git", "rev-parse"], 60)
+    with patch.object(create_release, "run_git", side_effect=timeout):
+        assert create_release.create_release_tag_with_overwrite("v1.0.0") == 1
+
+    assert "Error checking tag" in capsys.readouterr().err
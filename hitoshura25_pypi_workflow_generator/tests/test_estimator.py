@@ -0,0 +1,162 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from hitoshura25_pypi_workflow_generator.estimator import (
+    DEFAULT_CALIBRATION,
+    estimate_workflow_cost,
+    load_calibration,
+)
+from hitoshura25_pypi_workflow_generator.generator import generate_workflows
+
+# Python versions x OS runners of the matrix test
+MATRIX_SIZE = 4
+
+
+def _estimate(tmp_path, calibration=None, **kwargs):
+    """Generate workflows in tmp_path and return their estimates by trigger."""
+    tmp_path.mkdir(exist_ok=True)
+    (tmp_path / "pyproject.toml").write_text("[build-system]")
+    (tmp_path / "setup.py").write_text("from setuptools import setup\nsetup()")
+
+    original_cwd = Path.cwd()
+    os.chdir(tmp_path)
+    try:
+        generate_workflows(**kwargs)
+    finally:
+        os.chdir(original_cwd)
+
+    result = estimate_workflow_cost(
+        str(tmp_path / ".github" / "workflows"), calibration=calibration
+    )
+    assert result["success"]
+    return {e["trigger"]: e for e in result["estimates"]}
+
+
+def _job(estimate, name):
+    return next(job for job in estimate["jobs"] if job["name"] == name)
+
+
+def test_estimate_default_workflows(tmp_path):
+    """Each top-level trigger is estimated, with reusable jobs expanded."""
+    estimates = _estimate(tmp_path)
+
+    assert set(estimates) == {"pull_request", "workflow_dispatch"}
+    pr = estimates["pull_request"]
+    assert [job["name"] for job in pr["jobs"]] == [
+        "get-new-version",
+        "test-and-build/lint",
+        "test-and-build/test-and-build",
+        "publish-to-testpypi",
+    ]
+    assert pr["critical_path"] == [
+        "get-new-version",
+        "test-and-build/test-and-build",
+        "publish-to-testpypi",
+    ]
+    assert pr["critical_path_minutes"] < pr["runner_minutes"]
+    assert pr["billable_minutes"] >= pr["runner_minutes"]
+    assert estimates["workflow_dispatch"]["jobs"][-1]["name"] == "publish-to-pypi"
+
+
+def test_estimate_scales_with_matrix(tmp_path):
+    """Matrix instances add runner-minutes, and macOS bills at 10x."""
+    single = _estimate(tmp_path / "single", python_versions=["3.11"])
+    matrix = _estimate(
+        tmp_path / "matrix",
+        python_versions=["3.11", "3.12"],
+        os_runners=["ubuntu-latest", "macos-latest"],
+    )
+
+    test_job = _job(matrix["pull_request"], "test-and-build/test")
+    assert test_job["instances"] == MATRIX_SIZE
+    assert test_job["billable_minutes"] == 22 * -(-test_job["minutes"] // 1)
+    assert (
+        matrix["pull_request"]["runner_minutes"]
+        > single["pull_request"]["runner_minutes"]
+    )
+
+
+def test_estimate_skips_jobs_by_event(tmp_path):
+    """Merge queue runs neither calculate a version nor publish."""
+    estimates = _estimate(tmp_path, merge_queue=True)
+
+    names = [job["name"] for job in estimates["merge_group"]["jobs"]]
+    assert "test-and-build/test-and-build" in names
+    assert "get-new-version" not in names
+    assert "publish-to-testpypi" not in names
+    assert "publish-to-testpypi" in [
+        job["name"] for job in estimates["pull_request"]["jobs"]
+    ]
+
+
+def test_estimate_keeps_dependencies_of_skipped_jobs(tmp_path):
+    """Jobs after a skipped job still wait for what the skipped job needs."""
+    estimates = _estimate(tmp_path, merge_queue=True, path_filter="changes")
+
+    merge_group = estimates["merge_group"]
+    assert _job(merge_group, "test-and-build/test-and-build")["needs"] == ["changes"]
+    assert merge_group["critical_path"][0] == "changes"
+
+
+def test_estimate_calibration(tmp_path):
+    """Calibration replaces the default step costs."""
+    default = _estimate(tmp_path / "default")
+    calibrated = _estimate(tmp_path / "calibrated", calibration={"tests": 600})
+
+    extra = (600 - DEFAULT_CALIBRATION["tests"]) / 60
+    build = "test-and-build/test-and-build"
+    assert _job(calibrated["pull_request"], build)["minutes"] == pytest.approx(
+        _job(default["pull_request"], build)["minutes"] + extra, abs=0.01
+    )
+
+
+def test_load_calibration_merges_files(tmp_path):
+    """Later calibration files take precedence."""
+    first = tmp_path / "first.json"
+    second = tmp_path / "second.json"
+    first.write_text(json.dumps({"tests": 100, "install": 20}))
+    second.write_text(json.dumps({"tests": 50}))
+
+    assert load_calibration([str(first), str(second)]) == {
+        "tests": 50.0,
+        "install": 20.0,
+    }
+
+
+@pytest.mark.parametrize(
+    "content", ['{"compile": 10}', '{"tests": -1}', '{"tests": "slow"}', "[1]", "{"]
+)
+def test_load_calibration_invalid(tmp_path, content):
+    """Unknown keys, bad values and non-objects are rejected."""
+    path = tmp_path / "calibration.json"
+    path.write_text(content)
+
+    with pytest.raises(ValueError, match=r"(?i)calibration"):
+        load_calibration([str(path)])
+
+
+def test_estimate_missing_directory(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        estimate_workflow_cost(str(tmp_path / "missing"))
+
+
+def test_estimate_rendered_workflows(tmp_path):
+    """A dry run's rendered contents estimate like the written files."""
+    options = {"merge_queue": True, "path_filter": "changes"}
+    written = _estimate(tmp_path / "written", **options)
+
+    (tmp_path / "pyproject.toml").write_text("[build-system]")
+    (tmp_path / "setup.py").write_text("from setuptools import setup\nsetup()")
+    original_cwd = Path.cwd()
+    os.chdir(tmp_path)
+    try:
+        rendered = generate_workflows(dry_run=True, **options)["workflows"]
+        result = estimate_workflow_cost(workflows=rendered)
+    finally:
+        os.chdir(original_cwd)
+
+    assert {e["trigger"]: e for e in result["estimates"]} == written
+    assert not (tmp_path / ".github").exists()
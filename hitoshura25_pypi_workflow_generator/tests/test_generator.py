@@ -1,11 +1,25 @@
+import functools
+import json
 import os
+import re
+import shutil
+import subprocess
+import sys
+import zipfile
 from pathlib import Path
 
+import pytest
+import yaml
+
 from hitoshura25_pypi_workflow_generator.generator import generate_workflows
+from hitoshura25_pypi_workflow_generator.workflow_model import Step
 
 # Expected number of generated files: 3 workflows + 1 script
 EXPECTED_FILE_COUNT = 4
 
+# SOURCE_DATE_EPOCH pinned for reproducible builds (1980-01-01)
+REPRODUCIBLE_EPOCH = 315532800
+
 
 def test_generate_workflows_default_arguments(tmp_path):
     """Test workflow generation with default arguments."""
@@ -126,3 +140,1390 @@ def test_generate_workflows_custom_arguments(tmp_path):
 
     finally:
         os.chdir(original_cwd)
+
+
+def _generate(tmp_path, **kwargs):
+    """Generate workflows in tmp_path and return them parsed, keyed by filename."""
+    (tmp_path / "pyproject.toml").write_text("[build-system]")
+    (tmp_path / "setup.py").write_text("from setuptools import setup\nsetup()")
+
+    original_cwd = Path.cwd()
+    os.chdir(tmp_path)
+    try:
+        generate_workflows(**kwargs)
+    finally:
+        os.chdir(original_cwd)
+
+    output_dir = tmp_path / ".github" / "workflows"
+    return {
+        path.name: yaml.safe_load(path.read_text()) for path in output_dir.glob("*.yml")
+    }
+
+
+def _triggers(workflow):
+    """Return a workflow's `on:` section (PyYAML reads the bare key as True)."""
+    return workflow[True]
+
+
+def _checkout_options(job):
+    """Return the `with:` options of the checkout step in a job."""
+    step = next(s for s in job["steps"] if s.get("uses") == "actions/checkout@v4")
+    return step.get("with", {})
+
+
+def test_generate_workflows_options_are_keyword_only():
+    """Test that options added after verbose_publish cannot be passed positionally."""
+    with pytest.raises(TypeError):
+        generate_workflows("3.11", ".", None, False, "describe")
+
+
+def test_generate_workflows_full_checkout_by_default(tmp_path):
+    """Test that every checkout but lint fetches full history by default."""
+    workflows = _generate(tmp_path)
+
+    for workflow in workflows.values():
+        for job_id, job in workflow["jobs"].items():
+            if "steps" not in job or job_id == "lint":
+                continue  # Reusable workflow call, or Ruff's depth-1 checkout
+            if any(s.get("uses") == "actions/checkout@v4" for s in job["steps"]):
+                options = _checkout_options(job)
+                assert options["fetch-depth"] == 0
+                assert options["fetch-tags"] is True
+
+
+def test_generate_workflows_shallow_checkout(tmp_path):
+    """Test that shallow mode only fetches history where it is needed."""
+    workflows = _generate(tmp_path, checkout_strategy="shallow")
+
+    # git describe still needs history, but not file contents
+    version = _checkout_options(workflows["release.yml"]["jobs"]["calculate-version"])
+    assert version["fetch-depth"] == 0
+    assert version["filter"] == "blob:none"
+
+    # Tagging HEAD only needs HEAD
+    publish = _checkout_options(workflows["release.yml"]["jobs"]["publish-to-pypi"])
+    assert publish == {"fetch-depth": 1}
+
+    # Build uses artifact_version, so history is only fetched without it
+    build = _checkout_options(
+        workflows["_reusable-test-build.yml"]["jobs"]["test-and-build"]
+    )
+    assert build["fetch-depth"] == "${{ inputs.artifact_version && 1 || 0 }}"
+    assert build["filter"] == "blob:none"
+
+
+@pytest.mark.parametrize(
+    ("version_lookup", "expected"),
+    [
+        ("sorted-tags", {"fetch-depth": 1, "fetch-tags": True, "filter": "blob:none"}),
+        ("ls-remote", {"fetch-depth": 1}),
+    ],
+)
+def test_generate_workflows_shallow_checkout_version_lookup(
+    tmp_path, version_lookup, expected
+):
+    """Test that ref-based tag lookups skip history in the version job."""
+    workflows = _generate(
+        tmp_path, checkout_strategy="shallow", version_lookup=version_lookup
+    )
+
+    assert (
+        _checkout_options(workflows["test-pr.yml"]["jobs"]["get-new-version"])
+        == expected
+    )
+    assert (
+        _checkout_options(workflows["release.yml"]["jobs"]["calculate-version"])
+        == expected
+    )
+
+
+def test_generate_workflows_invalid_checkout_strategy(tmp_path):
+    """Test that an unknown checkout strategy raises ValueError."""
+    with pytest.raises(ValueError, match="checkout_strategy"):
+        _generate(tmp_path, checkout_strategy="sparse")
+
+
+def _step(job, name):
+    """Return the step with the given name from a job."""
+    return next(s for s in job["steps"] if s.get("name") == name)
+
+
+def test_generate_workflows_no_cache_by_default(tmp_path):
+    """Test that no dependency cache is configured by default."""
+    workflows = _generate(tmp_path)
+    job = workflows["_reusable-test-build.yml"]["jobs"]["test-and-build"]
+
+    assert all(s.get("uses") != "actions/cache@v4" for s in job["steps"])
+    setup_python = next(
+        s for s in job["steps"] if s.get("uses", "").startswith("actions/setup-python")
+    )
+    assert "cache" not in setup_python["with"]
+
+
+def test_generate_workflows_pip_cache(tmp_path):
+    """Test that pip caching is keyed on the project's dependency files."""
+    workflows = _generate(tmp_path, cache_strategy="pip")
+    job = workflows["_reusable-test-build.yml"]["jobs"]["test-and-build"]
+
+    setup_python = next(
+        s for s in job["steps"] if s.get("uses", "").startswith("actions/setup-python")
+    )
+    assert setup_python["with"]["cache"] == "pip"
+    assert setup_python["with"]["cache-dependency-path"].split() == [
+        "pyproject.toml",
+        "setup.py",
+    ]
+
+
+def test_generate_workflows_wheelhouse_cache(tmp_path):
+    """Test that the wheelhouse is restored, built on a miss, and installed from."""
+    workflows = _generate(tmp_path, cache_strategy="wheelhouse")
+    job = workflows["_reusable-test-build.yml"]["jobs"]["test-and-build"]
+
+    restore = _step(job, "Restore wheelhouse cache")
+    assert restore["uses"] == "actions/cache@v4"
+    assert "hashFiles('pyproject.toml', 'setup.py')" in restore["with"]["key"]
+
+    build = _step(job, "Build wheelhouse")
+    assert build["if"] == "steps.wheelhouse-cache.outputs.cache-hit != 'true'"
+    assert "pip wheel" in build["run"]
+
+    install = _step(job, "Install dependencies")
+    assert '--find-links "$HOME/.cache/wheelhouse" .[test]' in install["run"]
+
+
+def test_generate_workflows_invalid_cache_strategy(tmp_path):
+    """Test that an unknown cache strategy raises ValueError."""
+    with pytest.raises(ValueError, match="cache_strategy"):
+        _generate(tmp_path, cache_strategy="s3")
+
+
+@pytest.mark.parametrize("installer", ["pip", "uv"])
+def test_generate_workflows_installer_keeps_pipeline(tmp_path, installer):
+    """Test that both installers render the same lint/test/build pipeline."""
+    _generate(tmp_path, installer=installer)
+    content = (
+        tmp_path / ".github" / "workflows" / "_reusable-test-build.yml"
+    ).read_text()
+
+    assert "Lint with Ruff" in content
+    assert "ruff check ." in content
+    assert "ruff format --check ." in content
+    assert "python -m pytest ${{ inputs.test_path }}" in content
+    assert "SETUPTOOLS_SCM_PRETEND_VERSION: ${{ inputs.artifact_version }}" in content
+
+
+def test_generate_workflows_uv_installer(tmp_path):
+    """Test that the uv installer uses uv for install and build with a cache."""
+    workflows = _generate(tmp_path, installer="uv")
+    job = workflows["_reusable-test-build.yml"]["jobs"]["test-and-build"]
+
+    setup_uv = _step(job, "Install uv")
+    assert setup_uv["uses"].startswith("astral-sh/setup-uv@")
+    assert setup_uv["with"]["enable-cache"] is True
+
+    assert (
+        _step(job, "Install dependencies")["run"] == "uv pip install --system .[test]"
+    )
+    assert _step(job, "Build package")["run"] == "uv build"
+    assert all(
+        "pip install" not in s.get("run", "").replace("uv pip", "")
+        for s in job["steps"]
+    )
+
+
+def test_generate_workflows_uv_rejects_pip_cache_strategy(tmp_path):
+    """Test that pip-specific cache strategies cannot be combined with uv."""
+    with pytest.raises(ValueError, match="only applies to the pip installer"):
+        _generate(tmp_path, installer="uv", cache_strategy="pip")
+
+
+def test_generate_workflows_single_job_without_matrix(tmp_path):
+    """Test that one test-and-build job is rendered by default."""
+    workflows = _generate(tmp_path)
+    reusable = workflows["_reusable-test-build.yml"]
+
+    assert list(reusable["jobs"]) == ["lint", "test-and-build"]
+    assert "python_versions" not in _triggers(reusable)["workflow_call"]["inputs"]
+
+
+def test_generate_workflows_test_matrix(tmp_path):
+    """Test that a version x OS matrix is tested and the package built once."""
+    workflows = _generate(
+        tmp_path,
+        python_version="3.12",
+        python_versions=["3.10", "3.11", "3.12"],
+        os_runners=["ubuntu-latest", "windows-latest"],
+    )
+    reusable = workflows["_reusable-test-build.yml"]
+    inputs = _triggers(reusable)["workflow_call"]["inputs"]
+    jobs = reusable["jobs"]
+
+    assert json.loads(inputs["python_versions"]["default"]) == ["3.10", "3.11", "3.12"]
+    assert json.loads(inputs["os_runners"]["default"]) == [
+        "ubuntu-latest",
+        "windows-latest",
+    ]
+
+    test_job = jobs["test"]
+    assert test_job["strategy"]["fail-fast"] is True
+    assert test_job["strategy"]["matrix"] == {
+        "python-version": "${{ fromJSON(inputs.python_versions) }}",
+        "os": "${{ fromJSON(inputs.os_runners) }}",
+    }
+    assert test_job["runs-on"] == "${{ matrix.os }}"
+    test_steps = [s["name"] for s in test_job["steps"]]
+    assert "Run tests with pytest" in test_steps
+    assert "Build package" not in test_steps
+
+    build_job = jobs["build"]
+    assert build_job["needs"] == ["test"]
+    build_steps = [s["name"] for s in build_job["steps"]]
+    assert "Build package" in build_steps
+    assert "Run tests with pytest" not in build_steps
+    uploads = [
+        s for s in build_job["steps"] if s.get("uses") == "actions/upload-artifact@v4"
+    ]
+    assert len(uploads) == 1
+
+    # Callers pass the matrix through
+    for caller in ("release.yml", "test-pr.yml"):
+        call = workflows[caller]["jobs"]["test-and-build"]["with"]
+        assert json.loads(call["python_versions"]) == ["3.10", "3.11", "3.12"]
+
+
+def test_generate_workflows_matrix_from_os_runners_only(tmp_path):
+    """Test that os_runners alone tests python_version on each runner."""
+    workflows = _generate(tmp_path, os_runners=["macos-latest"])
+    inputs = _triggers(workflows["_reusable-test-build.yml"])["workflow_call"]["inputs"]
+
+    assert json.loads(inputs["python_versions"]["default"]) == ["3.11"]
+    assert json.loads(inputs["os_runners"]["default"]) == ["macos-latest"]
+
+
+def test_generate_workflows_rejects_empty_matrix(tmp_path):
+    """Test that an empty version list raises ValueError."""
+    with pytest.raises(ValueError, match="python_versions"):
+        _generate(tmp_path, python_versions=[""])
+
+
+def test_generate_workflows_test_shards(tmp_path):
+    """Test that test_shards splits tests across a shard matrix with a fan-in."""
+    workflows = _generate(tmp_path, test_shards=3)
+    jobs = workflows["_reusable-test-build.yml"]["jobs"]
+
+    assert list(jobs) == ["lint", "test", "test-results", "build"]
+    test_job = jobs["test"]
+    assert test_job["strategy"]["matrix"] == {"shard": [0, 1, 2]}
+    assert test_job["runs-on"] == "ubuntu-latest"
+    run = _step(test_job, "Run tests with pytest")["run"]
+    assert "--shard-count 3" in run
+    assert "--junitxml=" in run
+    assert "-n auto" not in run
+    restore = _step(test_job, "Restore test durations")
+    assert restore["with"]["restore-keys"] == "test-durations-"
+
+    fan_in = jobs["test-results"]
+    assert fan_in["needs"] == ["test"]
+    assert fan_in["if"] == "always()"
+    assert "merge" in _step(fan_in, "Merge test results")["run"]
+    assert _step(fan_in, "Save test durations")["uses"] == "actions/cache/save@v4"
+
+    assert jobs["build"]["needs"] == ["test"]
+    assert (tmp_path / "scripts" / "test_shards.py").exists()
+
+
+def test_generate_workflows_test_shards_with_matrix(tmp_path):
+    """Test that shards are added as another dimension of the test matrix."""
+    workflows = _generate(tmp_path, test_shards=2, python_versions=["3.10", "3.12"])
+    matrix = workflows["_reusable-test-build.yml"]["jobs"]["test"]["strategy"]["matrix"]
+
+    assert set(matrix) == {"python-version", "os", "shard"}
+    assert matrix["shard"] == [0, 1]
+
+
+def test_generate_workflows_no_shard_script_by_default(tmp_path):
+    """Test that the shard helper is only generated when sharding."""
+    _generate(tmp_path)
+
+    assert not (tmp_path / "scripts" / "test_shards.py").exists()
+
+
+@pytest.mark.parametrize("test_shards", [1, 2])
+def test_generate_workflows_pytest_xdist(tmp_path, test_shards):
+    """Test that pytest_xdist installs pytest-xdist and runs with -n auto."""
+    workflows = _generate(tmp_path, pytest_xdist=True, test_shards=test_shards)
+    jobs = workflows["_reusable-test-build.yml"]["jobs"]
+    job = jobs["test"] if test_shards > 1 else jobs["test-and-build"]
+    run = _step(job, "Run tests with pytest")["run"]
+
+    assert "pip install pytest-xdist" in run
+    assert "python -m pytest -n auto" in run
+
+
+@pytest.mark.parametrize("test_shards", [0, -1, True, "2"])
+def test_generate_workflows_invalid_test_shards(tmp_path, test_shards):
+    """Test that a non-positive or non-integer shard count raises ValueError."""
+    with pytest.raises(ValueError, match="test_shards"):
+        _generate(tmp_path, test_shards=test_shards)
+
+
+def test_generate_workflows_parallel_lint_by_default(tmp_path):
+    """Test that Ruff runs in its own job that tests do not wait for."""
+    workflows = _generate(tmp_path)
+    jobs = workflows["_reusable-test-build.yml"]["jobs"]
+
+    assert list(jobs) == ["lint", "test-and-build"]
+    assert "needs" not in jobs["test-and-build"]
+    lint_steps = [s["name"] for s in jobs["lint"]["steps"]]
+    assert lint_steps[-1] == "Lint with Ruff"
+    cache = _step(jobs["lint"], "Restore Ruff cache")
+    assert cache["with"]["path"] == ".ruff_cache"
+    checkout = _step(jobs["lint"], "Checkout repository")
+    assert checkout["with"] == {"fetch-depth": 1, "fetch-tags": False}
+    assert "Lint with Ruff" not in [s["name"] for s in jobs["test-and-build"]["steps"]]
+
+
+def test_generate_workflows_parallel_lint_with_matrix(tmp_path):
+    """Test that the build job no longer lints when lint runs in parallel."""
+    workflows = _generate(tmp_path, python_versions=["3.10", "3.12"])
+    jobs = workflows["_reusable-test-build.yml"]["jobs"]
+
+    assert list(jobs) == ["lint", "test", "build"]
+    assert "Lint with Ruff" not in [s["name"] for s in jobs["build"]["steps"]]
+
+
+def test_generate_workflows_inline_lint(tmp_path):
+    """Test that lint='inline' keeps Ruff as a step before the tests."""
+    workflows = _generate(tmp_path, lint="inline")
+    jobs = workflows["_reusable-test-build.yml"]["jobs"]
+
+    assert list(jobs) == ["test-and-build"]
+    steps = [s["name"] for s in jobs["test-and-build"]["steps"]]
+    assert steps.index("Lint with Ruff") < steps.index("Run tests with pytest")
+
+
+def test_generate_workflows_lint_disabled(tmp_path):
+    """Test that lint='none' removes Ruff entirely."""
+    _generate(tmp_path, lint="none", cache_strategy="wheelhouse")
+    reusable = tmp_path / ".github" / "workflows" / "_reusable-test-build.yml"
+
+    assert "ruff" not in reusable.read_text()
+
+
+def test_generate_workflows_invalid_lint(tmp_path):
+    """Test that an unknown lint mode raises ValueError."""
+    with pytest.raises(ValueError, match="Invalid lint"):
+        _generate(tmp_path, lint="sometimes")
+
+
+def test_generate_workflows_concurrency_groups(tmp_path):
+    """Test that PR runs cancel superseded runs and releases are serialized."""
+    workflows = _generate(tmp_path)
+
+    pr = workflows["test-pr.yml"]["concurrency"]
+    assert pr["group"] == (
+        "${{ github.workflow }}-pr-${{ github.event.pull_request.number }}"
+    )
+    assert pr["cancel-in-progress"] is True
+
+    release = workflows["release.yml"]["concurrency"]
+    assert release["group"] == "${{ github.workflow }}-release"
+    assert release["cancel-in-progress"] is False
+
+
+def test_generate_workflows_without_concurrency(tmp_path):
+    """Test that concurrency=False omits the concurrency groups."""
+    workflows = _generate(tmp_path, concurrency=False)
+
+    for workflow in workflows.values():
+        assert "concurrency" not in workflow
+
+
+def test_generate_workflows_no_path_filter_by_default(tmp_path):
+    """Test that the PR workflow runs for every pull request by default."""
+    workflows = _generate(tmp_path)
+    pull_request = _triggers(workflows["test-pr.yml"])["pull_request"]
+
+    assert pull_request == {"branches": ["main"]}
+    assert "changes" not in workflows["test-pr.yml"]["jobs"]
+
+
+def test_generate_workflows_paths_filter_from_layout(tmp_path):
+    """Test that default package paths follow the initialize_project layout."""
+    (tmp_path / "my_pkg").mkdir()
+    (tmp_path / "my_pkg" / "__init__.py").write_text("")
+    (tmp_path / "docs").mkdir()
+
+    workflows = _generate(tmp_path, path_filter="paths", test_path="tests/")
+    pull_request = _triggers(workflows["test-pr.yml"])["pull_request"]
+
+    assert pull_request["paths"] == [
+        "my_pkg/**",
+        "tests/**",
+        "pyproject.toml",
+        "setup.py",
+        "MANIFEST.in",
+        "scripts/**",
+        ".github/workflows/**",
+    ]
+    assert "paths-ignore" not in pull_request
+
+
+def test_generate_workflows_paths_ignore_filter(tmp_path):
+    """Test the paths-ignore filter with default and custom patterns."""
+    workflows = _generate(tmp_path, path_filter="paths-ignore")
+    pull_request = _triggers(workflows["test-pr.yml"])["pull_request"]
+    assert pull_request["paths-ignore"] == [
+        "**.md",
+        "docs/**",
+        "LICENSE*",
+        ".gitignore",
+    ]
+
+    workflows = _generate(
+        tmp_path, path_filter="paths-ignore", ignored_paths=["examples/**"]
+    )
+    pull_request = _triggers(workflows["test-pr.yml"])["pull_request"]
+    assert pull_request["paths-ignore"] == ["examples/**"]
+
+
+def _detect_package_changes(tmp_path, workflow, changed_files):
+    """Run the change-detection script of a PR workflow on a file list."""
+    step = _step(workflow["jobs"]["changes"], "Detect package changes")
+    script = step["run"].split("<<'EOF'\n", 1)[1].rsplit("EOF", 1)[0]
+    (tmp_path / "changed-files.txt").write_text("\n".join(changed_files) + "\n")
+    output = tmp_path / "github_output"
+    output.write_text("")
+
+    subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=tmp_path,
+        env={
+            **os.environ,
+            "PACKAGE_PATHS": step["env"]["PACKAGE_PATHS"],
+            "GITHUB_OUTPUT": str(output),
+        },
+        check=True,
+        capture_output=True,
+    )
+    return output.read_text().strip()
+
+
+def test_generate_workflows_change_detection_job(tmp_path):
+    """Test that a changes job gates the PR pipeline on package changes."""
+    workflows = _generate(
+        tmp_path, path_filter="changes", package_paths=["src/**", "*.toml"]
+    )
+    pr = workflows["test-pr.yml"]
+    jobs = pr["jobs"]
+
+    assert _triggers(pr)["pull_request"] == {"branches": ["main"]}
+    assert next(iter(jobs)) == "changes"
+    assert jobs["get-new-version"]["needs"] == ["changes"]
+    assert jobs["get-new-version"]["if"] == "needs.changes.outputs.package == 'true'"
+
+    detect = functools.partial(_detect_package_changes, tmp_path, pr)
+    assert detect(["README.md", "docs/index.md"]) == "package=false"
+    assert detect(["docs/pyproject.toml"]) == "package=false"
+    assert detect(["README.md", "src/pkg/core.py"]) == "package=true"
+    assert detect(["pyproject.toml"]) == "package=true"
+
+
+def test_generate_workflows_invalid_path_filter(tmp_path):
+    """Test that an unknown path filter raises ValueError."""
+    with pytest.raises(ValueError, match="Invalid path_filter"):
+        _generate(tmp_path, path_filter="sometimes")
+
+
+def test_generate_workflows_test_result_cache(tmp_path):
+    """Test that tests are skipped when the same source tree already passed."""
+    (tmp_path / "my_pkg").mkdir()
+    (tmp_path / "my_pkg" / "__init__.py").write_text("")
+
+    workflows = _generate(tmp_path, test_result_cache=True)
+    reusable = workflows["_reusable-test-build.yml"]
+    job = reusable["jobs"]["test-and-build"]
+    steps = [s["name"] for s in job["steps"]]
+
+    # Hashed before installing so build metadata cannot change the hash
+    assert steps.index("Hash test inputs") < steps.index("Install dependencies")
+    hash_step = _step(job, "Hash test inputs")
+    assert "hashFiles('my_pkg/**', " in hash_step["run"]
+
+    # Markers are artifacts, which releases on main can find for PR runs
+    key = "tests-passed-${{ runner.os }}-py${{ inputs.python_version }}-"
+    key += "${{ steps.test-inputs.outputs.hash }}"
+    lookup = _step(job, "Check for a green run of this source tree")
+    assert lookup["if"] == "${{ !inputs.force_tests }}"
+    assert f"actions/artifacts?name={key}&" in lookup["run"]
+    assert "env.GITHUB_REPOSITORY_ID" in lookup["run"]
+    assert '.event == "pull_request"' in lookup["run"]
+    assert job["permissions"]["actions"] == "read"
+    skipped = "steps.tests-passed.outputs.passed != 'true'"
+    assert _step(job, "Run tests with pytest")["if"] == skipped
+    save = _step(job, "Save green marker")
+    assert save["if"] == skipped
+    assert save["uses"] == "actions/upload-artifact@v4"
+    assert save["with"]["name"] == key
+
+    # The package is still built when the tests are skipped
+    assert "if" not in _step(job, "Build package")
+
+    inputs = _triggers(reusable)["workflow_call"]["inputs"]
+    assert inputs["force_tests"]["default"] is False
+    release = workflows["release.yml"]
+    dispatch_inputs = _triggers(release)["workflow_dispatch"]["inputs"]
+    assert dispatch_inputs["force_tests"]["type"] == "boolean"
+    call = release["jobs"]["test-and-build"]
+    assert call["with"]["force_tests"] == "${{ inputs.force_tests }}"
+    assert call["permissions"]["actions"] == "read"
+    assert workflows["test-pr.yml"]["jobs"]["test-and-build"]["permissions"] == {
+        "actions": "read",
+        "contents": "read",
+    }
+
+
+def test_generate_workflows_test_result_cache_with_shards(tmp_path):
+    """Test that sharded runs only record a marker when every shard passed."""
+    workflows = _generate(tmp_path, test_result_cache=True, test_shards=2)
+    jobs = workflows["_reusable-test-build.yml"]["jobs"]
+
+    test_job = jobs["test"]
+    assert test_job["outputs"]["test_inputs"] == "${{ steps.test-inputs.outputs.hash }}"
+    lookup = _step(test_job, "Check for a green run of this source tree")
+    assert (
+        "name=tests-passed-all-${{ steps.test-inputs.outputs.hash }}&"
+        in (lookup["run"])
+    )
+    assert "Save green marker" not in [s["name"] for s in test_job["steps"]]
+
+    save = _step(jobs["test-results"], "Save green marker")
+    assert save["if"].startswith("needs.test.result == 'success'")
+    assert (
+        save["with"]["name"] == "tests-passed-all-${{ needs.test.outputs.test_inputs }}"
+    )
+
+
+def test_generate_workflows_no_test_result_cache_by_default(tmp_path):
+    """Test that tests always run unless test_result_cache is enabled."""
+    workflows = _generate(tmp_path)
+
+    inputs = _triggers(workflows["_reusable-test-build.yml"])["workflow_call"]["inputs"]
+    assert "force_tests" not in inputs
+    assert (
+        "force_tests"
+        not in _triggers(workflows["release.yml"])["workflow_dispatch"]["inputs"]
+    )
+
+
+def test_generate_workflows_reuse_artifacts(tmp_path):
+    """Test that releases promote a previous build of the same source tree."""
+    workflows = _generate(tmp_path, reuse_artifacts=True)
+
+    reusable = workflows["_reusable-test-build.yml"]["jobs"]
+    build = _step(reusable["test-and-build"], "Build package")
+    assert build["env"]["SOURCE_DATE_EPOCH"] == REPRODUCIBLE_EPOCH
+    upload = _step(reusable["test-and-build"], "Store the distribution packages")
+    assert upload["with"]["name"] == "dist-tree-${{ steps.source-tree.outputs.hash }}"
+    outputs = _triggers(workflows["_reusable-test-build.yml"])["workflow_call"][
+        "outputs"
+    ]
+    assert outputs["artifact_name"]["value"] == (
+        "${{ jobs.test-and-build.outputs.artifact_name }}"
+    )
+
+    jobs = workflows["release.yml"]["jobs"]
+    lookup = _step(jobs["find-artifact"], "Look up a build of this source tree")
+    assert "actions/artifacts?name=dist-tree-$tree&" in lookup["run"]
+    # Only reviewed code from this repository: no forks, no pull requests
+    assert ".head_repository.id == (env.GITHUB_REPOSITORY_ID" in lookup["run"]
+    assert '$path == ".github/workflows/test-pr.yml"' in lookup["run"]
+    assert '.event == "merge_group"' in lookup["run"]
+    assert ".head_branch == env.DEFAULT_BRANCH" in lookup["run"]
+    assert "pull_request" not in lookup["run"]
+    assert jobs["test-and-build"]["if"] == "needs.find-artifact.outputs.run_id == ''"
+    publish = jobs["publish-to-pypi"]
+    assert _step(publish, "Download all the dists")["with"]["name"] == (
+        "${{ needs.test-and-build.outputs.artifact_name }}"
+    )
+    assert publish["needs"] == ["calculate-version", "find-artifact", "test-and-build"]
+    assert "!cancelled()" in publish["if"]
+    assert publish["permissions"]["actions"] == "read"
+    download = _step(publish, "Download the previously built dists")
+    assert download["with"]["run-id"] == "${{ needs.find-artifact.outputs.run_id }}"
+    assert (
+        "promote_dist.py"
+        in _step(publish, "Promote the previous build to the release version")["run"]
+    )
+
+    assert (tmp_path / "scripts" / "promote_dist.py").exists()
+
+
+def test_generate_workflows_reuse_artifacts_with_matrix(tmp_path):
+    """Test that the shared build comes from the build job in split layouts."""
+    workflows = _generate(
+        tmp_path, reuse_artifacts=True, lint="inline", python_versions=["3.12"]
+    )
+    reusable = workflows["_reusable-test-build.yml"]
+
+    assert "artifact_name" in reusable["jobs"]["build"]["outputs"]
+    outputs = _triggers(reusable)["workflow_call"]["outputs"]
+    assert outputs["artifact_name"]["value"] == (
+        "${{ jobs.build.outputs.artifact_name }}"
+    )
+    download = _step(
+        workflows["test-pr.yml"]["jobs"]["publish-to-testpypi"],
+        "Download all the dists",
+    )
+    assert (
+        download["with"]["name"] == "${{ needs.test-and-build.outputs.artifact_name }}"
+    )
+
+
+def test_generate_workflows_rebuilds_releases_by_default(tmp_path):
+    """Test that releases always rebuild unless reuse_artifacts is enabled."""
+    workflows = _generate(tmp_path)
+
+    assert "find-artifact" not in workflows["release.yml"]["jobs"]
+    assert (
+        "outputs"
+        not in _triggers(workflows["_reusable-test-build.yml"])["workflow_call"]
+    )
+    assert not (tmp_path / "scripts" / "promote_dist.py").exists()
+
+
+def test_generate_workflows_compact_pipeline(tmp_path):
+    """Test that the version is calculated inside the build job."""
+    workflows = _generate(tmp_path, compact_pipeline=True)
+
+    pr_jobs = workflows["test-pr.yml"]["jobs"]
+    assert list(pr_jobs) == ["test-and-build", "publish-to-testpypi"]
+    assert "needs" not in pr_jobs["test-and-build"]
+    assert pr_jobs["test-and-build"]["with"]["version_type"] == "rc"
+    assert pr_jobs["publish-to-testpypi"]["needs"] == ["test-and-build"]
+
+    release_jobs = workflows["release.yml"]["jobs"]
+    assert list(release_jobs) == ["test-and-build", "publish-to-pypi"]
+    call = release_jobs["test-and-build"]["with"]
+    assert call["version_type"] == "release"
+    assert call["version_bump"] == "${{ github.event.inputs.release_type }}"
+    assert "artifact_version" not in call
+    publish = release_jobs["publish-to-pypi"]
+    assert publish["needs"] == ["test-and-build"]
+    assert (
+        "needs.test-and-build.outputs.new_version"
+        in _step(publish, "Create and push tag")["run"]
+    )
+
+    reusable = workflows["_reusable-test-build.yml"]
+    outputs = _triggers(reusable)["workflow_call"]["outputs"]
+    assert outputs["new_version"]["value"] == (
+        "${{ jobs.test-and-build.outputs.new_version }}"
+    )
+    job = reusable["jobs"]["test-and-build"]
+    assert "calc_version" in job["outputs"]["new_version"]
+    names = [s["name"] for s in job["steps"]]
+    assert names.index("Calculate version") < names.index("Run tests with pytest")
+    assert _step(job, "Check if tag already exists remotely")["if"] == (
+        "inputs.version_type == 'release'"
+    )
+    build = _step(job, "Build package")
+    assert (
+        "steps.calc_version.outputs.new_version"
+        in (build["env"]["SETUPTOOLS_SCM_PRETEND_VERSION"])
+    )
+
+
+def test_generate_workflows_compact_pipeline_with_matrix(tmp_path):
+    """Test compact mode with a separate build job and the changes filter."""
+    workflows = _generate(
+        tmp_path,
+        compact_pipeline=True,
+        python_versions=["3.11", "3.12"],
+        path_filter="changes",
+    )
+
+    reusable = workflows["_reusable-test-build.yml"]
+    outputs = _triggers(reusable)["workflow_call"]["outputs"]
+    assert outputs["new_version"]["value"] == "${{ jobs.build.outputs.new_version }}"
+    _step(reusable["jobs"]["build"], "Calculate version")
+    assert all(
+        s.get("name") != "Calculate version" for s in reusable["jobs"]["test"]["steps"]
+    )
+
+    call = workflows["test-pr.yml"]["jobs"]["test-and-build"]
+    assert call["needs"] == ["changes"]
+    assert call["if"] == "needs.changes.outputs.package == 'true'"
+
+
+def test_generate_workflows_compact_pipeline_rejects_reuse_artifacts(tmp_path):
+    """Test that a reused build cannot provide the version in compact mode."""
+    with pytest.raises(ValueError, match="compact_pipeline"):
+        _generate(tmp_path, compact_pipeline=True, reuse_artifacts=True)
+
+
+def _artifact_steps(workflow, action):
+    """Yield (job name, artifact name) for each step using an artifact action."""
+    actions = {f"actions/{action}-artifact@v4"}
+    if action == "upload":
+        actions.add("actions/upload-artifact/merge@v4")
+    for job_name, job in workflow["jobs"].items():
+        for step in job.get("steps", []):
+            if step.get("uses") in actions:
+                yield job_name, step["with"].get("name")
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"python_versions": ["3.11", "3.12"], "test_shards": 2},
+        {"reuse_artifacts": True},
+        {"reuse_artifacts": True, "python_versions": ["3.12"], "lint": "inline"},
+        {"compact_pipeline": True, "test_shards": 3},
+        {"build_backend": "cibuildwheel"},
+        {"build_backend": "cibuildwheel", "reuse_artifacts": True, "test_shards": 2},
+    ],
+)
+def test_generate_workflows_upload_each_artifact_once(tmp_path, options):
+    """Test that every artifact of a run is uploaded by exactly one step."""
+    workflows = _generate(tmp_path, **options)
+    reusable = workflows["_reusable-test-build.yml"]
+
+    for caller in ("test-pr.yml", "release.yml"):
+        # A caller run includes every job of the reusable workflow
+        run = [workflows[caller], reusable]
+        uploads = [u for w in run for u in _artifact_steps(w, "upload")]
+        names = [name for _, name in uploads]
+        assert len(names) == len(set(names)), names
+
+        # Jobs that run more than once must upload under per-instance names
+        for job_name, name in uploads:
+            if "strategy" in reusable["jobs"].get(job_name, {}):
+                assert "strategy.job-index" in name
+
+        # No job uploads an artifact it downloaded
+        downloads = {u for w in run for u in _artifact_steps(w, "download")}
+        assert not downloads & set(uploads)
+
+
+def test_generate_workflows_artifact_upload_options(tmp_path):
+    """Test compression level and retention of the distribution artifact."""
+    workflows = _generate(
+        tmp_path, artifact_compression_level=0, artifact_retention_days=5
+    )
+    job = workflows["_reusable-test-build.yml"]["jobs"]["test-and-build"]
+    upload = _step(job, "Store the distribution packages")
+
+    assert upload["with"]["compression-level"] == 0
+    assert upload["with"]["retention-days"] == 5  # noqa: PLR2004
+
+
+def test_generate_workflows_artifact_upload_defaults(tmp_path):
+    """Test that the upload action's own defaults apply unless overridden."""
+    workflows = _generate(tmp_path)
+    job = workflows["_reusable-test-build.yml"]["jobs"]["test-and-build"]
+    upload = _step(job, "Store the distribution packages")
+
+    assert "compression-level" not in upload["with"]
+    assert "retention-days" not in upload["with"]
+
+
+@pytest.mark.parametrize(
+    ("option", "value"),
+    [
+        ("artifact_compression_level", 10),
+        ("artifact_compression_level", -1),
+        ("artifact_compression_level", True),
+        ("artifact_retention_days", 0),
+        ("artifact_retention_days", 91),
+        ("artifact_retention_days", "7"),
+    ],
+)
+def test_generate_workflows_invalid_artifact_options(tmp_path, option, value):
+    """Test that out-of-range artifact options are rejected."""
+    with pytest.raises(ValueError, match=option):
+        _generate(tmp_path, **{option: value})
+
+
+def _dist_digest(tmp_path, workflow, version, module):
+    """Run the TestPyPI digest script on a wheel with the given contents."""
+    dist = tmp_path / "digest" / "dist"
+    dist.mkdir(parents=True, exist_ok=True)
+    for old in dist.iterdir():
+        old.unlink()
+    dist_info = f"my_pkg-{version}.dist-info"
+    with zipfile.ZipFile(dist / f"my_pkg-{version}-py3-none-any.whl", "w") as wheel:
+        wheel.writestr("my_pkg/__init__.py", module)
+        wheel.writestr(f"{dist_info}/METADATA", f"Name: my-pkg\nVersion: {version}\n")
+        wheel.writestr(
+            f"{dist_info}/RECORD", f"{dist_info}/METADATA,sha256={version},1\n"
+        )
+
+    step = _step(
+        workflow["jobs"]["publish-to-testpypi"], "Hash the distribution contents"
+    )
+    script = step["run"].split("<<'EOF'\n", 1)[1].rsplit("EOF", 1)[0]
+    output = tmp_path / "github_output"
+    output.write_text("")
+    subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=dist.parent,
+        env={**os.environ, "GITHUB_OUTPUT": str(output)},
+        check=True,
+        capture_output=True,
+    )
+    return output.read_text().strip()
+
+
+def test_generate_workflows_testpypi_skip_unchanged(tmp_path):
+    """Test that TestPyPI publishes are skipped for unchanged contents."""
+    workflows = _generate(tmp_path, testpypi_skip_unchanged=True)
+    pr = workflows["test-pr.yml"]
+    job = pr["jobs"]["publish-to-testpypi"]
+
+    # Only the PR's most recent publish is compared against
+    prefix = "testpypi-pr${{ github.event.pull_request.number }}-"
+    restore = _step(job, "Restore the last published contents")
+    assert restore["with"]["key"] == prefix + "${{ github.run_id }}"
+    assert restore["with"]["restore-keys"] == prefix
+    check = _step(job, "Check for a publish of the same contents")
+    assert '"$(cat .testpypi-published)" = "${{ steps.dist-digest' in check["run"]
+    publish = _step(job, "Publish to TestPyPI")
+    assert publish["if"] == "steps.published.outputs.unchanged != 'true'"
+    assert publish["with"]["skip-existing"] is True
+    save = _step(job, "Save published contents marker")
+    assert save["with"]["key"] == (
+        prefix + "${{ github.run_id }}-${{ github.run_attempt }}"
+    )
+
+    digest = functools.partial(_dist_digest, tmp_path, pr)
+    first = digest("1.0.1.dev1201", "VALUE = 1\n")
+    assert first.startswith("digest=")
+    assert digest("1.0.1.dev1202", "VALUE = 1\n") == first
+    assert digest("1.0.1.dev1203", "VALUE = 2\n") != first
+
+
+def test_generate_workflows_testpypi_publishes_every_run_by_default(tmp_path):
+    """Test that TestPyPI publishing is unconditional by default."""
+    workflows = _generate(tmp_path)
+    job = workflows["test-pr.yml"]["jobs"]["publish-to-testpypi"]
+    publish = _step(job, "Publish to TestPyPI")
+
+    assert "if" not in publish
+    assert "skip-existing" not in publish["with"]
+
+
+def test_generate_workflows_cibuildwheel(tmp_path):
+    """Test the parallel wheel matrix, sdist job and fan-in job."""
+    workflows = _generate(tmp_path, build_backend="cibuildwheel")
+    jobs = workflows["_reusable-test-build.yml"]["jobs"]
+
+    assert list(jobs) == [
+        "lint",
+        "test",
+        "build-wheels",
+        "build-sdist",
+        "collect-dists",
+    ]
+    assert "strategy" not in jobs["test"]
+
+    wheels = jobs["build-wheels"]
+    assert wheels["needs"] == ["test"]
+    assert wheels["runs-on"] == "${{ matrix.os }}"
+    assert wheels["strategy"]["matrix"]["os"] == [
+        "ubuntu-latest",
+        "ubuntu-24.04-arm",
+        "windows-latest",
+        "macos-13",
+        "macos-latest",
+    ]
+    build = _step(wheels, "Build wheels")
+    assert build["uses"].startswith("pypa/cibuildwheel@")
+    assert build["env"]["CIBW_CACHE_PATH"] == "${{ runner.temp }}/cibuildwheel-cache"
+    assert (
+        "SETUPTOOLS_SCM_PRETEND_VERSION" in build["env"]["CIBW_ENVIRONMENT_PASS_LINUX"]
+    )
+    cache = _step(wheels, "Restore cibuildwheel cache")
+    assert cache["with"]["path"] == build["env"]["CIBW_CACHE_PATH"]
+
+    sdist = jobs["build-sdist"]
+    assert _step(sdist, "Build package")["run"] == "python -m build --sdist"
+    assert ".[test]" not in _step(sdist, "Install dependencies")["run"]
+
+    collect = jobs["collect-dists"]
+    assert collect["needs"] == ["build-wheels", "build-sdist"]
+    merge = _step(collect, "Merge the distribution packages")
+    assert merge["uses"] == "actions/upload-artifact/merge@v4"
+    assert merge["with"]["name"] == "python-package-distributions"
+    assert merge["with"]["pattern"] == "cibw-*"
+    assert merge["with"]["delete-merged"] is True
+
+
+def test_generate_workflows_cibuildwheel_custom_runners(tmp_path):
+    """Test that wheel_runners replaces the default wheel matrix."""
+    workflows = _generate(
+        tmp_path,
+        build_backend="cibuildwheel",
+        wheel_runners=["ubuntu-latest", "macos-latest"],
+        installer="uv",
+    )
+    wheels = workflows["_reusable-test-build.yml"]["jobs"]["build-wheels"]
+
+    assert wheels["strategy"]["matrix"]["os"] == ["ubuntu-latest", "macos-latest"]
+    assert _step(wheels, "Build wheels")["env"]["CIBW_BUILD_FRONTEND"] == "build[uv]"
+
+
+@pytest.mark.parametrize(
+    ("options", "message"),
+    [
+        ({"build_backend": "maturin"}, "Invalid build_backend"),
+        ({"wheel_runners": ["ubuntu-latest"]}, "wheel_runners only applies"),
+        ({"build_backend": "cibuildwheel", "wheel_runners": [""]}, "wheel_runners"),
+        ({"build_backend": "cibuildwheel", "compact_pipeline": True}, "cibuildwheel"),
+    ],
+)
+def test_generate_workflows_invalid_build_backend_options(tmp_path, options, message):
+    """Test that unsupported build backend combinations are rejected."""
+    with pytest.raises(ValueError, match=message):
+        _generate(tmp_path, **options)
+
+
+def test_generate_workflows_merge_queue(tmp_path):
+    """Test that merge queue runs test without versioning or publishing."""
+    workflows = _generate(tmp_path, merge_queue=True)
+    pr = workflows["test-pr.yml"]
+    jobs = pr["jobs"]
+
+    assert "merge_group" in _triggers(pr)
+    assert "github.ref" in pr["concurrency"]["group"]
+    assert jobs["get-new-version"]["if"] == "github.event_name != 'merge_group'"
+    assert "github.event_name == 'merge_group'" in jobs["test-and-build"]["if"]
+    assert "!cancelled()" in jobs["test-and-build"]["if"]
+    assert jobs["publish-to-testpypi"]["if"] == "github.event_name != 'merge_group'"
+
+
+def test_generate_workflows_merge_queue_with_changes_filter(tmp_path):
+    """Test that queue runs always count as package changes."""
+    workflows = _generate(tmp_path, merge_queue=True, path_filter="changes")
+    jobs = workflows["test-pr.yml"]["jobs"]
+
+    detect = _step(jobs["changes"], "Detect package changes")["run"]
+    assert detect.index("merge_group") < detect.index("git diff")
+    assert jobs["get-new-version"]["if"] == (
+        "needs.changes.outputs.package == 'true' && github.event_name != 'merge_group'"
+    )
+
+
+def test_generate_workflows_merge_queue_compact_pipeline(tmp_path):
+    """Test that compact queue runs skip the version calculation."""
+    workflows = _generate(tmp_path, merge_queue=True, compact_pipeline=True)
+    call = workflows["test-pr.yml"]["jobs"]["test-and-build"]
+
+    assert call["with"]["version_type"] == (
+        "${{ github.event_name != 'merge_group' && 'rc' || '' }}"
+    )
+
+
+def test_generate_workflows_no_merge_queue_by_default(tmp_path):
+    """Test that the PR workflow only triggers on pull requests by default."""
+    workflows = _generate(tmp_path)
+
+    assert list(_triggers(workflows["test-pr.yml"])) == ["pull_request"]
+
+
+def _steps_jobs(workflows):
+    """Yield (filename, job id, job) for every job that runs steps."""
+    for name, workflow in workflows.items():
+        for job_id, job in workflow["jobs"].items():
+            if "steps" in job:
+                yield name, job_id, job
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {
+            "python_versions": ["3.11", "3.12"],
+            "test_shards": 2,
+            "path_filter": "changes",
+        },
+        {"build_backend": "cibuildwheel", "reuse_artifacts": True},
+    ],
+)
+def test_generate_workflows_step_timing(tmp_path, options):
+    """Test that every job records its step timings when enabled."""
+    workflows = _generate(tmp_path, step_timing=True, **options)
+
+    for _, _, job in _steps_jobs(workflows):
+        assert [s["name"] for s in job["steps"][-2:]] == [
+            "Record step timings",
+            "Upload step timings",
+        ]
+        assert job["permissions"]["actions"] == "read"
+        record = _step(job, "Record step timings")
+        assert record["if"] == "always()"
+        assert record["continue-on-error"] is True
+        upload = _step(job, "Upload step timings")["with"]
+        assert upload["name"].startswith("step-timings-${{ github.job }}-")
+
+    # Reusable workflow jobs only get the permissions their caller grants
+    for name in ("test-pr.yml", "release.yml"):
+        call = workflows[name]["jobs"]["test-and-build"]
+        assert call["permissions"] == {"actions": "read", "contents": "read"}
+
+
+def test_generate_workflows_no_step_timing_by_default(tmp_path):
+    """Test that workflows only record step timings when asked to."""
+    workflows = _generate(tmp_path)
+
+    for _, _, job in _steps_jobs(workflows):
+        assert "actions" not in job["permissions"]
+        assert not any("timings" in s.get("name", "") for s in job["steps"])
+    assert "permissions" not in workflows["test-pr.yml"]["jobs"]["test-and-build"]
+
+
+@pytest.mark.skipif(shutil.which("jq") is None, reason="jq is not installed")
+def test_step_timing_script(tmp_path):
+    """Test the recorded timings against a canned jobs API response."""
+    workflows = _generate(tmp_path, step_timing=True)
+    record = _step(
+        workflows["test-pr.yml"]["jobs"]["publish-to-testpypi"], "Record step timings"
+    )
+
+    def api_step(number, name, start, end, conclusion="success"):
+        return {
+            "number": number,
+            "name": name,
+            "conclusion": conclusion,
+            "started_at": f"2024-05-01T10:00:{start}Z",
+            "completed_at": end and f"2024-05-01T10:00:{end}Z",
+        }
+
+    def api_job(name, runner, status, steps):
+        return {"name": name, "runner_name": runner, "status": status, "steps": steps}
+
+    jobs = {
+        "jobs": [
+            api_job("get-new-version", "runner-1", "completed", []),
+            api_job(
+                "Publish to TestPyPI",
+                "runner-2",
+                "in_progress",
+                [
+                    api_step(1, "Set up job", "00", "02"),
+                    api_step(2, "Download all the dists", "02.250", "07.500"),
+                    api_step(3, "Skipped", "07", "07", "skipped"),
+                    api_step(4, "Record step timings", "07", None, None),
+                ],
+            ),
+        ]
+    }
+    (tmp_path / "jobs.json").write_text(json.dumps(jobs))
+
+    # Stand-in for gh: applies the --jq filter to the canned response
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    gh = bin_dir / "gh"
+    gh.write_text(
+        f"#!{sys.executable}\n"
+        "import subprocess, sys\n"
+        "jq = sys.argv[sys.argv.index('--jq') + 1]\n"
+        f"response = {str(tmp_path / 'jobs.json')!r}\n"
+        "subprocess.run(['jq', '-c', jq, response], check=True)\n"
+    )
+    gh.chmod(0o755)
+
+    runner_temp = tmp_path / "runner"
+    summary = tmp_path / "summary.md"
+    # Expressions are substituted by GitHub before the script runs
+    script = re.sub(r"\$\{\{.*?\}\}", "1", record["run"])
+    subprocess.run(
+        ["bash", "-e", "-c", script],
+        env={
+            **os.environ,
+            "PATH": f"{bin_dir}{os.pathsep}{os.environ['PATH']}",
+            "RUNNER_NAME": "runner-2",
+            "RUNNER_OS": "Linux",
+            "RUNNER_TEMP": str(runner_temp),
+            "GITHUB_WORKFLOW": "Test and Publish to TestPyPI",
+            "GITHUB_STEP_SUMMARY": str(summary),
+        },
+        check=True,
+        capture_output=True,
+    )
+
+    timings = json.loads((runner_temp / "step-timings" / "timings.json").read_text())
+    assert timings["workflow"] == "Test and Publish to TestPyPI"
+    assert timings["job"] == "Publish to TestPyPI"
+    assert [(s["name"], s["seconds"]) for s in timings["steps"]] == [
+        ("Set up job", 2),
+        ("Download all the dists", 5),
+    ]
+    assert "| 2 | Download all the dists | 5 | success |" in summary.read_text()
+
+
+def _make_packages(tmp_path, *package_dirs):
+    for package_dir in package_dirs:
+        (tmp_path / package_dir).mkdir(parents=True)
+        (tmp_path / package_dir / "pyproject.toml").write_text("[build-system]")
+
+
+def test_monorepo_generates_workflows_per_package(tmp_path):
+    _make_packages(tmp_path, "packages/core", "tools/cli")
+
+    workflows = _generate(tmp_path, monorepo=True)
+
+    assert sorted(workflows) == [
+        "_reusable-test-build.yml",
+        "release-cli.yml",
+        "release-core.yml",
+        "test-pr-cli.yml",
+        "test-pr-core.yml",
+    ]
+    test_pr = workflows["test-pr-core.yml"]
+    assert test_pr["name"] == "Test and Publish core to TestPyPI"
+    assert _triggers(test_pr)["pull_request"]["paths"] == [
+        "packages/core/**",
+        "scripts/**",
+        ".github/workflows/_reusable-test-build.yml",
+        ".github/workflows/*-core.yml",
+    ]
+    assert test_pr["jobs"]["test-and-build"]["with"]["package_dir"] == "packages/core"
+    calc = _step(test_pr["jobs"]["get-new-version"], "Calculate RC version")
+    assert '--tag-prefix "core-"' in calc["run"]
+
+
+def test_monorepo_release_uses_prefixed_tags(tmp_path):
+    _make_packages(tmp_path, "packages/core")
+
+    release = _generate(tmp_path, monorepo=True)["release-core.yml"]
+
+    assert release["name"] == "Release core to PyPI"
+    calculate = release["jobs"]["calculate-version"]
+    assert "new_tag" in calculate["outputs"]
+    assert (
+        '--tag-prefix "core-"' in _step(calculate, "Calculate release version")["run"]
+    )
+    assert (
+        "outputs.new_tag"
+        in _step(calculate, "Check if tag already exists remotely")["run"]
+    )
+    assert release["jobs"]["test-and-build"]["with"]["package_dir"] == "packages/core"
+    publish = release["jobs"]["publish-to-pypi"]
+    for name in ("Create and push tag", "Create GitHub Release"):
+        assert "needs.calculate-version.outputs.new_tag" in _step(publish, name)["run"]
+
+
+def test_monorepo_reusable_workflow_runs_in_package_dir(tmp_path):
+    _make_packages(tmp_path, "packages/core")
+
+    reusable = _generate(tmp_path, monorepo=True)["_reusable-test-build.yml"]
+
+    inputs = _triggers(reusable)["workflow_call"]["inputs"]
+    assert inputs["package_dir"]["default"] == "."
+    for job in reusable["jobs"].values():
+        assert (
+            job["defaults"]["run"]["working-directory"] == "${{ inputs.package_dir }}"
+        )
+    upload = _step(
+        reusable["jobs"]["test-and-build"], "Store the distribution packages"
+    )
+    assert upload["with"]["path"] == "${{ inputs.package_dir }}/dist/"
+
+
+def test_monorepo_discovers_packages(tmp_path):
+    _make_packages(tmp_path, "a", "group/b", "group/b/nested", ".venv/c", "build/d")
+
+    workflows = _generate(tmp_path, monorepo=True)
+
+    assert sorted(w for w in workflows if w.startswith("release-")) == [
+        "release-a.yml",
+        "release-b.yml",
+    ]
+
+
+def test_monorepo_path_filter_changes(tmp_path):
+    _make_packages(tmp_path, "packages/core")
+
+    test_pr = _generate(tmp_path, monorepo=True, path_filter="changes")[
+        "test-pr-core.yml"
+    ]
+
+    assert "paths" not in _triggers(test_pr)["pull_request"]
+    detect = _step(test_pr["jobs"]["changes"], "Detect package changes")
+    assert "packages/core/**" in detect["env"]["PACKAGE_PATHS"]
+
+
+def test_monorepo_without_packages_rejected(tmp_path):
+    with pytest.raises(FileNotFoundError, match="No packages found"):
+        _generate(tmp_path, monorepo=True)
+
+
+@pytest.mark.parametrize(
+    ("packages", "match"),
+    [
+        (["../other"], "below the repository root"),
+        (["."], "below the repository root"),
+        (["packages/core", "libs/core"], "unique"),
+        (["missing"], "No pyproject.toml"),
+    ],
+)
+def test_monorepo_invalid_packages_rejected(tmp_path, packages, match):
+    _make_packages(tmp_path, "packages/core", "libs/core")
+
+    with pytest.raises((ValueError, FileNotFoundError), match=match):
+        _generate(tmp_path, monorepo=True, packages=packages)
+
+
+@pytest.mark.parametrize(
+    "option",
+    [
+        {"test_shards": 2},
+        {"test_result_cache": True},
+        {"reuse_artifacts": True},
+        {"compact_pipeline": True},
+        {"build_backend": "cibuildwheel"},
+        {"package_paths": ["src/**"]},
+        {"path_filter": "paths-ignore"},
+    ],
+)
+def test_monorepo_rejects_single_package_options(tmp_path, option):
+    _make_packages(tmp_path, "packages/core")
+
+    with pytest.raises(ValueError, match="monorepo mode does not support"):
+        _generate(tmp_path, monorepo=True, **option)
+
+
+def test_packages_requires_monorepo(tmp_path):
+    with pytest.raises(ValueError, match="monorepo"):
+        _generate(tmp_path, packages=["packages/core"])
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"python_versions": ["3.11", "3.12"], "os_runners": ["ubuntu-latest"]},
+        {"path_filter": "changes", "merge_queue": True, "step_timing": True},
+        {"build_backend": "cibuildwheel", "concurrency": False},
+        {"compact_pipeline": True, "installer": "uv"},
+    ],
+)
+def test_model_renderer_matches_templates(tmp_path, options):
+    (tmp_path / "template").mkdir()
+    (tmp_path / "model").mkdir()
+    templates = _generate(tmp_path / "template", **options)
+    models = _generate(tmp_path / "model", renderer="model", **options)
+
+    assert models == templates
+    text = (tmp_path / "model" / ".github" / "workflows" / "test-pr.yml").read_text()
+    assert "\non:\n" in text
+    assert "#" not in text.split("run: |")[0]  # Template comments are dropped
+
+
+def test_model_renderer_applies_transforms(tmp_path):
+    def add_timeouts(_filename, workflow):
+        for job in workflow.jobs.values():
+            if "runs-on" in job.fields:
+                job.set("timeout-minutes", 30)
+
+    def add_audit_step(filename, workflow):
+        if filename == "test-pr.yml":
+            workflow.job("publish-to-testpypi").add_step(
+                Step("Audit", run="pip-audit"), before="Publish to TestPyPI"
+            )
+
+    workflows = _generate(
+        tmp_path,
+        renderer="model",
+        workflow_transforms=[add_timeouts, add_audit_step],
+    )
+
+    publish = workflows["test-pr.yml"]["jobs"]["publish-to-testpypi"]
+    assert publish["timeout-minutes"] == 30  # noqa: PLR2004
+    assert [s["name"] for s in publish["steps"]] == [
+        "Download all the dists",
+        "Audit",
+        "Publish to TestPyPI",
+    ]
+    assert "timeout-minutes" not in workflows["release.yml"]["jobs"]["test-and-build"]
+
+
+def test_workflow_transforms_require_model_renderer(tmp_path):
+    with pytest.raises(ValueError, match="renderer 'model'"):
+        _generate(tmp_path, workflow_transforms=[print])
+
+
+def test_invalid_renderer_rejected(tmp_path):
+    with pytest.raises(ValueError, match="renderer"):
+        _generate(tmp_path, renderer="jinja")
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"python_versions": ["3.11", "3.12"], "test_shards": 3, "step_timing": True},
+        {"path_filter": "changes", "merge_queue": True, "reuse_artifacts": True},
+        {"build_backend": "cibuildwheel", "renderer": "model"},
+        {"compact_pipeline": True, "test_result_cache": True},
+    ],
+)
+def test_validate_accepts_generated_workflows(tmp_path, options):
+    workflows = _generate(tmp_path, validate=True, **options)
+
+    assert "test-pr.yml" in workflows
+
+
+def test_validate_accepts_monorepo_workflows(tmp_path):
+    _make_packages(tmp_path, "packages/core", "packages/cli")
+
+    workflows = _generate(tmp_path, monorepo=True, validate=True)
+
+    assert "release-cli.yml" in workflows
+
+
+def test_validate_rejects_broken_context(tmp_path):
+    with pytest.raises(ValueError, match="invalid YAML"):
+        _generate(tmp_path, python_version="3.11'", validate=True)
+
+    assert not list((tmp_path / ".github" / "workflows").glob("*.yml"))
+
+
+def test_dry_run_writes_nothing(tmp_path):
+    (tmp_path / "pyproject.toml").write_text("[build-system]")
+    (tmp_path / "setup.py").write_text("from setuptools import setup\nsetup()")
+
+    original_cwd = Path.cwd()
+    os.chdir(tmp_path)
+    try:
+        result = generate_workflows(dry_run=True, validate=True)
+    finally:
+        os.chdir(original_cwd)
+
+    assert result["success"]
+    assert result["files_created"] == []
+    assert set(result["workflows"]) == {
+        "_reusable-test-build.yml",
+        "release.yml",
+        "test-pr.yml",
+    }
+    assert not (tmp_path / ".github").exists()
+    assert not (tmp_path / "scripts").exists()
+
+
+def test_validate_rejects_broken_transform(tmp_path):
+    def drop_version_job(filename, workflow):
+        if filename == "release.yml":
+            del workflow.jobs["calculate-version"]
+
+    with pytest.raises(ValueError, match="needs unknown job 'calculate-version'"):
+        _generate(
+            tmp_path,
+            renderer="model",
+            workflow_transforms=[drop_version_job],
+            validate=True,
+        )
@@ -0,0 +1,157 @@
+"""Tests for the asynchronous git command runner."""
+
+import asyncio
+import subprocess
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from hitoshura25_pypi_workflow_generator import git_runner
+from hitoshura25_pypi_workflow_generator.git_runner import (
+    run_git,
+    run_git_async,
+    set_max_concurrency,
+)
+
+# Concurrency limit used by the fork-storm test
+TEST_CONCURRENCY = 2
+# Number of commands started at once in the fork-storm test
+TEST_COMMAND_COUNT = 6
+
+
+@pytest.fixture(autouse=True)
+def _reset_concurrency():
+    yield
+    set_max_concurrency(git_runner.DEFAULT_MAX_CONCURRENCY)
+
+
+def test_run_git_captures_output_and_timing(tmp_path):
+    """Test that stdout, return code and duration are recorded."""
+    result = run_git(["--version"], cwd=str(tmp_path))
+
+    assert result.returncode == 0
+    assert result.stdout.startswith("git version")
+    assert result.args == ["git", "--version"]
+    assert result.duration > 0
+    assert result.timing()["command"] == "git --version"
+
+
+def test_run_git_check_raises(tmp_path):
+    """Test that check=True raises CalledProcessError like subprocess.run."""
+    with pytest.raises(subprocess.CalledProcessError) as exc_info:
+        run_git(["rev-parse", "--verify", "no-such-ref"], cwd=str(tmp_path), check=True)
+
+    assert exc_info.value.returncode != 0
+
+
+@patch("asyncio.create_subprocess_exec")
+def test_run_git_timeout_kills_process(mock_exec):
+    """Test that a command exceeding its timeout is killed."""
+
+    class HangingProcess:
+        returncode = None
+        killed = False
+
+        async def communicate(self):
+            await asyncio.sleep(60)
+
+        def kill(self):
+            self.killed = True
+            self.returncode = -9
+
+        async def wait(self):
+            return self.returncode
+
+    process = HangingProcess()
+
+    async def fake_exec(*_args, **_kwargs):
+        return process
+
+    mock_exec.side_effect = fake_exec
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_git(["fetch", "origin"], timeout=0.05)
+
+    assert process.killed
+
+
+@pytest.mark.asyncio
+async def test_run_git_sync_inside_event_loop(tmp_path):
+    """Test that the blocking wrapper works while an event loop is running."""
+    result = run_git(["--version"], cwd=str(tmp_path))
+
+    assert result.returncode == 0
+
+
+@pytest.mark.asyncio
+async def test_run_git_async_respects_concurrency_limit():
+    """Test that no more than the configured number of processes run at once."""
+    set_max_concurrency(TEST_CONCURRENCY)
+    running = 0
+    peak = 0
+
+    class FakeProcess:
+        returncode = 0
+
+        async def communicate(self):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return b"", b""
+
+    async def fake_exec(*_args, **_kwargs):
+        return FakeProcess()
+
+    with patch("asyncio.create_subprocess_exec", side_effect=fake_exec):
+        results = await asyncio.gather(
+            *(run_git_async(["status"]) for _ in range(TEST_COMMAND_COUNT))
+        )
+
+    assert len(results) == TEST_COMMAND_COUNT
+    assert peak == TEST_CONCURRENCY
+
+
+def test_set_max_concurrency_rejects_zero():
+    """Test that the concurrency limit must be positive."""
+    with pytest.raises(ValueError, match="at least 1"):
+        set_max_concurrency(0)
+
+
+def test_run_git_concurrency_limit_spans_threads():
+    """Test that the limit holds for sync callers in parallel threads."""
+    set_max_concurrency(TEST_CONCURRENCY)
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    class FakeProcess:
+        returncode = 0
+
+        async def communicate(self):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            # Block the thread's loop so other threads overlap with this one
+            time.sleep(0.05)
+            with lock:
+                running -= 1
+            return b"", b""
+
+    async def fake_exec(*_args, **_kwargs):
+        return FakeProcess()
+
+    with patch("asyncio.create_subprocess_exec", side_effect=fake_exec):
+        threads = [
+            threading.Thread(target=run_git, args=(["status"],))
+            for _ in range(TEST_COMMAND_COUNT)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert peak == TEST_CONCURRENCY
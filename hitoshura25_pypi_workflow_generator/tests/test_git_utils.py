@@ -50,7 +50,7 @@ def test_sanitize_prefix_uppercase():
     assert sanitize_prefix("John-Smith") == "john-smith"
 
 
-@patch("subprocess.run")
+@patch("hitoshura25_pypi_workflow_generator.git_utils.run_git")
 def test_get_git_username_github_user(mock_run):
     """Test getting username from github.user."""
     mock_run.return_value = MagicMock(returncode=0, stdout="jsmith\n")
@@ -60,7 +60,7 @@ def test_get_git_username_github_user(mock_run):
     assert "github.user" in str(mock_run.call_args)
 
 
-@patch("subprocess.run")
+@patch("hitoshura25_pypi_workflow_generator.git_utils.run_git")
 def test_get_git_username_from_remote_url_ssh(mock_run):
     """Test extracting username from SSH remote URL."""
 
@@ -81,7 +81,7 @@ def test_get_git_username_from_remote_url_ssh(mock_run):
     assert get_git_username() == "hitoshura25"
 
 
-@patch("subprocess.run")
+@patch("hitoshura25_pypi_workflow_generator.git_utils.run_git")
 def test_get_git_username_from_remote_url_https(mock_run):
     """Test extracting username from HTTPS remote URL."""
 
@@ -101,7 +101,7 @@ def test_get_git_username_from_remote_url_https(mock_run):
     assert get_git_username() == "jsmith"
 
 
-@patch("subprocess.run")
+@patch("hitoshura25_pypi_workflow_generator.git_utils.run_git")
 def test_get_git_username_fallback_to_user_name(mock_run):
     """Test fallback to user.name when github.user and remote not set."""
 
@@ -117,28 +117,28 @@ def test_get_git_username_fallback_to_user_name(mock_run):
     assert get_git_username() == "John Smith"
 
 
-@patch("subprocess.run")
+@patch("hitoshura25_pypi_workflow_generator.git_utils.run_git")
 def test_get_git_username_not_configured(mock_run):
     """Test when git is not configured."""
     mock_run.return_value = MagicMock(returncode=1, stdout="")
     assert get_git_username() is None
 
 
-@patch("subprocess.run")
+@patch("hitoshura25_pypi_workflow_generator.git_utils.run_git")
 def test_get_git_username_git_not_installed(mock_run):
     """Test when git is not installed."""
     mock_run.side_effect = FileNotFoundError()
     assert get_git_username() is None
 
 
-@patch("subprocess.run")
+@patch("hitoshura25_pypi_workflow_generator.git_utils.run_git")
 def test_get_default_prefix_success(mock_run):
     """Test successful prefix detection."""
     mock_run.return_value = MagicMock(returncode=0, stdout="jsmith\n")
     assert get_default_prefix() == "jsmith"
 
 
-@patch("subprocess.run")
+@patch("hitoshura25_pypi_workflow_generator.git_utils.run_git")
 def test_get_default_prefix_failure(mock_run):
     """Test failure when git not configured."""
     mock_run.return_value = MagicMock(returncode=1, stdout="")
@@ -147,14 +147,14 @@ def test_get_default_prefix_failure(mock_run):
         get_default_prefix()
 
 
-@patch("subprocess.run")
+@patch("hitoshura25_pypi_workflow_generator.git_utils.run_git")
 def test_get_default_prefix_with_sanitization(mock_run):
     """Test that get_default_prefix sanitizes the username."""
     mock_run.return_value = MagicMock(returncode=0, stdout="John Smith\n")
     assert get_default_prefix() == "john-smith"
 
 
-@patch("subprocess.run")
+@patch("hitoshura25_pypi_workflow_generator.git_utils.run_git")
 def test_get_default_prefix_empty_after_sanitization(mock_run):
     """Test error when username becomes empty after sanitization."""
     mock_run.return_value = MagicMock(
@@ -0,0 +1,168 @@
+"""Tests for the promote_dist.py helper script."""
+
+import csv
+import io
+import os
+import subprocess
+import sys
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from hitoshura25_pypi_workflow_generator.generator import generate_workflows
+
+OLD_VERSION = "1.2.4rc7"
+
+
+@pytest.fixture
+def script(tmp_path):
+    """Generate the promotion helper and return its path."""
+    (tmp_path / "pyproject.toml").write_text("[build-system]")
+    (tmp_path / "setup.py").write_text("# setup")
+
+    original_cwd = Path.cwd()
+    try:
+        os.chdir(tmp_path)
+        generate_workflows(reuse_artifacts=True)
+    finally:
+        os.chdir(original_cwd)
+
+    return tmp_path / "scripts" / "promote_dist.py"
+
+
+def _metadata(version):
+    return f"Metadata-Version: 2.1\nName: my-pkg\nVersion: {version}\n".encode()
+
+
+def _make_wheel(directory):
+    path = directory / f"my_pkg-{OLD_VERSION}-py3-none-any.whl"
+    dist_info = f"my_pkg-{OLD_VERSION}.dist-info"
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as wheel:
+        wheel.writestr("my_pkg/__init__.py", "VALUE = 1\n")
+        wheel.writestr(f"{dist_info}/METADATA", _metadata(OLD_VERSION))
+        wheel.writestr(f"{dist_info}/WHEEL", "Wheel-Version: 1.0\nTag: py3-none-any\n")
+        wheel.writestr(f"{dist_info}/RECORD", "stale\n")
+    return path
+
+
+def _make_sdist(directory):
+    path = directory / f"my_pkg-{OLD_VERSION}.tar.gz"
+    top = f"my_pkg-{OLD_VERSION}"
+    files = {
+        f"{top}/PKG-INFO": _metadata(OLD_VERSION),
+        f"{top}/my_pkg.egg-info/PKG-INFO": _metadata(OLD_VERSION),
+        f"{top}/my_pkg/__init__.py": b"VALUE = 1\n",
+    }
+    with tarfile.open(path, "w:gz") as sdist:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = 315532800
+            sdist.addfile(info, io.BytesIO(data))
+    return path
+
+
+def _promote(script, output, *dists, version="v1.2.4"):
+    return subprocess.run(
+        [sys.executable, str(script), "--version", version, "--output", str(output)]
+        + [str(d) for d in dists],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def test_promote_wheel(script, tmp_path):
+    """Test that a wheel is renamed and its metadata and RECORD rewritten."""
+    wheel = _make_wheel(tmp_path)
+
+    result = _promote(script, tmp_path / "dist", wheel)
+
+    assert result.returncode == 0, result.stderr
+    promoted = tmp_path / "dist" / "my_pkg-1.2.4-py3-none-any.whl"
+    with zipfile.ZipFile(promoted) as archive:
+        names = archive.namelist()
+        assert "my_pkg-1.2.4.dist-info/METADATA" in names
+        assert not any(OLD_VERSION in n for n in names)
+        metadata = archive.read("my_pkg-1.2.4.dist-info/METADATA").decode()
+        assert "Version: 1.2.4\n" in metadata
+        assert archive.read("my_pkg/__init__.py") == b"VALUE = 1\n"
+
+        record = list(
+            csv.reader(
+                io.StringIO(archive.read("my_pkg-1.2.4.dist-info/RECORD").decode())
+            )
+        )
+    recorded = {row[0]: row for row in record}
+    assert set(recorded) == set(names)
+    assert recorded["my_pkg-1.2.4.dist-info/RECORD"] == [
+        "my_pkg-1.2.4.dist-info/RECORD",
+        "",
+        "",
+    ]
+    assert recorded["my_pkg/__init__.py"][1].startswith("sha256=")
+
+
+def test_promote_sdist(script, tmp_path):
+    """Test that an sdist is renamed and every PKG-INFO rewritten."""
+    sdist = _make_sdist(tmp_path)
+
+    result = _promote(script, tmp_path / "dist", sdist)
+
+    assert result.returncode == 0, result.stderr
+    with tarfile.open(tmp_path / "dist" / "my_pkg-1.2.4.tar.gz") as archive:
+        names = archive.getnames()
+        assert all(n.startswith("my_pkg-1.2.4/") for n in names)
+        for name in ("my_pkg-1.2.4/PKG-INFO", "my_pkg-1.2.4/my_pkg.egg-info/PKG-INFO"):
+            assert b"Version: 1.2.4\n" in archive.extractfile(name).read()
+
+
+def test_promote_sdist_long_paths(script, tmp_path):
+    """Test that members named by PAX headers are moved to the new root too."""
+    top = f"my_pkg-{OLD_VERSION}"
+    long_name = f"{top}/my_pkg/{'nested/' * 15}module.py"
+    path = tmp_path / f"{top}.tar.gz"
+    with tarfile.open(path, "w:gz", format=tarfile.PAX_FORMAT) as sdist:
+        for name, data in (
+            (f"{top}/PKG-INFO", _metadata(OLD_VERSION)),
+            (long_name, b""),
+        ):
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            sdist.addfile(info, io.BytesIO(data))
+        link = tarfile.TarInfo(f"{top}/my_pkg/{'linked/' * 15}module.py")
+        link.type = tarfile.LNKTYPE
+        link.linkname = long_name
+        sdist.addfile(link)
+
+    result = _promote(script, tmp_path / "dist", path)
+
+    assert result.returncode == 0, result.stderr
+    with tarfile.open(tmp_path / "dist" / "my_pkg-1.2.4.tar.gz") as archive:
+        members = archive.getmembers()
+    assert len(long_name) > tarfile.LENGTH_NAME
+    assert all(m.name.startswith("my_pkg-1.2.4/") for m in members)
+    assert members[-1].linkname == long_name.replace(top, "my_pkg-1.2.4", 1)
+
+
+def test_promote_is_reproducible(script, tmp_path):
+    """Test that promoting the same inputs twice gives identical files."""
+    dists = [_make_wheel(tmp_path), _make_sdist(tmp_path)]
+
+    _promote(script, tmp_path / "first", *dists)
+    _promote(script, tmp_path / "second", *dists)
+
+    for first in (tmp_path / "first").iterdir():
+        assert first.read_bytes() == (tmp_path / "second" / first.name).read_bytes()
+
+
+def test_promote_rejects_non_release_version(script, tmp_path):
+    """Test that only plain release versions are accepted."""
+    result = _promote(
+        script, tmp_path / "dist", _make_wheel(tmp_path), version="1.2rc1"
+    )
+
+    assert result.returncode == 1
+    assert "not a release version" in result.stderr
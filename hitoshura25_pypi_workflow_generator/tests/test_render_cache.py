@@ -0,0 +1,134 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from hitoshura25_pypi_workflow_generator import generate_workflows
+from hitoshura25_pypi_workflow_generator.render_cache import (
+    DEFAULT_MAX_ENTRIES,
+    clear_render_cache,
+    render_cache_info,
+    render_template,
+    set_render_cache_size,
+)
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    clear_render_cache()
+    yield
+    set_render_cache_size(DEFAULT_MAX_ENTRIES)
+    clear_render_cache()
+
+
+@pytest.fixture
+def templates(tmp_path):
+    (tmp_path / "greeting.j2").write_text("Hello {{ name }}{% include 'mark.j2' %}")
+    (tmp_path / "mark.j2").write_text("!")
+    return tmp_path
+
+
+def _counts():
+    info = render_cache_info()
+    return info["hits"], info["misses"]
+
+
+def test_repeated_render_is_a_hit(templates):
+    first = render_template(templates, "greeting.j2", {"name": "a", "n": 1})
+    second = render_template(templates, "greeting.j2", {"n": 1, "name": "a"})
+
+    assert first == second == "Hello a!"
+    assert _counts() == (1, 1)
+
+
+def test_different_context_is_a_miss(templates):
+    render_template(templates, "greeting.j2", {"name": "a"})
+
+    assert render_template(templates, "greeting.j2", {"name": "b"}) == "Hello b!"
+    assert _counts() == (0, 2)
+
+
+def test_changed_template_set_is_a_miss(templates):
+    render_template(templates, "greeting.j2", {"name": "a"})
+    mark = templates / "mark.j2"
+    mark.write_text("?")
+    stat = mark.stat()
+    os.utime(mark, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert render_template(templates, "greeting.j2", {"name": "a"}) == "Hello a?"
+    assert _counts() == (0, 2)
+
+
+def test_least_recently_used_entry_is_evicted(templates):
+    set_render_cache_size(2)
+
+    for name in ["a", "b", "a", "c", "a", "b"]:
+        render_template(templates, "greeting.j2", {"name": name})
+
+    assert render_cache_info() == {
+        "hits": 2,
+        "misses": 4,
+        "evictions": 2,
+        "entries": 2,
+        "max_entries": 2,
+    }
+
+
+def test_size_zero_disables_cache(templates):
+    render_template(templates, "greeting.j2", {"name": "a"})
+    set_render_cache_size(0)
+
+    render_template(templates, "greeting.j2", {"name": "a"})
+
+    assert render_cache_info()["entries"] == 0
+    assert _counts() == (0, 1)
+
+
+def test_unserializable_context_is_not_cached(templates):
+    render_template(templates, "greeting.j2", {"name": Path("a")})
+
+    assert render_cache_info()["entries"] == 0
+
+
+@pytest.mark.parametrize("size", [-1, 1.5, True])
+def test_set_render_cache_size_invalid(size):
+    with pytest.raises(ValueError, match="max_entries"):
+        set_render_cache_size(size)
+
+
+def test_repeated_generation_hits_cache(tmp_path, monkeypatch):
+    (tmp_path / "pyproject.toml").write_text("[build-system]")
+    (tmp_path / "setup.py").write_text("from setuptools import setup\nsetup()")
+    monkeypatch.chdir(tmp_path)
+    first, second = tmp_path / "first", tmp_path / "second"
+
+    generate_workflows(base_output_dir=first)
+    hits, misses = _counts()
+    generate_workflows(base_output_dir=second)
+
+    assert hits == 0
+    assert _counts() == (misses, misses)
+    for path in (first / ".github").rglob("*"):
+        if path.is_file():
+            other = second / path.relative_to(first)
+            assert other.read_text() == path.read_text()
+
+
+def test_projects_with_identical_workflows_share_entries(tmp_path, monkeypatch):
+    """Projects differing only in unused options hit each other's entries."""
+    for name in ("alpha", "beta"):
+        project = tmp_path / name
+        (project / f"{name}_pkg").mkdir(parents=True)
+        (project / f"{name}_pkg" / "__init__.py").write_text("")
+        (project / "pyproject.toml").write_text("[build-system]")
+        (project / "setup.py").write_text("from setuptools import setup\nsetup()")
+
+    monkeypatch.chdir(tmp_path / "alpha")
+    first = generate_workflows(dry_run=True)["workflows"]
+    hits, misses = _counts()
+    monkeypatch.chdir(tmp_path / "beta")
+    second = generate_workflows(dry_run=True)["workflows"]
+
+    assert hits == 0
+    assert _counts() == (misses, misses)
+    assert second == first
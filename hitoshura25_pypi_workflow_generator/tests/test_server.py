@@ -10,7 +10,7 @@ import pytest
 from hitoshura25_pypi_workflow_generator.server import MCPServer, main
 
 # Expected number of tools in MCP server
-EXPECTED_TOOL_COUNT = 3
+EXPECTED_TOOL_COUNT = 4
 # MCP JSON-RPC error code for method not found
 MCP_METHOD_NOT_FOUND = -32601
 
@@ -28,6 +28,7 @@ async def test_list_tools():
     assert "generate_workflows" in tool_names
     assert "initialize_project" in tool_names
     assert "create_release" in tool_names
+    assert "create_releases" in tool_names
 
     # Verify each tool has required fields
     for tool in result["tools"]:
@@ -70,6 +71,11 @@ async def test_list_tools_schema_validation():
     assert "version" in release_tool["inputSchema"]["properties"]
     assert release_tool["inputSchema"]["required"] == ["version"]
 
+    # Check create_releases schema
+    releases_tool = next(t for t in result["tools"] if t["name"] == "create_releases")
+    assert releases_tool["inputSchema"]["properties"]["tags"]["type"] == "array"
+    assert releases_tool["inputSchema"]["required"] == ["tags"]
+
 
 @pytest.mark.asyncio
 async def test_call_tool_generate_workflows(tmp_path):
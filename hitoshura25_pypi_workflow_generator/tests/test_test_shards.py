@@ -0,0 +1,147 @@
+"""Tests for the test_shards.py helper script."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from hitoshura25_pypi_workflow_generator.generator import generate_workflows
+
+
+@pytest.fixture
+def script(tmp_path):
+    """Generate the shard helper and return its path."""
+    (tmp_path / "pyproject.toml").write_text("[build-system]")
+    (tmp_path / "setup.py").write_text("# setup")
+
+    original_cwd = Path.cwd()
+    try:
+        os.chdir(tmp_path)
+        generate_workflows(test_shards=2)
+    finally:
+        os.chdir(original_cwd)
+
+    return tmp_path / "scripts" / "test_shards.py"
+
+
+def _run(script, cwd, *args):
+    return subprocess.run(
+        [sys.executable, str(script), *args],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _select(script, cwd, index, count, *extra):
+    result = _run(
+        script,
+        cwd,
+        "select",
+        "--shard-index",
+        str(index),
+        "--shard-count",
+        str(count),
+        *extra,
+    )
+    return result.stdout.split()
+
+
+def _make_tests(root, names):
+    for name in names:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("def test_ok():\n    pass\n")
+
+
+def test_select_balances_by_file_count_without_durations(script, tmp_path):
+    """Test that files are split evenly when no durations are recorded."""
+    project = tmp_path / "project"
+    names = [f"tests/test_{i}.py" for i in range(5)]
+    _make_tests(project, [*names, "tests/helper.py", ".venv/test_skip.py"])
+
+    shards = [_select(script, project, i, 2, "tests") for i in range(2)]
+
+    assert sorted(shards[0] + shards[1]) == names
+    assert sorted(len(s) for s in shards) == [2, 3]
+
+
+def test_select_balances_by_recorded_durations(script, tmp_path):
+    """Test that a slow file gets a shard to itself."""
+    project = tmp_path / "project"
+    _make_tests(project, ["test_slow.py", "test_a.py", "test_b.py", "test_c.py"])
+    durations = project / "durations.json"
+    durations.write_text(
+        json.dumps(
+            {"test_slow.py": 30.0, "test_a.py": 5.0, "test_b.py": 5.0, "test_c.py": 5.0}
+        )
+    )
+
+    args = ("--durations", str(durations))
+    shards = [_select(script, project, i, 2, *args) for i in range(2)]
+
+    assert shards[0] == ["test_slow.py"]
+    assert shards[1] == ["test_a.py", "test_b.py", "test_c.py"]
+
+
+def test_select_missing_durations_file(script, tmp_path):
+    """Test that a missing durations file falls back to file counts."""
+    project = tmp_path / "project"
+    _make_tests(project, ["test_a.py", "test_b.py"])
+
+    args = ("--durations", "missing.json")
+    assert _select(script, project, 0, 2, *args) == ["test_a.py"]
+    assert _select(script, project, 1, 2, *args) == ["test_b.py"]
+
+
+def test_merge_combines_reports_and_records_durations(script, tmp_path):
+    """Test that shard reports are merged and durations summed per file."""
+    project = tmp_path / "project"
+    _make_tests(project, ["tests/test_a.py", "tests/test_b.py"])
+    # Report paths are relative to pytest's rootdir, the project root in CI
+    (project / "pytest.ini").write_text("[pytest]\n")
+    for index, name in enumerate(["tests/test_a.py", "tests/test_b.py"]):
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "pytest",
+                "-q",
+                "-p",
+                "no:cacheprovider",
+                "-o",
+                "junit_family=xunit1",
+                f"--junitxml=junit-{index}.xml",
+                name,
+            ],
+            cwd=project,
+            capture_output=True,
+            check=True,
+        )
+    durations = project / "durations.json"
+    durations.write_text(json.dumps({"tests/test_gone.py": 1.0}))
+
+    _run(
+        script,
+        project,
+        "merge",
+        "--output",
+        "junit.xml",
+        "--durations",
+        str(durations),
+        "junit-0.xml",
+        "junit-1.xml",
+    )
+
+    merged = (project / "junit.xml").read_text()
+    assert 'tests="2"' in merged
+    recorded = json.loads(durations.read_text())
+    assert set(recorded) == {
+        "tests/test_a.py",
+        "tests/test_b.py",
+        "tests/test_gone.py",
+    }
@@ -0,0 +1,114 @@
+import json
+import sys
+
+import pytest
+
+from hitoshura25_pypi_workflow_generator.timings import (
+    aggregate_step_timings,
+    load_step_timings,
+    main,
+    percentile,
+)
+
+
+def _record(job, seconds_by_step, workflow="Test and Publish to TestPyPI"):
+    return {
+        "workflow": workflow,
+        "job": job,
+        "steps": [
+            {"number": i, "name": name, "seconds": seconds}
+            for i, (name, seconds) in enumerate(seconds_by_step.items(), 1)
+        ],
+    }
+
+
+def _write_runs(directory, runs):
+    """Write one artifact directory per run, as `gh run download` does."""
+    for run, records in enumerate(runs):
+        artifact = directory / str(run) / "step-timings-test-0-1"
+        artifact.mkdir(parents=True)
+        (artifact / "timings.json").write_text(
+            "\n".join(json.dumps(r) for r in records)
+        )
+
+
+@pytest.mark.parametrize(
+    ("values", "pct", "expected"),
+    [([5], 90, 5), ([1, 2, 3, 4, 5], 50, 3), ([10, 0], 90, 9), ([1, 2], 100, 2)],
+)
+def test_percentile(values, pct, expected):
+    assert percentile(values, pct) == pytest.approx(expected)
+
+
+def test_aggregate_step_timings(tmp_path):
+    """Durations are grouped per job and step, slowest p90 first."""
+    _write_runs(
+        tmp_path,
+        [
+            [_record("Test", {"Run tests": 60, "Install": 20})],
+            [_record("Test", {"Run tests": 80, "Install": 30})],
+            [_record("Test", {"Run tests": 100, "Install": 25}), _record("Build", {})],
+        ],
+    )
+
+    result = aggregate_step_timings(str(tmp_path))
+
+    assert result["success"]
+    assert result["records"] == 4  # noqa: PLR2004
+    tests, install = result["steps"]
+    assert (tests["job"], tests["step"], tests["count"]) == ("Test", "Run tests", 3)
+    assert (tests["p50"], tests["p90"], tests["max"]) == (80, 96, 100)
+    assert install["step"] == "Install"
+    assert "Test > Run tests" in result["message"]
+
+
+def test_aggregate_step_timings_top(tmp_path):
+    _write_runs(tmp_path, [[_record("Test", {"a": 1, "b": 3, "c": 2})]])
+
+    steps = aggregate_step_timings(str(tmp_path), top=2)["steps"]
+
+    assert [s["step"] for s in steps] == ["b", "c"]
+
+
+def test_aggregate_step_timings_keeps_workflows_apart(tmp_path):
+    _write_runs(
+        tmp_path,
+        [[_record("build", {"Build": 10}), _record("build", {"Build": 20}, "Release")]],
+    )
+
+    steps = aggregate_step_timings(str(tmp_path))["steps"]
+
+    assert [(s["workflow"], s["count"]) for s in steps] == [
+        ("Release", 1),
+        ("Test and Publish to TestPyPI", 1),
+    ]
+
+
+@pytest.mark.parametrize("content", ["{", "[1, 2]", '{"job": "Test"}'])
+def test_load_step_timings_invalid(tmp_path, content):
+    (tmp_path / "timings.json").write_text(content)
+
+    with pytest.raises(ValueError, match="Timing file"):
+        load_step_timings(str(tmp_path))
+
+
+def test_load_step_timings_missing_directory(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_step_timings(str(tmp_path / "missing"))
+
+
+def test_main_json(tmp_path, monkeypatch, capsys):
+    _write_runs(tmp_path, [[_record("Test", {"Run tests": 60})]])
+    monkeypatch.setattr(sys, "argv", ["timings", str(tmp_path), "--json"])
+
+    assert main() == 0
+
+    steps = json.loads(capsys.readouterr().out)
+    assert [s["step"] for s in steps] == ["Run tests"]
+
+
+def test_main_missing_directory(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["timings", str(tmp_path / "missing")])
+
+    assert main() == 1
+    assert "not found" in capsys.readouterr().err
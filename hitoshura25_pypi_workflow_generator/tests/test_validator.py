@@ -0,0 +1,158 @@
+import pytest
+
+from hitoshura25_pypi_workflow_generator import validator
+from hitoshura25_pypi_workflow_generator.validator import (
+    clear_validation_cache,
+    validate_workflows,
+)
+
+REUSABLE = """\
+on:
+  workflow_call:
+    inputs:
+      python_version:
+        required: true
+        type: string
+      test_path:
+        required: true
+        type: string
+        default: '.'
+jobs:
+  test:
+    runs-on: ubuntu-latest
+    steps:
+      - run: pytest
+"""
+
+CALLER = """\
+on: pull_request
+jobs:
+  version:
+    runs-on: ubuntu-latest
+    outputs:
+      version: ${{ steps.calc.outputs.version }}
+    steps:
+      - id: calc
+        run: echo "version=1.0" >> "$GITHUB_OUTPUT"
+  test:
+    needs: version
+    uses: ./.github/workflows/_reusable.yml
+    with:
+      python_version: ${{ needs.version.outputs.version }}
+"""
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    clear_validation_cache()
+
+
+def _problems(caller, reusable=REUSABLE):
+    result = validate_workflows({"ci.yml": caller, "_reusable.yml": reusable})
+    return result["problems"]
+
+
+def test_valid_workflows():
+    result = validate_workflows({"ci.yml": CALLER, "_reusable.yml": REUSABLE})
+
+    assert result["success"]
+    assert result["problems"] == []
+    assert result["message"] == "Validated 2 workflows"
+
+
+@pytest.mark.parametrize(
+    ("old", "new", "problem"),
+    [
+        ("    needs: version\n", "    needs: [version, lint]\n", "unknown job 'lint'"),
+        ("    needs: version\n", "", "reads needs.version but does not need"),
+        ("on: pull_request\n", "", "has no triggers"),
+        ("      - id: calc\n", "      - id: calc\n        uses: a/b@v1\n", "step 1"),
+        ("    runs-on: ubuntu-latest\n", "", "job 'version' has no runs-on"),
+        ("    with:\n", "    runs-on: x\n    with:\n", "cannot have 'runs-on'"),
+        ("${{ steps.calc.outputs.version }}", "${{ steps.calc", "unclosed"),
+        (
+            "      python_version:",
+            "      python: '3.11'\n      python_version:",
+            "undeclared input 'python'",
+        ),
+        (
+            "      python_version: ${{ needs.version.outputs.version }}\n",
+            "      test_path: .\n",
+            "required input 'python_version'",
+        ),
+        ("_reusable.yml", "missing.yml", "calls missing workflow"),
+        (
+            "  version:\n    runs-on",
+            "  version:\n    needs: test\n    runs-on",
+            "needs itself",
+        ),
+    ],
+)
+def test_invalid_workflows(old, new, problem):
+    assert old in CALLER
+    problems = _problems(CALLER.replace(old, new))
+
+    assert any(p.startswith("ci.yml: ") and problem in p for p in problems), problems
+
+
+def test_invalid_yaml():
+    problems = _problems("on: push\njobs:\n  a: [\n")
+
+    assert problems[0].startswith("ci.yml: invalid YAML")
+
+
+def test_call_of_workflow_without_workflow_call():
+    problems = _problems(CALLER, REUSABLE.replace("workflow_call", "push"))
+
+    assert problems == [
+        (
+            "ci.yml: job 'test' calls ./.github/workflows/_reusable.yml, "
+            "which has no workflow_call trigger"
+        )
+    ]
+
+
+def test_called_workflow_read_from_directory(tmp_path):
+    (tmp_path / "_reusable.yml").write_text(REUSABLE)
+
+    result = validate_workflows({"ci.yml": CALLER}, str(tmp_path))
+
+    assert result["success"]
+
+
+def test_validate_directory(tmp_path):
+    (tmp_path / "ci.yml").write_text(CALLER.replace("version\n", "lint\n", 1))
+    (tmp_path / "_reusable.yml").write_text(REUSABLE)
+
+    result = validate_workflows(workflows_dir=str(tmp_path))
+
+    assert not result["success"]
+    assert "Found 2 problems" in result["message"]
+
+
+def test_validate_missing_directory(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        validate_workflows(workflows_dir=str(tmp_path / "missing"))
+
+
+def test_results_memoized_by_digest(monkeypatch):
+    parsed = []
+    load_yaml = validator.load_yaml
+    monkeypatch.setattr(
+        validator, "load_yaml", lambda text: parsed.append(text) or load_yaml(text)
+    )
+
+    for _ in range(3):
+        validate_workflows({"ci.yml": CALLER, "_reusable.yml": REUSABLE})
+        validate_workflows({"other.yml": CALLER, "_reusable.yml": REUSABLE})
+
+    assert sorted(parsed) == sorted([CALLER, REUSABLE])
+
+
+def test_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(validator, "MAX_CACHED_RESULTS", 2)
+
+    for n in range(5):
+        validate_workflows({"ci.yml": CALLER.replace("1.0", f"1.{n}")})
+
+    assert len(validator._results) == 2  # noqa: PLR2004
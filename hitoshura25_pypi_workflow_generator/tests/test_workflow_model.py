@@ -0,0 +1,186 @@
+import pytest
+import yaml
+
+from hitoshura25_pypi_workflow_generator import workflow_model
+from hitoshura25_pypi_workflow_generator.workflow_model import (
+    HAS_LIBYAML,
+    Job,
+    Step,
+    Workflow,
+    dump_yaml,
+    load_yaml,
+)
+
+WORKFLOW = """\
+name: CI
+on:
+  pull_request:
+    branches: [ main ]
+jobs:
+  test:
+    runs-on: ubuntu-latest
+    steps:
+      - name: Checkout repository
+        uses: actions/checkout@v4
+      - name: Run tests
+        run: |
+          pip install .
+          pytest
+  publish:
+    needs: test
+    runs-on: ubuntu-latest
+    steps:
+      - run: echo publish
+"""
+
+
+def test_load_yaml_keeps_on_as_a_key():
+    data = load_yaml("on: push\nflag: yes\nenabled: true\n")
+
+    assert data == {"on": "push", "flag": "yes", "enabled": True}
+
+
+def test_dump_yaml_writes_on_unquoted_and_scripts_as_blocks():
+    text = dump_yaml({"on": {"push": None}, "run": "pip install .\npytest\n"})
+
+    assert text.startswith("on:\n")
+    assert "run: |\n  pip install .\n  pytest\n" in text
+    assert load_yaml(text) == {"on": {"push": None}, "run": "pip install .\npytest\n"}
+
+
+def test_dump_yaml_quotes_strings_that_look_like_numbers():
+    assert load_yaml(dump_yaml({"python": "3.10"})) == {"python": "3.10"}
+
+
+@pytest.mark.skipif(not HAS_LIBYAML, reason="PyYAML built without LibYAML")
+def test_libyaml_is_used():
+    assert issubclass(workflow_model._Loader, yaml.CSafeLoader)
+    assert issubclass(workflow_model._Dumper, yaml.CSafeDumper)
+
+
+def test_round_trip_keeps_structure_and_key_order():
+    workflow = Workflow.from_yaml(WORKFLOW)
+
+    assert workflow.name == "CI"
+    assert workflow.triggers == {"pull_request": {"branches": ["main"]}}
+    assert list(workflow.jobs) == ["test", "publish"]
+    assert workflow.job("publish").needs == ["test"]
+    assert load_yaml(workflow.to_yaml()) == load_yaml(WORKFLOW)
+
+
+def test_from_dict_accepts_yaml_1_1_on_key():
+    workflow = Workflow.from_dict(yaml.safe_load(WORKFLOW))
+
+    assert list(workflow.to_dict())[:2] == ["name", "on"]
+
+
+@pytest.mark.parametrize("data", [[], {"name": "CI"}, {"jobs": {"a": []}}])
+def test_from_dict_invalid(data):
+    with pytest.raises(ValueError, match="must"):
+        Workflow.from_dict(data)
+
+
+def test_add_step_before_and_after():
+    job = Workflow.from_yaml(WORKFLOW).job("test")
+
+    job.add_step(Step("Lint", run="ruff check ."), after="Checkout repository")
+    job.add_step(Step("Setup", uses="actions/setup-python@v5"), before="Lint")
+    job.add_step(Step("Report", if_="always()", run="echo done"))
+
+    assert [s.name for s in job.steps] == [
+        "Checkout repository",
+        "Setup",
+        "Lint",
+        "Run tests",
+        "Report",
+    ]
+    assert job.to_dict()["steps"][-1] == {
+        "name": "Report",
+        "if": "always()",
+        "run": "echo done",
+    }
+    with pytest.raises(KeyError):
+        job.add_step(Step("Other"), after="Missing")
+
+
+def test_new_keys_are_placed_in_workflow_order():
+    workflow = Workflow.from_yaml(WORKFLOW)
+    job = workflow.job("test")
+
+    workflow.set_concurrency("${{ github.ref }}")
+    job.set("timeout-minutes", 30).needs = ["setup"]
+    job.set_matrix(python=["3.11", "3.12"], fail_fast=False)
+
+    assert list(workflow.to_dict()) == ["name", "on", "concurrency", "jobs"]
+    assert list(job.to_dict()) == [
+        "needs",
+        "runs-on",
+        "timeout-minutes",
+        "strategy",
+        "steps",
+    ]
+    assert job.fields["strategy"] == {
+        "fail-fast": False,
+        "matrix": {"python": ["3.11", "3.12"]},
+    }
+
+
+def test_set_matrix_merges_axes():
+    job = Job("ubuntu-latest", strategy={"matrix": {"os": ["ubuntu-latest"]}})
+
+    job.set_matrix(python=["3.12"])
+
+    assert job.fields["strategy"]["matrix"] == {
+        "os": ["ubuntu-latest"],
+        "python": ["3.12"],
+    }
+
+
+def test_build_workflow_in_python():
+    workflow = Workflow("Nightly", on={"schedule": [{"cron": "0 3 * * *"}]})
+    workflow.add_job(
+        "test",
+        Job(
+            "ubuntu-latest",
+            timeout_minutes=20,
+            steps=[
+                Step("Checkout", uses="actions/checkout@v4", with_={"fetch-depth": 1}),
+                Step("Test", run="pytest", continue_on_error=True),
+            ],
+        ),
+    )
+    workflow.add_job("report", Job("ubuntu-latest", needs=["test"]))
+
+    assert load_yaml(workflow.to_yaml()) == {
+        "name": "Nightly",
+        "on": {"schedule": [{"cron": "0 3 * * *"}]},
+        "jobs": {
+            "test": {
+                "runs-on": "ubuntu-latest",
+                "timeout-minutes": 20,
+                "steps": [
+                    {
+                        "name": "Checkout",
+                        "uses": "actions/checkout@v4",
+                        "with": {"fetch-depth": 1},
+                    },
+                    {"name": "Test", "continue-on-error": True, "run": "pytest"},
+                ],
+            },
+            "report": {"needs": ["test"], "runs-on": "ubuntu-latest"},
+        },
+    }
+
+
+@pytest.mark.parametrize(
+    ("job_id", "job", "match"),
+    [
+        ("test", Job("ubuntu-latest"), "already has"),
+        ("deploy", Job("ubuntu-latest", needs=["build"]), "unknown jobs: build"),
+    ],
+)
+def test_add_job_invalid(job_id, job, match):
+    workflow = Workflow.from_yaml(WORKFLOW)
+
+    with pytest.raises(ValueError, match=match):
+        workflow.add_job(job_id, job)
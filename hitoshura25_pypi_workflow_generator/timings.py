@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+CLI for aggregating step timings recorded by generated workflows.
+
+Workflows generated with step timing upload a `step-timings-*` artifact per
+job. Download them for a few runs, e.g.
+
+    gh run download RUN_ID --pattern 'step-timings-*' --dir timings/RUN_ID
+
+and aggregate the directory to find the slowest steps across runs.
+"""
+
+import argparse
+import json
+import math
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Percentiles reported per step
+PERCENTILES = (50, 90, 95)
+
+
+def load_step_timings(directory: str) -> List[Dict[str, Any]]:
+    """
+    Read every job timing record in a directory tree.
+
+    Each `*.json` file holds one or more concatenated job records, as
+    written by the "Record step timings" step.
+
+    Raises:
+        FileNotFoundError: If the directory does not exist
+        ValueError: If a file is not a sequence of JSON objects
+    """
+    root = Path(directory)
+    if not root.is_dir():
+        msg = f"Timing directory not found: {root}"
+        raise FileNotFoundError(msg)
+
+    decoder = json.JSONDecoder()
+    records = []
+    for path in sorted(root.rglob("*.json")):
+        text = path.read_text()
+        position = 0
+        while text[position:].strip():
+            position += len(text[position:]) - len(text[position:].lstrip())
+            try:
+                record, position = decoder.raw_decode(text, position)
+            except json.JSONDecodeError as e:
+                msg = f"Timing file {path} is not valid JSON: {e}"
+                raise ValueError(msg) from e
+            if not isinstance(record, dict) or "steps" not in record:
+                msg = f"Timing file {path} does not contain job timing records"
+                raise ValueError(msg)
+            records.append(record)
+    return records
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the pct-th percentile of values, interpolating between ranks."""
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def aggregate_step_timings(directory: str, top: int = 0) -> Dict[str, Any]:
+    """
+    Aggregate recorded step timings into per-step percentiles.
+
+    Steps are grouped by workflow, job and step name; matrix jobs keep
+    their own rows since their names include the matrix values.
+
+    Args:
+        directory: Directory tree of downloaded `step-timings-*` artifacts
+        top: Only report the N slowest steps (default: 0, all)
+
+    Returns:
+        Dict with:
+            - success (bool): Whether the aggregation succeeded
+            - records (int): Number of job records read
+            - steps (list): One dict per step (workflow, job, step, count,
+              p50, p90, p95, max, total), slowest p90 first
+            - message (str): Human-readable report
+
+    Raises:
+        FileNotFoundError: If the directory does not exist
+        ValueError: If a timing file is invalid
+    """
+    records = load_step_timings(directory)
+
+    durations: Dict[tuple, List[float]] = {}
+    for record in records:
+        for step in record["steps"]:
+            key = (record.get("workflow", ""), record.get("job", ""), step["name"])
+            durations.setdefault(key, []).append(float(step["seconds"]))
+
+    steps = [
+        {
+            "workflow": workflow,
+            "job": job,
+            "step": name,
+            "count": len(values),
+            **{f"p{pct}": round(percentile(values, pct), 1) for pct in PERCENTILES},
+            "max": max(values),
+            "total": sum(values),
+        }
+        for (workflow, job, name), values in durations.items()
+    ]
+    steps.sort(key=lambda s: (-s["p90"], -s["total"]))
+    if top > 0:
+        steps = steps[:top]
+
+    return {
+        "success": True,
+        "records": len(records),
+        "steps": steps,
+        "message": _format_report(steps, len(records)),
+    }
+
+
+def _format_report(steps: List[Dict[str, Any]], records: int) -> str:
+    if not steps:
+        return f"No step timings found ({records} job records)"
+    names = [f"{s['job']} > {s['step']}" for s in steps]
+    width = max(len(n) for n in names)
+    header = "".join(f"{f'p{pct}':>8}" for pct in PERCENTILES)
+    lines = [
+        f"Step timings from {records} job records (seconds, slowest p90 first)",
+        "",
+        f"{'Step':<{width}}  {'runs':>5}{header}{'max':>8}",
+    ]
+    for name, step in zip(names, steps):
+        values = "".join(f"{step[f'p{pct}']:>8.1f}" for pct in PERCENTILES)
+        lines.append(f"{name:<{width}}  {step['count']:>5}{values}{step['max']:>8.1f}")
+    return "\n".join(lines)
+
+
+def main():
+    """Main entry point for step timing aggregation."""
+    parser = argparse.ArgumentParser(
+        description=(
+            "Aggregate step timings recorded by workflows generated with "
+            "--step-timing into per-step percentiles."
+        ),
+        epilog="""
+Examples:
+  # Download the timing artifacts of a few runs
+  gh run download 123456 --pattern 'step-timings-*' --dir timings/123456
+
+  # Report the 20 slowest steps
+  %(prog)s timings/ --top 20
+        """,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "directory", help="Directory of downloaded step-timings-* artifacts"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Only report the N slowest steps (default: all)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    try:
+        result = aggregate_step_timings(args.directory, top=args.top)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(result["steps"], indent=2))
+    else:
+        print(result["message"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+"""
+Structural validation of rendered workflows.
+
+Catches workflows that would only fail once pushed to GitHub, e.g. a
+context value that breaks the YAML, or a transform that drops a job
+another job needs. Each workflow is parsed (with PyYAML's C loader when
+available) and checked on its own:
+
+- It is a mapping with `on:` and at least one job
+- Each job either runs steps on a runner or calls a reusable workflow,
+  and each step either uses an action or runs a script
+- Every job in `needs` exists, `needs` has no cycles, and expressions
+  only read `needs.<job>` of jobs the job needs
+- Every `${{` expression is closed
+
+Then calls of local reusable workflows (`uses: ./.github/workflows/...`)
+are checked against the called workflow: it must exist and be callable,
+every input passed must be declared, and every required input without
+a default must be passed.
+
+Per-workflow results are memoized by the SHA-256 digest of the file's
+contents, so validating the same output again (repeated or batch
+generation) does not parse it again.
+"""
+
+import hashlib
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import yaml
+
+from hitoshura25_pypi_workflow_generator.workflow_model import load_yaml
+
+# Number of per-workflow results kept; the oldest are dropped first
+MAX_CACHED_RESULTS = 512
+
+_LOCAL_WORKFLOW_PREFIX = "./.github/workflows/"
+_EXPRESSION = re.compile(r"\$\{\{(.*?)\}\}", re.DOTALL)
+_NEEDS_REFERENCE = re.compile(r"\bneeds\.([A-Za-z_][\w-]*)")
+
+# Per-workflow results by content digest
+_results: Dict[str, Dict[str, Any]] = {}
+
+
+def validate_workflows(
+    workflows: Optional[Dict[str, str]] = None, workflows_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Check that workflows are valid YAML and structurally sound.
+
+    Args:
+        workflows: Workflow file contents by file name (default: every
+            `*.yml` file in workflows_dir)
+        workflows_dir: Directory of the workflow files, also used to find
+            reusable workflows called by, but not in, workflows
+            (default: .github/workflows)
+
+    Returns:
+        Dict with:
+            - success (bool): Whether no problems were found
+            - problems (list): One "file: problem" string per problem
+            - message (str): Human-readable summary
+
+    Raises:
+        FileNotFoundError: If workflows is not given and the directory
+            does not exist
+    """
+    directory = Path(workflows_dir or ".github/workflows")
+    if workflows is None:
+        if not directory.is_dir():
+            msg = f"Workflow directory not found: {directory}"
+            raise FileNotFoundError(msg)
+        workflows = {p.name: p.read_text() for p in sorted(directory.glob("*.yml"))}
+
+    results = {name: _check_workflow(content) for name, content in workflows.items()}
+    problems = [
+        f"{name}: {problem}"
+        for name, result in results.items()
+        for problem in result["problems"]
+    ]
+    for name, result in results.items():
+        for job_id, path, inputs in result["calls"]:
+            callee = _called_workflow(path, results, directory)
+            problems.extend(
+                f"{name}: job '{job_id}' {problem}"
+                for problem in _call_problems(path, callee, inputs)
+            )
+
+    if problems:
+        message = f"Found {len(problems)} problems in workflows:\n" + "\n".join(
+            f"  - {p}" for p in problems
+        )
+    else:
+        message = f"Validated {len(workflows)} workflows"
+    return {"success": not problems, "problems": problems, "message": message}
+
+
+def clear_validation_cache() -> None:
+    """Forget all memoized per-workflow results."""
+    _results.clear()
+
+
+def _check_workflow(content: str) -> Dict[str, Any]:
+    """
+    Check one workflow, memoized by content digest.
+
+    Returns:
+        Dict with the workflow's problems, its reusable workflow inputs
+        (None if it is not callable) and its local reusable workflow calls
+    """
+    digest = hashlib.sha256(content.encode()).hexdigest()
+    if digest not in _results:
+        if len(_results) >= MAX_CACHED_RESULTS:
+            del _results[next(iter(_results))]
+        _results[digest] = _analyze(content)
+    return _results[digest]
+
+
+def _analyze(content: str) -> Dict[str, Any]:
+    result = {"problems": [], "inputs": None, "calls": []}
+    try:
+        workflow = load_yaml(content)
+    except yaml.YAMLError as e:
+        result["problems"].append(f"invalid YAML: {_one_line(e)}")
+        return result
+    if not isinstance(workflow, dict):
+        result["problems"].append("is not a mapping")
+        return result
+
+    on = workflow.get("on")
+    if not on:
+        result["problems"].append("has no triggers (on:)")
+    elif isinstance(on, dict) and "workflow_call" in on:
+        inputs = (on["workflow_call"] or {}).get("inputs") or {}
+        result["inputs"] = {
+            name: bool(spec.get("required")) and "default" not in spec
+            for name, spec in inputs.items()
+        }
+
+    jobs = workflow.get("jobs")
+    if not isinstance(jobs, dict) or not jobs:
+        result["problems"].append("has no jobs")
+        return result
+    for job_id, job in jobs.items():
+        if not isinstance(job, dict):
+            result["problems"].append(f"job '{job_id}' is not a mapping")
+            continue
+        result["problems"].extend(
+            f"job '{job_id}' {problem}" for problem in _job_problems(job, jobs)
+        )
+        uses = job.get("uses")
+        if isinstance(uses, str) and uses.startswith(_LOCAL_WORKFLOW_PREFIX):
+            result["calls"].append((job_id, uses, sorted(job.get("with") or {})))
+
+    result["problems"].extend(_cycle_problems(jobs))
+    result["problems"].extend(
+        f"has an unclosed expression: {s.strip()[:60]}"
+        for s in _strings(workflow)
+        if "${{" in _EXPRESSION.sub("", s)
+    )
+    return result
+
+
+def _job_problems(job: Dict[str, Any], jobs: Dict[str, Any]) -> List[str]:
+    problems = []
+    if "uses" in job:
+        problems.extend(
+            f"calls a reusable workflow and cannot have '{key}'"
+            for key in ("runs-on", "steps")
+            if key in job
+        )
+    elif "runs-on" not in job:
+        problems.append("has no runs-on")
+    elif not isinstance(job.get("steps"), list) or not job["steps"]:
+        problems.append("has no steps")
+    else:
+        for number, step in enumerate(job["steps"], 1):
+            if not isinstance(step, dict) or ("uses" in step) == ("run" in step):
+                problems.append(f"step {number} needs exactly one of uses and run")
+
+    needs = job.get("needs", [])
+    needs = [needs] if isinstance(needs, str) else list(needs or [])
+    problems.extend(f"needs unknown job '{n}'" for n in needs if n not in jobs)
+
+    # `if:` conditions are expressions even without ${{ }}
+    steps = [s for s in job.get("steps") or [] if isinstance(s, dict)]
+    expressions = [x["if"] for x in [job, *steps] if isinstance(x.get("if"), str)]
+    expressions.extend(
+        e
+        for s in _strings({k: v for k, v in job.items() if k != "if"})
+        for e in _EXPRESSION.findall(s)
+    )
+    referenced = {r for e in expressions for r in _NEEDS_REFERENCE.findall(e)}
+    problems.extend(
+        f"reads needs.{r} but does not need '{r}'"
+        for r in sorted(referenced - set(needs))
+    )
+    return problems
+
+
+def _cycle_problems(jobs: Dict[str, Any]) -> List[str]:
+    """Report jobs that (indirectly) need themselves."""
+
+    def needs_of(job_id: str) -> List[str]:
+        job = jobs.get(job_id)
+        needs = job.get("needs", []) if isinstance(job, dict) else []
+        return [needs] if isinstance(needs, str) else list(needs or [])
+
+    problems = []
+    for start in jobs:
+        seen, pending = set(), needs_of(start)
+        while pending:
+            job_id = pending.pop()
+            if job_id == start:
+                problems.append(f"job '{start}' needs itself through its dependencies")
+                break
+            if job_id not in seen:
+                seen.add(job_id)
+                pending.extend(needs_of(job_id))
+    return problems
+
+
+def _called_workflow(
+    path: str, results: Dict[str, Dict[str, Any]], directory: Path
+) -> Optional[Dict[str, Any]]:
+    name = path[len(_LOCAL_WORKFLOW_PREFIX) :]
+    if name in results:
+        return results[name]
+    file = directory / name
+    return _check_workflow(file.read_text()) if file.is_file() else None
+
+
+def _call_problems(
+    path: str, callee: Optional[Dict[str, Any]], inputs: List[str]
+) -> List[str]:
+    if callee is None:
+        return [f"calls missing workflow {path}"]
+    if callee["inputs"] is None:
+        return [f"calls {path}, which has no workflow_call trigger"]
+    declared = callee["inputs"]
+    problems = [
+        f"passes undeclared input '{name}' to {path}"
+        for name in inputs
+        if name not in declared
+    ]
+    problems.extend(
+        f"does not pass required input '{name}' to {path}"
+        for name, required in declared.items()
+        if required and name not in inputs
+    )
+    return problems
+
+
+def _strings(value: Any) -> Iterator[str]:
+    """Yield every string in a parsed YAML document."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield from _strings(key)
+            yield from _strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings(item)
+
+
+def _one_line(error: yaml.YAMLError) -> str:
+    return " ".join(str(error).split())
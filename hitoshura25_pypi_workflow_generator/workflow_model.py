@@ -0,0 +1,434 @@
+"""
+Object model of GitHub Actions workflows.
+
+A workflow is a `Workflow` holding its `Job`s, which hold their `Step`s.
+Each object keeps its YAML mapping, so keys the model has no accessor for
+survive a load/dump round trip, while the structural parts (triggers,
+jobs, needs, steps, matrices) can be changed without string surgery:
+
+    workflow = Workflow.from_yaml(text)
+    job = workflow.job("test-and-build")
+    job.add_step(Step("Show versions", run="pip list"), after="Install dependencies")
+    workflow.set_concurrency("${{ github.workflow }}-${{ github.ref }}")
+    text = workflow.to_yaml()
+
+YAML is read and written with PyYAML's LibYAML-based C loader and dumper
+when PyYAML was built with LibYAML, and its pure-Python ones otherwise.
+Both only treat true/false as booleans (as YAML 1.2 does), so the `on:`
+key of a workflow stays a string and is written without quotes.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+import yaml
+
+# Whether PyYAML's C loader and dumper are available
+HAS_LIBYAML = yaml.__with_libyaml__
+
+# Position of keys added to a mapping, relative to the keys already in it
+WORKFLOW_KEY_ORDER = ("name", "on", "permissions", "concurrency", "env", "jobs")
+JOB_KEY_ORDER = (
+    "name",
+    "uses",
+    "needs",
+    "if",
+    "runs-on",
+    "timeout-minutes",
+    "permissions",
+    "environment",
+    "concurrency",
+    "outputs",
+    "strategy",
+    "defaults",
+    "env",
+    "with",
+    "secrets",
+    "steps",
+)
+STEP_KEY_ORDER = (
+    "name",
+    "id",
+    "if",
+    "continue-on-error",
+    "timeout-minutes",
+    "shell",
+    "working-directory",
+    "env",
+    "uses",
+    "with",
+    "run",
+)
+
+# Lines are never folded; long `run:` commands stay on one line
+_LINE_WIDTH = 4096
+
+_BOOL_TAG = "tag:yaml.org,2002:bool"
+_BOOL_PATTERN = re.compile(r"^(?:true|True|TRUE|false|False|FALSE)$")
+
+
+def _yaml_1_2_booleans(cls: type) -> type:
+    """Replace the YAML 1.1 booleans (on/off, yes/no) of a loader or dumper."""
+    cls.yaml_implicit_resolvers = {
+        first: [(tag, regexp) for tag, regexp in resolvers if tag != _BOOL_TAG]
+        for first, resolvers in cls.yaml_implicit_resolvers.items()
+    }
+    cls.add_implicit_resolver(_BOOL_TAG, _BOOL_PATTERN, list("tTfF"))
+    return cls
+
+
+@_yaml_1_2_booleans
+class _Loader(getattr(yaml, "CSafeLoader", yaml.SafeLoader)):
+    pass
+
+
+@_yaml_1_2_booleans
+class _Dumper(getattr(yaml, "CSafeDumper", yaml.SafeDumper)):
+    pass
+
+
+def _represent_str(dumper: yaml.BaseDumper, data: str) -> yaml.ScalarNode:
+    # Scripts are written as literal blocks, like hand-written workflows
+    style = "|" if "\n" in data else None
+    return dumper.represent_scalar("tag:yaml.org,2002:str", data, style=style)
+
+
+_Dumper.add_representer(str, _represent_str)
+
+
+def load_yaml(text: str) -> Any:
+    """Parse a YAML document, keeping `on` and `off` keys as strings."""
+    return yaml.load(text, Loader=_Loader)
+
+
+def dump_yaml(data: Any) -> str:
+    """Write data as a YAML document, with multi-line strings as literal blocks."""
+    return yaml.dump(
+        data,
+        Dumper=_Dumper,
+        sort_keys=False,
+        default_flow_style=False,
+        allow_unicode=True,
+        width=_LINE_WIDTH,
+    )
+
+
+def _mapping_key(name: str) -> str:
+    """Map a keyword argument to a workflow key: if_ -> if, runs_on -> runs-on."""
+    return name.rstrip("_").replace("_", "-")
+
+
+def _set_key(
+    mapping: Dict[str, Any], key: str, value: Any, order: Iterable[str]
+) -> Dict[str, Any]:
+    """
+    Set a key, placing a new key by its position in order.
+
+    Returns:
+        The mapping with the key set; a new dict if the key was inserted
+        before existing keys
+    """
+    if key in mapping:
+        mapping[key] = value
+        return mapping
+    order = list(order)
+    rank = order.index(key) if key in order else len(order)
+    items = list(mapping.items())
+    position = next(
+        (
+            i
+            for i, (existing, _) in enumerate(items)
+            if existing in order and order.index(existing) > rank
+        ),
+        len(items),
+    )
+    items.insert(position, (key, value))
+    return dict(items)
+
+
+def _mapping(data: Any, what: str) -> Dict[str, Any]:
+    if not isinstance(data, dict):
+        msg = f"{what} must be a mapping, got {type(data).__name__}"
+        raise ValueError(msg)
+    return dict(data)
+
+
+class Step:
+    """
+    A step of a job: an action (`uses`) or a script (`run`).
+
+    Keyword arguments are step keys, with underscores for dashes and a
+    trailing underscore for Python keywords (`if_`, `with_`,
+    `continue_on_error`). None values are left out.
+    """
+
+    def __init__(self, name: Optional[str] = None, **fields: Any):
+        self.fields: Dict[str, Any] = {}
+        if name is not None:
+            self.fields["name"] = name
+        for key, value in fields.items():
+            if value is not None:
+                self.set(_mapping_key(key), value)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Step":
+        """
+        Wrap a step mapping, keeping its key order.
+
+        Raises:
+            ValueError: If data is not a mapping
+        """
+        step = cls()
+        step.fields = _mapping(data, "A step")
+        return step
+
+    @property
+    def name(self) -> Optional[str]:
+        """The step's name, or None for an unnamed step."""
+        return self.fields.get("name")
+
+    def set(self, key: str, value: Any) -> "Step":
+        """Set a step key, e.g. `step.set("if", "always()")`."""
+        self.fields = _set_key(self.fields, key, value, STEP_KEY_ORDER)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the step as a plain mapping."""
+        return dict(self.fields)
+
+    def __repr__(self) -> str:
+        return f"Step({self.name!r})"
+
+
+class Job:
+    """
+    A job running steps on a runner, or calling a reusable workflow.
+
+    Keyword arguments are job keys, as for `Step`.
+    """
+
+    def __init__(
+        self,
+        runs_on: Optional[str] = None,
+        *,
+        steps: Optional[List[Step]] = None,
+        **fields: Any,
+    ):
+        self.fields: Dict[str, Any] = {}
+        self.steps: List[Step] = list(steps or [])
+        if runs_on is not None:
+            self.set("runs-on", runs_on)
+        for key, value in fields.items():
+            if value is not None:
+                self.set(_mapping_key(key), value)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Job":
+        """
+        Wrap a job mapping, keeping its key order.
+
+        Raises:
+            ValueError: If data or one of its steps is not a mapping
+        """
+        job = cls()
+        job.fields = _mapping(data, "A job")
+        job.steps = [Step.from_dict(s) for s in job.fields.get("steps") or []]
+        return job
+
+    @property
+    def needs(self) -> List[str]:
+        """The jobs this job needs, always as a list."""
+        needs = self.fields.get("needs", [])
+        return [needs] if isinstance(needs, str) else list(needs)
+
+    @needs.setter
+    def needs(self, jobs: List[str]) -> None:
+        if jobs:
+            self.set("needs", list(jobs))
+        else:
+            self.fields.pop("needs", None)
+
+    def set(self, key: str, value: Any) -> "Job":
+        """Set a job key, e.g. `job.set("timeout-minutes", 30)`."""
+        self.fields = _set_key(self.fields, key, value, JOB_KEY_ORDER)
+        return self
+
+    def step(self, name: str) -> Step:
+        """
+        Return the step with the given name.
+
+        Raises:
+            KeyError: If the job has no such step
+        """
+        for step in self.steps:
+            if step.name == name:
+                return step
+        raise KeyError(name)
+
+    def add_step(
+        self, step: Step, *, before: Optional[str] = None, after: Optional[str] = None
+    ) -> "Job":
+        """
+        Insert a step before or after a named step, or append it.
+
+        Raises:
+            KeyError: If the named step does not exist
+        """
+        if before is not None:
+            position = self.steps.index(self.step(before))
+        elif after is not None:
+            position = self.steps.index(self.step(after)) + 1
+        else:
+            position = len(self.steps)
+        self.steps.insert(position, step)
+        return self
+
+    def set_matrix(self, fail_fast: Optional[bool] = None, **axes: Any) -> "Job":
+        """
+        Run the job once per combination of the matrix axes.
+
+        Axes are merged into an existing matrix; include/exclude are
+        passed as `include=[...]`, `exclude=[...]`.
+        """
+        order = ("fail-fast", "max-parallel", "matrix")
+        strategy = dict(self.fields.get("strategy") or {})
+        matrix = {**(strategy.get("matrix") or {}), **axes}
+        strategy = _set_key(strategy, "matrix", matrix, order)
+        if fail_fast is not None:
+            strategy = _set_key(strategy, "fail-fast", fail_fast, order)
+        return self.set("strategy", strategy)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the job as a plain mapping."""
+        fields = dict(self.fields)
+        if self.steps:
+            steps = [s.to_dict() for s in self.steps]
+            fields = _set_key(fields, "steps", steps, JOB_KEY_ORDER)
+        else:
+            fields.pop("steps", None)
+        return fields
+
+    def __repr__(self) -> str:
+        return f"Job({len(self.steps)} steps)"
+
+
+class Workflow:
+    """A workflow: its triggers and its jobs by id."""
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        on: Any = None,
+        *,
+        jobs: Optional[Dict[str, Job]] = None,
+        **fields: Any,
+    ):
+        self.fields: Dict[str, Any] = {}
+        self.jobs: Dict[str, Job] = dict(jobs or {})
+        if name is not None:
+            self.set("name", name)
+        if on is not None:
+            self.set("on", on)
+        for key, value in fields.items():
+            if value is not None:
+                self.set(_mapping_key(key), value)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Workflow":
+        """
+        Wrap a workflow mapping, keeping its key order.
+
+        Raises:
+            ValueError: If data is not a workflow mapping with jobs
+        """
+        workflow = cls()
+        workflow.fields = _mapping(data, "A workflow")
+        if True in workflow.fields:
+            # Parsed by a YAML 1.1 loader, which reads `on` as a boolean
+            workflow.fields = {
+                "on" if k is True else k: v for k, v in workflow.fields.items()
+            }
+        jobs = workflow.fields.get("jobs")
+        if not jobs:
+            msg = "A workflow must have jobs"
+            raise ValueError(msg)
+        workflow.jobs = {
+            job_id: Job.from_dict(job) for job_id, job in _mapping(jobs, "jobs").items()
+        }
+        return workflow
+
+    @classmethod
+    def from_yaml(cls, text: str) -> "Workflow":
+        """
+        Parse a workflow file's contents.
+
+        Raises:
+            ValueError: If the text is not a workflow
+        """
+        return cls.from_dict(load_yaml(text))
+
+    @property
+    def name(self) -> Optional[str]:
+        """The workflow's name."""
+        return self.fields.get("name")
+
+    @property
+    def triggers(self) -> Dict[str, Any]:
+        """The `on:` section as a mapping of event to its filters (or None)."""
+        on = self.fields.get("on") or {}
+        if isinstance(on, str):
+            return {on: None}
+        if isinstance(on, list):
+            return dict.fromkeys(on)
+        return dict(on)
+
+    def set(self, key: str, value: Any) -> "Workflow":
+        """Set a top-level key, e.g. `workflow.set("env", {...})`."""
+        self.fields = _set_key(self.fields, key, value, WORKFLOW_KEY_ORDER)
+        return self
+
+    def job(self, job_id: str) -> Job:
+        """
+        Return the job with the given id.
+
+        Raises:
+            KeyError: If the workflow has no such job
+        """
+        return self.jobs[job_id]
+
+    def add_job(self, job_id: str, job: Job) -> "Workflow":
+        """
+        Add a job after the existing ones.
+
+        Raises:
+            ValueError: If the id is taken or the job needs unknown jobs
+        """
+        if job_id in self.jobs:
+            msg = f"Workflow already has a job '{job_id}'"
+            raise ValueError(msg)
+        unknown = [j for j in job.needs if j not in self.jobs]
+        if unknown:
+            msg = f"Job '{job_id}' needs unknown jobs: {', '.join(unknown)}"
+            raise ValueError(msg)
+        self.jobs[job_id] = job
+        return self
+
+    def set_concurrency(
+        self, group: str, cancel_in_progress: bool = True
+    ) -> "Workflow":
+        """Let one run per concurrency group run at a time."""
+        return self.set(
+            "concurrency", {"group": group, "cancel-in-progress": cancel_in_progress}
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the workflow as a plain mapping."""
+        jobs = {job_id: job.to_dict() for job_id, job in self.jobs.items()}
+        return _set_key(dict(self.fields), "jobs", jobs, WORKFLOW_KEY_ORDER)
+
+    def to_yaml(self) -> str:
+        """Write the workflow as YAML."""
+        return dump_yaml(self.to_dict())
+
+    def __repr__(self) -> str:
+        return f"Workflow({self.name!r}, jobs={list(self.jobs)})"